@@ -0,0 +1 @@
+"""Performance benchmarks for the quiz automation pipeline."""
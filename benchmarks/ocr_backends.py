@@ -0,0 +1,81 @@
+"""Compare OCR backends on recorded frames.
+
+Usage::
+
+    python -m benchmarks.ocr_backends path/to/screenshots [--repeat 3]
+
+Every PNG in the directory (for example the output of ``SCREENSHOT_DIR``) is
+recognised by each available backend.  Frames are converted up front so only
+recognition time is measured.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from quiz_automation.frame import Frame
+from quiz_automation.ocr import BACKENDS
+
+
+def load_frames(directory: Path) -> list[Frame]:
+    """Load every PNG in *directory* as a frame."""
+    frames = []
+    for path in sorted(directory.glob("*.png")):
+        with Image.open(path) as img:
+            frames.append(Frame.from_image(img.convert("RGB")))
+    return frames
+
+
+def bench_backend(name: str, frames: list[Frame], repeat: int) -> list[float] | None:
+    """Return per-frame latencies in seconds, or None if unavailable."""
+    try:
+        backend = BACKENDS[name]()
+    except ImportError:
+        return None
+    timings = []
+    try:
+        for _ in range(repeat):
+            for frame in frames:
+                start = time.perf_counter()
+                backend(frame)
+                timings.append(time.perf_counter() - start)
+    except OSError:
+        # pytesseract raises TesseractNotFoundError (an OSError) without
+        # the binary.
+        return None
+    finally:
+        backend.close()
+    return timings
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("frames", type=Path, help="Directory of PNG frames")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    frames = load_frames(args.frames)
+    if not frames:
+        raise SystemExit(f"No PNG frames found in {args.frames}")
+
+    print(f"{len(frames)} frames x {args.repeat} repeats")
+    for name in BACKENDS:
+        timings = bench_backend(name, frames, args.repeat)
+        if timings is None:
+            print(f"{name:>12}: not installed")
+            continue
+        ms = sorted(t * 1000 for t in timings)
+        p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+        print(
+            f"{name:>12}: mean {statistics.fmean(ms):7.1f} ms"
+            f"  p50 {statistics.median(ms):7.1f} ms  p95 {p95:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Measure preprocessing (and optionally OCR) latency per profile.
+
+Usage::
+
+    python -m benchmarks.preprocess_profiles path/to/screenshots [--ocr]
+
+Each built-in profile from :mod:`quiz_automation.preprocess` is applied to
+every PNG in the directory.  With ``--ocr`` the processed image is also
+recognised using the profile's Tesseract options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from quiz_automation.ocr import get_ocr_backend
+from quiz_automation.preprocess import PROFILES
+
+from .ocr_backends import load_frames
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("frames", type=Path, help="Directory of PNG frames")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--ocr", action="store_true", help="Also time OCR")
+    parser.add_argument("--backend", default="auto", help="OCR backend name")
+    args = parser.parse_args(argv)
+
+    frames = load_frames(args.frames)
+    if not frames:
+        raise SystemExit(f"No PNG frames found in {args.frames}")
+
+    print(f"{len(frames)} frames x {args.repeat} repeats")
+    for name, profile in PROFILES.items():
+        ocr = get_ocr_backend(args.backend, **profile.ocr_options()) if args.ocr else None
+        prep_ms: list[float] = []
+        ocr_ms: list[float] = []
+        try:
+            for _ in range(args.repeat):
+                for frame in frames:
+                    start = time.perf_counter()
+                    prepared = profile(frame)
+                    prep_ms.append((time.perf_counter() - start) * 1000)
+                    if ocr is not None:
+                        start = time.perf_counter()
+                        ocr(prepared)
+                        ocr_ms.append((time.perf_counter() - start) * 1000)
+        finally:
+            if ocr is not None:
+                ocr.close()
+        line = f"{name:>10}: preprocess p50 {statistics.median(prep_ms):7.2f} ms"
+        if ocr_ms:
+            line += f"  ocr p50 {statistics.median(ocr_ms):7.1f} ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
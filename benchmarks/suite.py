@@ -0,0 +1,423 @@
+"""Per-stage and end-to-end benchmarks with baseline comparison.
+
+Usage::
+
+    python -m benchmarks.suite [--output out.json] [--baseline benchmarks/baseline.json]
+
+Each stage of the capture -> OCR -> solve -> click -> log path is timed in
+isolation and then the whole pipeline is driven from synthetic recorded
+frames.  The OpenAI API, the mouse and (unless ``--frames`` points at real
+screenshots and a backend is installed) Tesseract are replaced by fakes with
+injected latency, so results are reproducible offline.
+
+Results are printed (or written) as JSON with p50/p95/p99 latencies in
+milliseconds.  With ``--baseline`` every percentile is compared against a
+previous run and the exit status is 1 if any regressed by more than
+``--tolerance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator
+
+import numpy as np
+
+from quiz_automation import chatgpt_client
+from quiz_automation.answer_cache import AnswerCache
+from quiz_automation.capture import ScreenGrabber
+from quiz_automation.chatgpt_client import ChatGPTClient
+from quiz_automation import clicker
+from quiz_automation.clicker import click_answer
+from quiz_automation.config import Settings
+from quiz_automation.frame import Frame
+from quiz_automation.logger import QuizLogger
+from quiz_automation.minhash import MinHashIndex
+from quiz_automation.ocr import BACKENDS
+from quiz_automation.pipeline import QuestionPipeline
+from quiz_automation.replay import ReplaySource
+from quiz_automation.utils import cache_key
+from quiz_automation.watcher import Watcher
+
+from .ocr_backends import bench_backend, load_frames
+
+PERCENTILES = ("p50", "p95", "p99")
+
+
+def summarize(seconds: list[float]) -> dict[str, float]:
+    """Return count, mean and percentiles (in milliseconds) of *seconds*."""
+    ms = sorted(s * 1000 for s in seconds)
+    if not ms:
+        return {"n": 0}
+
+    def pct(q: float) -> float:
+        return round(ms[min(len(ms) - 1, int(len(ms) * q))], 4)
+
+    return {
+        "n": len(ms),
+        "mean": round(statistics.fmean(ms), 4),
+        "p50": pct(0.50),
+        "p95": pct(0.95),
+        "p99": pct(0.99),
+    }
+
+
+def timed(fn: Callable[[int], Any], n: int, warmup: int = 5) -> list[float]:
+    """Call ``fn(i)`` for ``i`` in ``range(n)`` and return the latencies.
+
+    The first *warmup* calls (with negative ``i``) are not timed.
+    """
+    for i in range(-warmup, 0):
+        fn(i)
+    timings = []
+    for i in range(n):
+        start = time.perf_counter()
+        fn(i)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+class _FakeShot:
+    def __init__(self, width: int, height: int) -> None:
+        self.size = (width, height)
+        self.raw = bytearray(width * height * 4)
+
+
+class _FakeMss:
+    """Stands in for ``mss`` so capture conversion is timed without a screen."""
+
+    def grab(self, monitor: dict[str, int]) -> _FakeShot:
+        return _FakeShot(monitor["width"], monitor["height"])
+
+    def close(self) -> None:
+        pass
+
+
+class _FakeResponses:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def create(self, **_: Any) -> SimpleNamespace:
+        time.sleep(self.latency)
+        content = SimpleNamespace(text=json.dumps({"answer": "B"}))
+        return SimpleNamespace(
+            output=[SimpleNamespace(content=[content])],
+            usage=SimpleNamespace(input_tokens=20, output_tokens=5),
+        )
+
+
+def fake_client(latency: float) -> ChatGPTClient:
+    """Return a :class:`ChatGPTClient` whose API calls just sleep."""
+    client = ChatGPTClient(Settings(openai_api_key="benchmark"))
+    client.client = SimpleNamespace(responses=_FakeResponses(latency))
+    return client
+
+
+@contextlib.contextmanager
+def fake_mouse(latency: float) -> Iterator[None]:
+    """Make :func:`click_answer` click a fake mouse that just sleeps."""
+
+    def click(x: int, y: int) -> None:
+        if latency:
+            time.sleep(latency)
+
+    saved = clicker.pyautogui
+    clicker.pyautogui = SimpleNamespace(click=click)
+    try:
+        yield
+    finally:
+        clicker.pyautogui = saved
+
+
+def synthetic_frames(count: int, size: tuple[int, int]) -> list[Frame]:
+    """Return *count* distinct BGRA frames; the first pixel encodes the index."""
+    width, height = size
+    frames = []
+    for i in range(count):
+        pixels = np.full((height, width, 4), 255, dtype=np.uint8)
+        pixels[0, 0, :2] = (i % 256, i // 256)
+        pixels[height // 4 : height // 2, width // 8 : -width // 8] = (i * 37) % 200
+        frames.append(Frame(pixels, "BGRA"))
+    return frames
+
+
+def frame_index(img: Any) -> int:
+    pixels = img.pixels if isinstance(img, Frame) else np.asarray(img)
+    return int(pixels[0, 0, 0]) + 256 * int(pixels[0, 0, 1])
+
+
+def bench_capture(args: argparse.Namespace) -> list[float]:
+    grabber = ScreenGrabber(_FakeMss)
+    region = (0, 0, *args.size)
+    try:
+        return timed(lambda _: grabber.grab(region).gray(), args.n)
+    finally:
+        grabber.close()
+
+
+def bench_cache_lookup(args: argparse.Namespace) -> list[float]:
+    """Time the cache path of ``ask``: key canonicalisation plus a hit."""
+    questions = [f"Synthetic  “question” number {i}?" for i in range(args.n)]
+    saved = chatgpt_client.CACHE
+    cache = AnswerCache(max(args.n, 1))
+    for q in questions:
+        cache.put(cache_key(q), chatgpt_client.ChatGPTResponse("A", None, 0.0))
+    chatgpt_client.CACHE = cache
+    try:
+        return timed(
+            lambda i: chatgpt_client._cached_answer(
+                cache_key(questions[i]), questions[i]
+            ),
+            args.n,
+        )
+    finally:
+        chatgpt_client.CACHE = saved
+
+
+def bench_near_lookup(args: argparse.Namespace) -> list[float]:
+    """Time near-duplicate queries against ``--near-entries`` indexed questions."""
+    rng = np.random.default_rng(0)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    words = np.array(
+        ["".join(rng.choice(letters, rng.integers(3, 9))) for _ in range(5000)]
+    )
+    texts = [" ".join(rng.choice(words, 12)) + "?" for _ in range(args.near_entries)]
+    index = MinHashIndex(0.8)
+    for i, text in enumerate(texts):
+        index.add(text, f"k{i}")
+    # Half the queries are OCR-garbled copies of indexed questions.
+    queries = [
+        texts[i].replace("e", "c", 1) if i % 2 else " ".join(rng.choice(words, 12))
+        for i in rng.integers(0, len(texts), args.n)
+    ]
+    return timed(lambda i: index.query(queries[i]), args.n)
+
+
+def bench_ask(args: argparse.Namespace) -> list[float]:
+    client = fake_client(args.api_latency)
+    return timed(lambda i: client.ask(f"Uncached question {i}?"), args.n)
+
+
+def bench_click(args: argparse.Namespace) -> list[float]:
+    letters = "ABCD"
+    with fake_mouse(args.click_latency):
+        return timed(
+            lambda i: click_answer(letters[i % 4], (0, 0, 800, 600)), args.n
+        )
+
+
+def bench_log(args: argparse.Namespace) -> list[float]:
+    with QuizLogger(Path(args.workdir) / "bench.db") as logger:
+        return timed(
+            lambda i: logger.log("ts", f"q{i}", "A", 1, 2, 20, 5, 0.0), args.n
+        )
+
+
+def bench_pipeline(
+    args: argparse.Namespace, interval: float | None
+) -> tuple[list[float], float]:
+    """Replay distinct questions through the full pipeline.
+
+    With an *interval* a new question appears every *interval* seconds
+    (latency under a sustainable load); without one, frames are pushed as
+    fast as possible (saturated throughput).  Returns per-question latency
+    from first capture to logged click, and the questions per second.
+    """
+    frames = synthetic_frames(args.n, args.size)
+    step = interval or 0.0
+    source = ReplaySource(
+        ((i * step, f) for i, f in enumerate(frames)),
+        speed=1.0 if interval else None,
+    )
+    captured: dict[int, float] = {}
+
+    def capture(region: Any) -> Frame:
+        frame = source(region)
+        captured.setdefault(frame_index(frame), time.perf_counter())
+        return frame
+
+    def ocr(img: Any) -> str:
+        time.sleep(args.ocr_latency)
+        return f"Synthetic pipeline question {frame_index(img)}?"
+
+    client = fake_client(args.api_latency)
+    logger = QuizLogger(Path(args.workdir) / "pipeline.db")
+    latencies: list[float] = []
+
+    def act(text: str, resp: Any) -> None:
+        x, y = click_answer(resp.answer, (0, 0, 800, 600))
+        logger.log("ts", text, resp.answer, x, y, 20, 5, resp.cost)
+        index = int(text.rsplit(" ", 1)[1].rstrip("?"))
+        latencies.append(time.perf_counter() - captured[index])
+
+    pipeline = QuestionPipeline(
+        client.ask,
+        act,
+        solve_workers=args.solve_workers,
+        question_queue=args.n,
+    )
+    pipeline.start()
+    watcher = Watcher(
+        source.region,
+        pipeline.submit,
+        step / 10,
+        capture=capture,
+        ocr=ocr,
+        change_threshold=1.0 if interval else None,
+    )
+    start = time.perf_counter()
+    with fake_mouse(args.click_latency):
+        watcher.start()
+        watcher.join()
+        pipeline.close()
+    elapsed = time.perf_counter() - start
+    logger.close()
+    return latencies, len(latencies) / elapsed if elapsed else 0.0
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every benchmark and return the JSON-serialisable report."""
+    results: dict[str, Any] = {}
+    results["capture_convert"] = summarize(bench_capture(args))
+    results["answer_cache_lookup"] = summarize(bench_cache_lookup(args))
+    results["near_cache_lookup"] = summarize(bench_near_lookup(args))
+    results["ask_fake_api"] = summarize(bench_ask(args))
+    results["click_answer"] = summarize(bench_click(args))
+    results["logger_log"] = summarize(bench_log(args))
+
+    if args.frames:
+        frames = load_frames(args.frames)
+    else:
+        frames = synthetic_frames(8, args.size)
+    for name in BACKENDS:
+        timings = bench_backend(name, frames, 1)
+        if timings is not None:
+            results[f"ocr_{name}"] = summarize(timings)
+
+    latencies, _ = bench_pipeline(args, args.interval)
+    results["pipeline_latency"] = summarize(latencies)
+    _, throughput = bench_pipeline(args, None)
+    results["pipeline_throughput"] = {"throughput_qps": round(throughput, 3)}
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "n": args.n,
+            "size": list(args.size),
+            "api_latency": args.api_latency,
+            "ocr_latency": args.ocr_latency,
+            "click_latency": args.click_latency,
+            "interval": args.interval,
+            "near_entries": args.near_entries,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float = 0.5,
+    min_delta: float = 0.05,
+) -> list[str]:
+    """Return descriptions of results that regressed beyond *tolerance*.
+
+    Latency percentiles regress when they grow and throughput when it
+    shrinks.  Latency differences smaller than *min_delta* milliseconds are
+    treated as noise.
+    """
+    regressions = []
+    for name, stats in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        if "throughput_qps" in stats and "throughput_qps" in base:
+            qps, base_qps = stats["throughput_qps"], base["throughput_qps"]
+            if qps < base_qps * (1 - tolerance):
+                regressions.append(
+                    f"{name}: {qps:.1f} q/s vs baseline {base_qps:.1f} q/s"
+                )
+        for key in PERCENTILES:
+            if key not in stats or key not in base:
+                continue
+            limit = max(base[key] * (1 + tolerance), base[key] + min_delta)
+            if stats[key] > limit:
+                regressions.append(
+                    f"{name} {key}: {stats[key]:.3f} ms vs baseline {base[key]:.3f} ms"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=200, help="Iterations per stage")
+    parser.add_argument(
+        "--size", type=int, nargs=2, default=(800, 600), metavar=("W", "H")
+    )
+    parser.add_argument("--frames", type=Path, help="PNG frames for the OCR stage")
+    parser.add_argument("--api-latency", type=float, default=0.005)
+    parser.add_argument("--ocr-latency", type=float, default=0.002)
+    parser.add_argument("--click-latency", type=float, default=0.0)
+    parser.add_argument("--solve-workers", type=int, default=4)
+    parser.add_argument(
+        "--near-entries",
+        type=int,
+        default=10_000,
+        help="Questions in the near-duplicate index",
+    )
+    parser.add_argument(
+        "--interval", type=float, default=0.02, help="Seconds between questions"
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="Report to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.5, help="Allowed relative slowdown"
+    )
+    parser.add_argument(
+        "--min-delta", type=float, default=0.05, help="Ignore smaller ms changes"
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        args.workdir = workdir
+        # Keep ChatGPTClient.ask from writing the real response cache.
+        saved = chatgpt_client.CACHE_FILE, chatgpt_client.CACHE
+        chatgpt_client.CACHE_FILE = Path(workdir) / "cache.json"
+        chatgpt_client.CACHE = {}
+        try:
+            report = run(args)
+        finally:
+            chatgpt_client.CACHE_FILE, chatgpt_client.CACHE = saved
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        regressions = compare(
+            report,
+            json.loads(args.baseline.read_text()),
+            args.tolerance,
+            args.min_delta,
+        )
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
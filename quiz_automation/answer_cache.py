@@ -0,0 +1,195 @@
+"""Bounded, thread-safe in-memory cache of ChatGPT answers."""
+
+from __future__ import annotations
+
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from threading import RLock
+from typing import Any, Callable, Iterator
+
+# Rough per-entry bookkeeping cost (dict slots, key, response object).
+_ENTRY_OVERHEAD = 400
+
+
+def parse_ttls(spec: str) -> dict[str, float | None]:
+    """Parse ``"tag=seconds,tag=seconds"`` into per-tag TTLs.
+
+    A TTL of ``0`` keeps that tag's answers forever.
+    """
+    ttls: dict[str, float | None] = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        tag, sep, seconds = item.rpartition("=")
+        if not sep or not tag.strip():
+            raise ValueError(f"Invalid TTL {item!r}; expected TAG=SECONDS")
+        ttls[tag.strip()] = float(seconds) or None
+    return ttls
+
+
+def entry_size(key: str, value: Any) -> int:
+    """Approximate the memory held by one cached answer."""
+    size = _ENTRY_OVERHEAD + sys.getsizeof(key)
+    answer = getattr(value, "answer", None)
+    if isinstance(answer, str):
+        size += sys.getsizeof(answer)
+    usage = getattr(value, "usage", None)
+    if usage is not None:
+        size += sys.getsizeof(getattr(usage, "__dict__", usage))
+    return size
+
+
+class AnswerCache(MutableMapping):
+    """LRU mapping of question hashes to responses.
+
+    The cache is bounded by ``max_entries`` and, if given, an approximate
+    ``max_bytes`` budget; the least recently used entries are evicted first.
+    Entries older than ``ttl`` seconds are treated as missing.  ``ttls`` maps
+    a tag (e.g. the model or prompt version an answer was produced with, see
+    :meth:`put`) to its own time to live.
+
+    It behaves like a ``dict`` so it can stand in for the plain cache dict;
+    :meth:`get` additionally counts hits and misses.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        *,
+        ttls: dict[str, float | None] | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self._clock = clock
+        # key -> (value, tag, stored, size)
+        self._entries: OrderedDict[str, tuple[Any, str | None, float, int]] = (
+            OrderedDict()
+        )
+        self._lock = RLock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def expired(self, tag: str | None, stored: float) -> bool:
+        """Return whether an answer with *tag* stored at *stored* has expired."""
+        ttl = self.ttls.get(tag, self.ttl) if tag is not None else self.ttl
+        return ttl is not None and self._clock() - stored > ttl
+
+    def _lookup(self, key: str) -> tuple[Any, str | None, float] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, tag, stored, _ = entry
+        if self.expired(tag, stored):
+            self._remove(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value, tag, stored
+
+    def _remove(self, key: str) -> None:
+        _, _, _, size = self._entries.pop(key)
+        self.nbytes -= size
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        return default if entry is None else entry[0]
+
+    def get_entry(self, key: str) -> tuple[Any, str | None, float] | None:
+        """Return ``(value, tag, stored)`` for *key*, counting the lookup."""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        *,
+        tag: str | None = None,
+        stored: float | None = None,
+    ) -> None:
+        """Insert *value*, recording its *tag* and *stored* time for TTLs."""
+        size = entry_size(key, value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_entries <= 0 or (
+                self.max_bytes is not None and size > self.max_bytes
+            ):
+                return
+            stored = self._clock() if stored is None else stored
+            self._entries[key] = (value, tag, stored, size)
+            self.nbytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.nbytes > self.max_bytes
+            ):
+                old_key = next(iter(self._entries))
+                self._remove(old_key)
+                self.evictions += 1
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            entry = self._lookup(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry[0]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.put(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            if key not in self._entries:
+                raise KeyError(key)
+            self._remove(key)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return self._lookup(key) is not None  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def items(self) -> list[tuple[str, Any]]:  # type: ignore[override]
+        """Return a snapshot of the unexpired ``(key, value)`` pairs."""
+        with self._lock:
+            return [
+                (key, value)
+                for key, (value, tag, stored, _) in self._entries.items()
+                if not self.expired(tag, stored)
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,169 @@
+"""Append-only, crash-safe storage for the ChatGPT answer cache.
+
+Each cache entry is one JSON line ``{"key": ..., "answer": ..., "usage": ...,
+"cost": ...}``.  Saving an answer appends a single line instead of rewriting
+the whole file, so a miss costs the same with ten entries or ten thousand.
+
+A crash can at worst leave the last line incomplete; :meth:`AnswerLog.load`
+drops such a torn tail and truncates it away so later appends start on a
+clean line.  :meth:`AnswerLog.compact` rewrites the live entries to a
+temporary file and atomically replaces the log, so a crash during compaction
+leaves the previous log intact.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+Record = dict[str, Any]
+
+
+def _parse_legacy(data: bytes) -> dict[str, Record] | None:
+    """Return the entries of a whole-file JSON cache, or None if *data* is a log."""
+    if not data.lstrip().startswith(b"{") or b"\n" in data.strip():
+        return None
+    try:
+        parsed = json.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(parsed, dict) or "key" in parsed:
+        return None
+    if not all(isinstance(value, dict) for value in parsed.values()):
+        return None
+    return parsed
+
+
+class AnswerLog:
+    """JSON-lines log of answer records keyed by question hash.
+
+    The log keeps an index of the offset of each key's latest record, so a
+    single record can be read back with :meth:`get` without holding every
+    record in memory.  ``lines`` counts the records in the file (including
+    superseded ones) so callers can decide when a :meth:`compact` is
+    worthwhile.  With ``fsync`` every append is flushed to disk, not just to
+    the OS.
+    """
+
+    def __init__(self, path: Path, *, fsync: bool = False) -> None:
+        self.path = Path(path)
+        self.fsync = fsync
+        self.lines = 0
+        self.offsets: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.offsets
+
+    def load(self) -> dict[str, Record]:
+        """Return the latest record per key, oldest first, repairing a torn tail.
+
+        A file in the old single-JSON-object format is converted in place.
+        """
+        self.lines = 0
+        self.offsets = {}
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return {}
+        legacy = _parse_legacy(data)
+        if legacy is not None:
+            self.compact(legacy)
+            return legacy
+
+        records: dict[str, Record] = {}
+        good = pos = 0
+        while pos < len(data):
+            end = data.find(b"\n", pos)
+            if end == -1:
+                break
+            start, raw, pos = pos, data[pos:end], end + 1
+            good = pos
+            try:
+                record = json.loads(raw)
+                key = record.pop("key")
+            except (ValueError, KeyError, TypeError, AttributeError):
+                logging.warning("Skipping corrupt line in %s", self.path)
+                continue
+            # A rewritten key moves to the end, i.e. counts as most recent.
+            records.pop(key, None)
+            records[key] = record
+            self.offsets.pop(key, None)
+            self.offsets[key] = start
+            self.lines += 1
+        if good < len(data):
+            logging.warning(
+                "Dropping %d bytes of torn tail from %s", len(data) - good, self.path
+            )
+            with self.path.open("r+b") as fh:
+                fh.truncate(good)
+        return records
+
+    def get(self, key: str) -> Record | None:
+        """Read the latest record for *key* from disk."""
+        offset = self.offsets.get(key)
+        if offset is None:
+            return None
+        try:
+            with self.path.open("rb") as fh:
+                fh.seek(offset)
+                record = json.loads(fh.readline())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(record, dict) or record.pop("key", None) != key:
+            return None
+        return record
+
+    def append(self, key: str, record: Record) -> None:
+        """Append one record; the file is created if missing."""
+        line = _encode(key, record)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as fh:
+            offset = fh.tell()
+            fh.write(line)
+            if self.fsync:
+                fh.flush()
+                os.fsync(fh.fileno())
+        self.offsets.pop(key, None)
+        self.offsets[key] = offset
+        self.lines += 1
+
+    def compact(
+        self,
+        records: dict[str, Record] | None = None,
+        *,
+        max_entries: int | None = None,
+    ) -> None:
+        """Atomically replace the log with *records*.
+
+        Without *records* the log's own latest records are kept.  With
+        ``max_entries`` only that many of the most recently written records
+        survive, so the file can be bounded independently of any in-memory
+        cache.
+        """
+        if records is None:
+            records = self.load()
+        items = list(records.items())
+        if max_entries is not None:
+            items = items[-max_entries:] if max_entries > 0 else []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        offsets: dict[str, int] = {}
+        with tmp.open("wb") as fh:
+            for key, record in items:
+                offsets[key] = fh.tell()
+                fh.write(_encode(key, record))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+        self.offsets = offsets
+        self.lines = len(offsets)
+
+
+def _encode(key: str, record: Record) -> bytes:
+    return (json.dumps({"key": key, **record}, separators=(",", ":")) + "\n").encode()
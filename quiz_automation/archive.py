@@ -0,0 +1,216 @@
+"""Background screenshot archive with an append-only pack format.
+
+Saving a PNG per question inline in the capture loop blocks on encoding and
+disk I/O and, over a long session, leaves thousands of small files behind.
+:class:`ScreenshotArchive` moves the work to a writer thread fed through a
+bounded queue.  It writes either the classic ``<hash>.png`` files or, with
+``format="pack"``, appends raw (optionally zlib compressed) frames to a few
+large segment files plus an index, readable with :class:`PackReader`.
+
+Pack layout: ``frames-NNNNN.pack`` segments hold records of a fixed header
+(:data:`_HEADER`) followed by the payload; ``index.tsv`` has one
+``key<TAB>segment<TAB>offset`` line per record.  Both files are only ever
+appended to, so a crash loses at most the record being written.
+"""
+
+from __future__ import annotations
+
+import logging
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+from .frame import Frame
+from .pipeline import DROP_OLDEST, Stage, StageQueue
+
+FORMATS = ("png", "pack")
+
+_MAGIC = b"QZFR"
+# magic, key, height, width, channels, layout, codec, payload length
+_HEADER = struct.Struct("<4s64sIIB4sBQ")
+_RAW, _ZLIB = 0, 1
+_INDEX = "index.tsv"
+
+
+def _segment_name(number: int) -> str:
+    return f"frames-{number:05d}.pack"
+
+
+def snapshot(img: Any) -> Frame:
+    """Return a frame that owns a copy of *img*'s pixels."""
+    if isinstance(img, Frame):
+        return img.copy()
+    if isinstance(img, np.ndarray):
+        if img.ndim == 2:
+            return Frame(img.copy(), "L")
+        return Frame(img.copy(), "RGBA" if img.shape[2] == 4 else "RGB")
+    return Frame.from_image(img.copy())
+
+
+class PackWriter:
+    """Append frames to segment files and record them in the index."""
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        level: int = 1,
+        segment_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.level = level
+        self.segment_bytes = segment_bytes
+        segments = sorted(self.directory.glob("frames-*.pack"))
+        self._segment = int(segments[-1].stem.split("-")[1]) if segments else 0
+        self._pack = open(self.directory / _segment_name(self._segment), "ab")
+        self._index = open(self.directory / _INDEX, "a", encoding="utf-8")
+
+    def write(self, key: str, frame: Frame) -> None:
+        pixels = np.ascontiguousarray(frame.pixels, dtype=np.uint8)
+        payload: bytes | memoryview = memoryview(pixels).cast("B")
+        codec = _RAW
+        if self.level > 0:
+            payload = zlib.compress(payload, self.level)
+            codec = _ZLIB
+        if self._pack.tell() >= self.segment_bytes:
+            self._pack.close()
+            self._segment += 1
+            self._pack = open(self.directory / _segment_name(self._segment), "ab")
+        offset = self._pack.tell()
+        channels = pixels.shape[2] if pixels.ndim == 3 else 1
+        header = _HEADER.pack(
+            _MAGIC,
+            key.encode("ascii"),
+            pixels.shape[0],
+            pixels.shape[1],
+            channels,
+            frame.layout.encode("ascii"),
+            codec,
+            len(payload),
+        )
+        self._pack.write(header)
+        self._pack.write(payload)
+        self._pack.flush()
+        self._index.write(f"{key}\t{self._segment}\t{offset}\n")
+        self._index.flush()
+
+    def close(self) -> None:
+        self._pack.close()
+        self._index.close()
+
+
+class PackReader:
+    """Look up and iterate frames stored by :class:`PackWriter`."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self._locations: dict[str, tuple[int, int]] = {}
+        index = self.directory / _INDEX
+        if index.exists():
+            for line in index.read_text(encoding="utf-8").splitlines():
+                parts = line.split("\t")
+                if len(parts) == 3:
+                    self._locations[parts[0]] = (int(parts[1]), int(parts[2]))
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._locations
+
+    def keys(self) -> list[str]:
+        return list(self._locations)
+
+    @staticmethod
+    def _read_record(fh: Any) -> tuple[str, Frame] | None:
+        header = fh.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return None
+        magic, key, height, width, channels, layout, codec, length = _HEADER.unpack(
+            header
+        )
+        if magic != _MAGIC:
+            raise ValueError("Corrupt pack record")
+        payload = fh.read(length)
+        if len(payload) < length:
+            return None  # truncated by a crash mid-write
+        if codec == _ZLIB:
+            payload = zlib.decompress(payload)
+        shape = (height, width) if channels == 1 else (height, width, channels)
+        pixels = np.frombuffer(payload, dtype=np.uint8).reshape(shape)
+        layout_name = layout.rstrip(b"\0").decode("ascii")
+        return key.decode("ascii"), Frame(pixels, layout_name)
+
+    def get(self, key: str) -> Frame:
+        """Return the most recent frame stored under *key*."""
+        segment, offset = self._locations[key]
+        with open(self.directory / _segment_name(segment), "rb") as fh:
+            fh.seek(offset)
+            record = self._read_record(fh)
+        if record is None:
+            raise KeyError(key)
+        return record[1]
+
+    def __iter__(self) -> Iterator[tuple[str, Frame]]:
+        """Yield every stored ``(key, frame)`` in write order.
+
+        Segments are scanned directly, so this also works without an index.
+        """
+        for path in sorted(self.directory.glob("frames-*.pack")):
+            with open(path, "rb") as fh:
+                while (record := self._read_record(fh)) is not None:
+                    yield record
+
+
+class ScreenshotArchive:
+    """Write screenshots on a background thread.
+
+    :meth:`save` copies the frame and returns immediately; if the writer
+    falls behind, the oldest pending screenshot is dropped rather than
+    blocking the caller.  :meth:`close` drains the queue.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        format: str = "png",
+        *,
+        level: int = 1,
+        queue_size: int = 32,
+    ) -> None:
+        if format not in FORMATS:
+            raise ValueError(f"Unknown screenshot format: {format}")
+        self.directory = Path(directory)
+        self.format = format
+        self._pack = (
+            PackWriter(self.directory, level=level) if format == "pack" else None
+        )
+        self.queue: StageQueue[tuple[str, Frame]] = StageQueue(
+            "screenshots", queue_size, DROP_OLDEST
+        )
+        self._stage = Stage("archive", self._write, self.queue)
+        self._stage.start()
+
+    def save(self, key: str, img: Any) -> None:
+        """Queue *img* to be stored under *key* (a :func:`hash_text` digest)."""
+        if not self.queue.put((key, snapshot(img))):
+            logging.warning("Screenshot archive closed; dropping %s", key)
+
+    def _write(self, item: tuple[str, Frame]) -> None:
+        key, frame = item
+        if self._pack is not None:
+            self._pack.write(key, frame)
+        else:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            frame.save(self.directory / f"{key}.png")
+
+    def close(self) -> None:
+        """Write out queued screenshots and stop the writer thread."""
+        self.queue.close()
+        self._stage.join()
+        if self._pack is not None:
+            self._pack.close()
@@ -0,0 +1,147 @@
+"""Asyncio client for answering many quiz questions concurrently.
+
+:class:`AsyncChatGPTClient` mirrors
+:class:`~quiz_automation.chatgpt_client.ChatGPTClient` on top of
+:class:`openai.AsyncOpenAI`: it uses the same answer cache, prompt, parsing
+and cost accounting, but awaits the API instead of blocking a thread.
+It lives in its own module so that importing the synchronous client does not
+pay for :mod:`asyncio`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from typing import TYPE_CHECKING, AsyncIterator, Iterable
+
+from . import chatgpt_client as cg
+from .chatgpt_client import (
+    _MALFORMED,
+    ChatGPTResponse,
+    _api_error,
+    _cached_answer,
+    _parse_completion,
+    _request,
+    _store_answer,
+)
+from .metrics import stage_timer
+from .tracing import TRACER
+from .utils import cache_key
+
+if TYPE_CHECKING:
+    from .config import Settings
+
+
+class AsyncChatGPTClient:
+    """Asyncio counterpart of :class:`.ChatGPTClient`.
+
+    Requests go through :class:`openai.AsyncOpenAI`, so many questions can
+    be in flight at once without a thread each.  At most *concurrency* API
+    calls run at the same time, retries back off with :func:`asyncio.sleep`,
+    and concurrent calls for the same question share one request, which is
+    cancelled once every caller waiting on it has been cancelled.  Answers
+    are read from and written to the same cache as :class:`.ChatGPTClient`;
+    that file I/O runs in :func:`asyncio.to_thread` to keep the event loop
+    free.
+    """
+
+    def __init__(
+        self, settings: Settings | None = None, *, concurrency: int = 8
+    ) -> None:
+        self.settings = settings or cg.settings
+        if not self.settings.openai_api_key:
+            raise ValueError("API key is required")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.client = cg.AsyncOpenAI(api_key=self.settings.openai_api_key)
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._inflight: dict[str, asyncio.Task[ChatGPTResponse]] = {}
+        # Callers currently awaiting each in-flight request.
+        self._waiters: Counter[asyncio.Task[ChatGPTResponse]] = Counter()
+
+    async def ask(self, question: str) -> ChatGPTResponse:
+        """Ask ChatGPT a question; see :meth:`.ChatGPTClient.ask`."""
+        with TRACER.span("ask") as span:
+            response = await self._ask(question)
+            if span is not None:
+                span.args["answer"] = response.answer
+            return response
+
+    async def ask_many(
+        self, questions: Iterable[str]
+    ) -> AsyncIterator[tuple[int, ChatGPTResponse]]:
+        """Ask all *questions* concurrently.
+
+        Yields ``(index, response)`` pairs in the order the answers arrive,
+        where *index* is the position of the question in *questions*.
+        Leaving the loop early cancels the questions still outstanding.
+        """
+
+        async def indexed(index: int, question: str) -> tuple[int, ChatGPTResponse]:
+            return index, await self.ask(question)
+
+        tasks = [
+            asyncio.ensure_future(indexed(i, question))
+            for i, question in enumerate(questions)
+        ]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _ask(self, question: str) -> ChatGPTResponse:
+        key = cache_key(question)
+        pending = self._inflight.get(key)
+        if pending is None:
+            # The first lookup also loads the cache file.
+            cached = await asyncio.to_thread(_cached_answer, key, question)
+            if cached is not None:
+                return cached
+            # Another caller may have started the request meanwhile.
+            pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch(key, question))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        self._waiters[pending] += 1
+        try:
+            # Shielded so that one cancelled caller does not cancel the
+            # request for others waiting on the same question.
+            return await asyncio.shield(pending)
+        finally:
+            self._waiters[pending] -= 1
+            if not self._waiters[pending]:
+                del self._waiters[pending]
+                pending.cancel()
+
+    async def _fetch(self, key: str, question: str) -> ChatGPTResponse:
+        request = _request(self.settings, question)
+        backoff = 1.0
+        for attempt in range(3):
+            try:
+                async with self._semaphore:
+                    with stage_timer("api").time(), TRACER.span(
+                        "api_attempt", attempt=attempt + 1
+                    ):
+                        completion = await self.client.responses.create(**request)
+                break
+            except Exception:
+                _api_error()
+                if attempt == 2:
+                    return ChatGPTResponse(_MALFORMED, None, 0.0)
+                with TRACER.span("backoff", seconds=backoff):
+                    await asyncio.sleep(backoff)
+                backoff *= 2
+        else:  # pragma: no cover - defensive, loop already returns on failure
+            return ChatGPTResponse(_MALFORMED, None, 0.0)
+
+        response = _parse_completion(completion, self.settings)
+        if response is None:
+            return ChatGPTResponse(_MALFORMED, None, 0.0)
+        await asyncio.to_thread(
+            _store_answer, key, question, response, self.settings.openai_model
+        )
+        return response
@@ -0,0 +1,63 @@
+"""Screen capture backends used by :class:`~quiz_automation.watcher.Watcher`."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Tuple
+
+import numpy as np
+from mss import mss
+
+from .frame import Frame, FrameScratch
+
+
+class ScreenGrabber:
+    """Long-lived screen grabber that reuses one ``mss`` handle and buffer.
+
+    Opening an ``mss`` context sets up a display connection (and on some
+    platforms device contexts), so doing that on every poll is wasteful.  The
+    handle is opened lazily on the first :meth:`grab` call because ``mss``
+    handles must be used from the thread that created them; a
+    :class:`~quiz_automation.watcher.Watcher` therefore creates and closes its
+    grabber inside its own thread.
+
+    Each grab is returned as a :class:`~quiz_automation.frame.Frame` that
+    views the BGRA buffer filled by ``mss`` directly.  Grayscale conversion
+    and thresholding reuse one preallocated set of scratch buffers, so frames
+    (and anything derived from them) are only valid until the next call to
+    :meth:`grab`.
+    """
+
+    def __init__(self, factory: Callable[[], Any] = mss) -> None:
+        self._factory = factory
+        self._sct: Any | None = None
+        self._scratch: FrameScratch | None = None
+
+    def grab(self, region: Tuple[int, int, int, int]) -> Frame:
+        """Capture *region* and return it as a BGRA frame."""
+        if self._sct is None:
+            self._sct = self._factory()
+        left, top, width, height = region
+        monitor = {"left": left, "top": top, "width": width, "height": height}
+        shot = self._sct.grab(monitor)
+        width, height = shot.size
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(height, width, 4)
+
+        scratch = self._scratch
+        if scratch is None or scratch.shape != (height, width):
+            scratch = self._scratch = FrameScratch(height, width)
+        return Frame(bgra, "BGRA", scratch)
+
+    __call__ = grab
+
+    def close(self) -> None:
+        """Release the underlying ``mss`` handle."""
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+        self._scratch = None
+
+    def __enter__(self) -> "ScreenGrabber":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
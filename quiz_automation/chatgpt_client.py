@@ -4,36 +4,48 @@ This module exposes a small helper class :class:`ChatGPTClient` that wraps the
 `openai` package.  It handles a couple of responsibilities:
 
 * Validation and creation of the underlying :class:`~openai.OpenAI` client.
-* Basic response caching keyed by a hash of the question text.
+* Response caching keyed by a hash of the question text, in a bounded
+  in-memory :class:`~quiz_automation.answer_cache.AnswerCache` backed by an
+  append-only log on disk.
 * Parsing the JSON payload returned by the model.
 * Tracking token usage and estimating cost.
 
+The cache lookup, request, parsing and storage steps are module functions
+shared with :class:`~quiz_automation.async_client.AsyncChatGPTClient`.
+
 The main entry point is :meth:`ChatGPTClient.ask` which returns a
 :class:`ChatGPTResponse` describing the answer returned by the model, the usage
 object reported by OpenAI and the calculated monetary cost.
+
+Importing the module has no side effects: the runtime ``settings``, the
+:class:`~openai.OpenAI` class and the ``CACHE`` are module attributes that are
+resolved on first access (see :func:`__getattr__`), so start-up does not pay
+for reading ``.env``, importing ``openai`` or parsing the cache file.
 """
 
 from __future__ import annotations
 
 import json
+import logging
 import time
-from types import SimpleNamespace
-=======
 from dataclasses import dataclass
 from pathlib import Path
+from threading import Lock, Thread
 from types import SimpleNamespace
-from typing import Any
-
-from openai import OpenAI
+from typing import TYPE_CHECKING, Any, MutableMapping
 
-from .config import Settings, get_settings
-from .utils import hash_text
+from .answer_cache import AnswerCache, parse_ttls
+from .answer_store import AnswerLog
+from .config import get_settings
+from .metrics import REGISTRY, Counter, stage_timer
+from .tracing import TRACER
+from .utils import cache_key, hash_text
 
-settings = get_settings()
+if TYPE_CHECKING:
+    from .config import Settings
+    from .minhash import MinHashIndex
 
 
-=======
-
 @dataclass
 class ChatGPTResponse:
     """Container returned by :meth:`ChatGPTClient.ask`.
@@ -60,142 +72,413 @@ class ChatGPTResponse:
         yield self.cost
 
 
-# Default runtime settings and response cache.  The cache maps the hash of the
-# question text to the corresponding :class:`ChatGPTResponse`.
-settings = get_settings()
+# Response cache.  ``CACHE`` maps the hash of the question text to the
+# corresponding :class:`ChatGPTResponse` and is persisted to ``CACHE_FILE`` as
+# an append-only log (see :mod:`.answer_store`).  Memory and disk are bounded
+# separately: answers evicted from ``CACHE`` are read back from the log on
+# demand.  ``settings``, ``OpenAI`` and ``CACHE`` itself are created lazily.
 CACHE_FILE = Path("chatgpt_cache.json")
-CACHE: dict[str, ChatGPTResponse] = {}
+CACHE: MutableMapping[str, ChatGPTResponse]
+# Similarity index over cached question texts, created with the cache when
+# ``settings.near_duplicate_threshold`` is set and filled in the background
+# by ``_NEAR_BUILDER``.
+NEAR_INDEX: MinHashIndex | None = None
+_NEAR_BUILDER: Thread | None = None
+# Serialises cache writes when several pipeline workers call ``ask``.
+_CACHE_LOCK = Lock()
+# Compact the log once it holds this many superseded records.
+COMPACT_SLACK = 1000
+_STORE: AnswerLog | None = None
+
+
+def __getattr__(name: str) -> Any:
+    """Create ``settings``, the OpenAI classes and ``CACHE`` on first access."""
+    if name == "settings":
+        globals()["settings"] = get_settings()
+    elif name == "OpenAI":
+        from openai import OpenAI
+
+        globals()["OpenAI"] = OpenAI
+    elif name == "AsyncOpenAI":
+        from openai import AsyncOpenAI
+
+        globals()["AsyncOpenAI"] = AsyncOpenAI
+    elif name == "CACHE":
+        _load_cache()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return globals()[name]
+
+
+def _lazy(name: str) -> Any:
+    """Return module global *name*, creating it on first use.
+
+    Plain global lookups inside this module bypass :func:`__getattr__`.
+    """
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
+
+
+def _store() -> AnswerLog:
+    """Return the log for the current ``CACHE_FILE``."""
+    global _STORE
+    if _STORE is None or _STORE.path != CACHE_FILE:
+        _STORE = AnswerLog(CACHE_FILE)
+    return _STORE
+
+
+def _new_cache() -> AnswerCache:
+    """Return an empty answer cache bounded by the module settings."""
+    settings = _lazy("settings")
+    return AnswerCache(
+        settings.answer_cache_size,
+        settings.answer_cache_bytes or None,
+        settings.answer_cache_ttl or None,
+        ttls=parse_ttls(settings.answer_cache_ttls or ""),
+    )
+
+
+def _slim_usage(usage: Any) -> SimpleNamespace | None:
+    """Keep only the token counts of an OpenAI usage object."""
+    if usage is None:
+        return None
+    return SimpleNamespace(
+        input_tokens=getattr(usage, "input_tokens", 0) or 0,
+        output_tokens=getattr(usage, "output_tokens", 0) or 0,
+    )
+
+
+def _to_record(resp: ChatGPTResponse, **extra: Any) -> dict[str, Any]:
+    usage = resp.usage
+    if usage is not None and not isinstance(usage, dict):
+        usage = getattr(usage, "__dict__", usage)
+    return {"answer": resp.answer, "usage": usage, "cost": resp.cost, **extra}
+
+
+def _from_record(value: dict[str, Any]) -> ChatGPTResponse:
+    usage = value.get("usage")
+    if isinstance(usage, dict):
+        usage = SimpleNamespace(**usage)
+    return ChatGPTResponse(value["answer"], usage, value["cost"])
 
 
 def _load_cache() -> None:
     """Populate ``CACHE`` from ``CACHE_FILE`` if it exists."""
-    global CACHE
-    if not CACHE_FILE.exists():
-        CACHE = {}
-        return
-
+    global CACHE, NEAR_INDEX
+    with _CACHE_LOCK:
+        try:
+            records = _store().load()
+        except Exception:
+            logging.exception("Failed to load answer cache from %s", CACHE_FILE)
+            records = {}
+        cache = _new_cache()
+        for key, value in records.items():
+            try:
+                response = _from_record(value)
+            except (KeyError, TypeError):
+                continue
+            tag, stored = value.get("model"), value.get("ts")
+            if stored is not None and cache.expired(tag, stored):
+                continue
+            cache.put(key, response, tag=tag, stored=stored)
+        CACHE = cache
+        threshold = _lazy("settings").near_duplicate_threshold
+        if threshold is not None:
+            NEAR_INDEX = _start_near_index(threshold, records)
+
+
+def _start_near_index(threshold: float, records: dict[str, Any]) -> MinHashIndex:
+    """Return a near-duplicate index that a background thread fills.
+
+    Indexing a large log takes seconds, so it runs off the lock: exact hits
+    are served meanwhile, and near-duplicate lookups see the questions
+    indexed so far.  Keys indexed by new answers in the meantime are kept.
+    """
+    global _NEAR_BUILDER
+    # Imported here so that numpy is only loaded when the feature is on.
+    from .minhash import MinHashIndex
+
+    index = MinHashIndex(threshold)
+    questions = [
+        (key, value["question"])
+        for key, value in records.items()
+        if value.get("question")
+    ]
+
+    def build() -> None:
+        for key, question in questions:
+            if key not in index:
+                index.add(question, key)
+        logging.debug("Indexed %d cached questions for near lookups", len(index))
+
+    _NEAR_BUILDER = Thread(target=build, name="near-index", daemon=True)
+    _NEAR_BUILDER.start()
+    return index
+
+
+# A cached answer with the model that produced it and when it was stored;
+# both are kept when the answer moves between disk, memory and keys so that
+# TTLs count from the original request.
+_Entry = tuple[ChatGPTResponse, str | None, float | None]
+
+
+def _remember(
+    key: str,
+    resp: ChatGPTResponse,
+    model: str | None = None,
+    stored: float | None = None,
+) -> None:
+    """Put *resp* in ``CACHE``, tagged with the *model* that produced it."""
+    cache = _lazy("CACHE")
+    if isinstance(cache, AnswerCache):
+        cache.put(key, resp, tag=model, stored=stored)
+    else:
+        cache[key] = resp
+
+
+def _memory_entry(key: str) -> _Entry | None:
+    cache = _lazy("CACHE")
+    if isinstance(cache, AnswerCache):
+        return cache.get_entry(key)
+    cached = cache.get(key)
+    return None if cached is None else (cached, None, None)
+
+
+def _read_disk(key: str) -> _Entry | None:
+    """Return the persisted answer for *key*, e.g. after memory eviction.
+
+    Records older than the cache TTL for their model count as missing.
+    """
+    with _CACHE_LOCK:
+        record = _store().get(key)
+    if record is None:
+        return None
+    model, stored = record.get("model"), record.get("ts")
+    cache = _lazy("CACHE")
+    if (
+        isinstance(cache, AnswerCache)
+        and stored is not None
+        and cache.expired(model, stored)
+    ):
+        return None
     try:
-        with CACHE_FILE.open("r", encoding="utf-8") as fh:
-            raw = json.load(fh)
-    except Exception:
-        CACHE = {}
-        return
+        return _from_record(record), model, stored
+    except (KeyError, TypeError):
+        return None
+
+
+def _lookup(key: str) -> _Entry | None:
+    """Return the answer cached under *key* in memory or on disk."""
+    entry = _memory_entry(key)
+    if entry is not None:
+        _cache_counter("hit").inc()
+        TRACER.instant("cache_hit")
+        return entry
+    entry = _read_disk(key)
+    if entry is not None:
+        _cache_counter("disk").inc()
+        TRACER.instant("cache_hit", source="disk")
+        _remember(key, *entry)
+    return entry
+
+
+def _near_lookup(key: str, question: str) -> _Entry | None:
+    """Return the answer of a cached near-duplicate of *question*."""
+    index = NEAR_INDEX
+    if index is None:
+        return None
+    match = index.query(question)
+    if match is None:
+        return None
+    near_key, similarity = match
+    entry = _memory_entry(near_key) or _read_disk(near_key)
+    if entry is None:
+        # Evicted or expired from memory and disk.
+        index.remove(near_key)
+        return None
+    counter = _cache_counter("near")
+    counter.inc()
+    logging.info(
+        "Near-duplicate cache hit (similarity %.2f); %d served",
+        similarity,
+        counter.value,
+    )
+    TRACER.instant("cache_hit", source="near", similarity=similarity)
+    _remember(key, *entry)
+    return entry
+
+
+def _append_cache(
+    key: str,
+    resp: ChatGPTResponse,
+    model: str | None = None,
+    question: str | None = None,
+) -> None:
+    """Persist one new entry, compacting the log when it has grown stale.
+
+    ``settings.answer_disk_entries`` bounds the log independently of the
+    in-memory cache; compaction keeps the most recently written entries.
+    The *question* text is stored so that entries can be re-keyed when the
+    key format changes (see :mod:`quiz_automation.rekey`).
+    """
+    limit = _lazy("settings").answer_disk_entries or None
+    record = _to_record(resp, model=model, ts=time.time())
+    if question is not None:
+        record["question"] = question
+    with _CACHE_LOCK:
+        store = _store()
+        store.append(key, record)
+        live = min(len(store), limit) if limit else len(store)
+        if store.lines - live >= COMPACT_SLACK:
+            store.compact(max_entries=limit)
 
-    CACHE = {}
-    for key, value in raw.items():
-        usage = value.get("usage")
-        if isinstance(usage, dict):
-            usage = SimpleNamespace(**usage)
-        CACHE[key] = ChatGPTResponse(value["answer"], usage, value["cost"])
 
+def _cache_counter(result: str) -> Counter:
+    return REGISTRY.counter(
+        "quiz_answer_cache_total", "Answer cache lookups", result=result
+    )
 
-def _save_cache() -> None:
-    """Persist ``CACHE`` to ``CACHE_FILE``."""
-    data: dict[str, Any] = {}
-    for key, resp in CACHE.items():
-        usage = resp.usage
-        if usage is not None and not isinstance(usage, dict):
-            usage = getattr(usage, "__dict__", usage)
-        data[key] = {"answer": resp.answer, "usage": usage, "cost": resp.cost}
 
-    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with CACHE_FILE.open("w", encoding="utf-8") as fh:
-        json.dump(data, fh)
+_MALFORMED = "Error: malformed response"
 
 
-_load_cache()
+def _cached_answer(key: str, question: str) -> ChatGPTResponse | None:
+    """Return the cached answer for *question*, stored under *key*.
+
+    Entries stored under the older raw-text key are promoted to *key*; with
+    ``near_duplicate_threshold`` set, similar cached questions are tried
+    last.  A miss is counted in the metrics registry.
+    """
+    entry = _lookup(key)
+    if entry is None:
+        # Entries written before keys were normalised use the raw hash.
+        entry = _lookup(hash_text(question))
+        if entry is not None:
+            _remember(key, *entry)
+    if entry is None:
+        entry = _near_lookup(key, question)
+    if entry is None:
+        _cache_counter("miss").inc()
+        return None
+    return entry[0]
+
+
+def _request(settings: Settings, question: str) -> dict[str, Any]:
+    """Return the ``responses.create`` arguments for *question*."""
+    return {
+        "model": settings.openai_model,
+        "temperature": settings.openai_temperature,
+        "input": f"Answer the quiz question with a single letter in JSON: {question}",
+    }
+
+
+def _api_error() -> None:
+    REGISTRY.counter("quiz_api_errors_total", "Failed API calls").inc()
+
+
+def _parse_completion(completion: Any, settings: Settings) -> ChatGPTResponse | None:
+    """Parse the model reply, record token usage and estimate the cost.
+
+    Returns ``None`` when the reply is not the expected JSON payload.
+    """
+    try:
+        text = completion.output[0].content[0].text
+        data = json.loads(text)
+        answer = data.get("answer", "")
+    except Exception:
+        return None
+
+    usage = getattr(completion, "usage", None)
+    input_tokens = getattr(usage, "input_tokens", 0) if usage else 0
+    output_tokens = getattr(usage, "output_tokens", 0) if usage else 0
+
+    REGISTRY.counter("quiz_tokens_total", "Tokens used", kind="input").inc(
+        input_tokens
+    )
+    REGISTRY.counter("quiz_tokens_total", "Tokens used", kind="output").inc(
+        output_tokens
+    )
+    logging.debug("Token usage: input=%s output=%s", input_tokens, output_tokens)
+
+    cost = (
+        input_tokens * settings.openai_input_cost
+        + output_tokens * settings.openai_output_cost
+    ) / 1000
+    return ChatGPTResponse(answer, _slim_usage(usage), cost)
+
+
+def _store_answer(
+    key: str, question: str, response: ChatGPTResponse, model: str
+) -> None:
+    """Cache a fresh *response* in memory, on disk and in ``NEAR_INDEX``."""
+    _remember(key, response, model)
+    with TRACER.span("cache_save"):
+        _append_cache(key, response, model, question)
+    if NEAR_INDEX is not None:
+        NEAR_INDEX.add(question, key)
 
 
 class ChatGPTClient:
     """Small wrapper around :class:`openai.OpenAI` used for the quiz bot."""
 
     def __init__(self, settings: Settings | None = None) -> None:
-        self.settings = settings or globals()["settings"]
+        self.settings = settings or _lazy("settings")
         if not self.settings.openai_api_key:
             raise ValueError("API key is required")
-        # Construct the OpenAI client.
-        self.client = OpenAI(api_key=self.settings.openai_api_key)
+        # Construct the OpenAI client; this is where ``openai`` is imported.
+        self.client = _lazy("OpenAI")(api_key=self.settings.openai_api_key)
 
     def ask(self, question: str) -> ChatGPTResponse:
         """Ask ChatGPT a question and return the parsed answer.
 
-        The method checks a simple in-memory cache before reaching out to the
-        OpenAI API.  Requests are retried up to three times with exponential
-        backoff.  On successful replies the token usage is logged and the
+        The method checks the answer cache before reaching out to the OpenAI
+        API.  The cache is keyed by :func:`~quiz_automation.utils.cache_key`,
+        so questions that differ only in case, spacing or typographic quotes
+        share an entry; entries stored under the older raw-text key are still
+        found.  With ``near_duplicate_threshold`` set, a question that misses
+        is matched against similar cached questions (see
+        :class:`~quiz_automation.minhash.MinHashIndex`).  Requests are
+        retried up to three times with exponential backoff.  On successful
+        replies the token usage is recorded in the metrics registry and the
         response is stored in the cache.
         """
 
-        key = hash_text(question)
-        cached = CACHE.get(key)
+        with TRACER.span("ask") as span:
+            response = self._ask(question)
+            if span is not None:
+                span.args["answer"] = response.answer
+            return response
+
+    def _ask(self, question: str) -> ChatGPTResponse:
+        key = cache_key(question)
+        cached = _cached_answer(key, question)
         if cached is not None:
             return cached
 
-        prompt = (
-            f"Answer the quiz question with a single letter in JSON: {question}"
-        )
-
+        request = _request(self.settings, question)
         backoff = 1.0
         for attempt in range(3):
             try:
-                completion = self.client.responses.create(
-                    model=self.settings.openai_model,
-                    temperature=self.settings.openai_temperature,
-                    input=prompt,
-                )
-
-                try:
-                    text = completion.output[0].content[0].text
-                    data = json.loads(text)
-                    answer = data.get("answer", "")
-                    usage = getattr(completion, "usage", None)
-                    input_tokens = getattr(usage, "input_tokens", 0)
-                    output_tokens = getattr(usage, "output_tokens", 0)
-                    cost = (
-                        input_tokens * self.settings.openai_input_cost
-                        + output_tokens * self.settings.openai_output_cost
-                    ) / 1000
-                    resp = ChatGPTResponse(answer, usage, cost)
-                    CACHE[key] = resp
-                    return resp
-                except Exception:
-                    return ChatGPTResponse(
-                        "Error: malformed response", None, 0.0
-                    )
-            except Exception:
-                time.sleep(backoff)
-                backoff *= 2
-
-        return ChatGPTResponse("Error: API request failed", None, 0.0)
-=======
+                with stage_timer("api").time(), TRACER.span(
+                    "api_attempt", attempt=attempt + 1
+                ):
+                    completion = self.client.responses.create(**request)
                 break
             except Exception:
+                _api_error()
                 if attempt == 2:
-                    return ChatGPTResponse("Error: malformed response", None, 0.0)
-                time.sleep(backoff)
+                    return ChatGPTResponse(_MALFORMED, None, 0.0)
+                with TRACER.span("backoff", seconds=backoff):
+                    time.sleep(backoff)
                 backoff *= 2
         else:  # pragma: no cover - defensive, loop already returns on failure
-            return ChatGPTResponse("Error: malformed response", None, 0.0)
-
-        try:
-            text = completion.output[0].content[0].text
-            data = json.loads(text)
-            answer = data.get("answer", "")
-        except Exception:
-            return ChatGPTResponse("Error: malformed response", None, 0.0)
-
-        usage = getattr(completion, "usage", None)
-        input_tokens = getattr(usage, "input_tokens", 0) if usage else 0
-        output_tokens = getattr(usage, "output_tokens", 0) if usage else 0
+            return ChatGPTResponse(_MALFORMED, None, 0.0)
 
-        # Log token usage for debugging/monitoring purposes.
-        print(f"Token usage: input={input_tokens} output={output_tokens}")
-
-        cost = (
-            input_tokens * self.settings.openai_input_cost
-            + output_tokens * self.settings.openai_output_cost
-        ) / 1000
-
-        response = ChatGPTResponse(answer, usage, cost)
-        CACHE[key] = response
-        _save_cache()
+        response = _parse_completion(completion, self.settings)
+        if response is None:
+            return ChatGPTResponse(_MALFORMED, None, 0.0)
+        _store_answer(key, question, response, self.settings.openai_model)
         return response
+
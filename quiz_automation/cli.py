@@ -2,30 +2,44 @@ from __future__ import annotations
 
 import argparse
 import json
+import logging
 import time
 from datetime import datetime
 from pathlib import Path
 from typing import Iterable, Tuple
 
+from . import chatgpt_client
 from .chatgpt_client import ChatGPTClient, ChatGPTResponse
 from .config import get_settings
 from .logger import QuizLogger
-from .watcher import Watcher
+from .metrics import REGISTRY, format_stats
+from .multi_watcher import MultiRegionWatcher
+from .pipeline import BLOCK, DROP_OLDEST, QuestionPipeline
+from .profiling import Profiler
+from .replay import ReplaySource, open_recording
+from .tracing import TRACER
+from .watcher import Watcher, question_dedup, watcher_options
 
 
 RegionTuple = Tuple[int, int, int, int]
 
 
-def _load_region(args: argparse.Namespace) -> RegionTuple:
+def _parse_region(data: object) -> RegionTuple:
+    if not (isinstance(data, Iterable) and len(data) == 4):  # type: ignore[arg-type]
+        raise SystemExit("Invalid config file")
+    return tuple(int(x) for x in data)  # type: ignore[return-value]
+
+
+def _load_regions(args: argparse.Namespace) -> list[RegionTuple]:
     if args.region:
-        return tuple(args.region)  # type: ignore[return-value]
+        return [tuple(region) for region in args.region]  # type: ignore[misc]
     if args.config:
         data = json.loads(Path(args.config).read_text())
         if isinstance(data, dict):
+            if "regions" in data:
+                return [_parse_region(region) for region in data["regions"]]
             data = data.get("region", [])
-        if not (isinstance(data, Iterable) and len(data) == 4):
-            raise SystemExit("Invalid config file")
-        return tuple(int(x) for x in data)  # type: ignore[return-value]
+        return [_parse_region(data)]
     raise SystemExit("Region not specified. Use --region or --config")
 
 
@@ -37,13 +51,31 @@ def run_headless(argv: list[str] | None = None) -> None:
         "--region",
         nargs=4,
         type=int,
+        action="append",
         metavar=("LEFT", "TOP", "WIDTH", "HEIGHT"),
-        help="Capture region coordinates",
+        help="Capture region coordinates; repeat to watch several regions",
     )
     parser.add_argument(
         "--config",
         type=Path,
-        help="Path to JSON file containing region coordinates",
+        help="Path to JSON file containing region (or regions) coordinates",
+    )
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        help="Replay a PNG directory, pack archive or video instead of the screen",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Replay speed relative to real time; 0 replays as fast as possible",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="DIR",
+        help="Write rotating stack samples and allocation diffs to DIR",
     )
     parser.add_argument(
         "--db",
@@ -53,13 +85,21 @@ def run_headless(argv: list[str] | None = None) -> None:
     )
     args = parser.parse_args(argv)
 
-    region = _load_region(args)
     settings = get_settings()
+    source = None
+    if args.replay:
+        source = ReplaySource(
+            open_recording(args.replay, interval=settings.poll_interval),
+            args.speed or None,
+        )
+    if source is not None and not (args.region or args.config):
+        regions = [source.region]
+    else:
+        regions = _load_regions(args)
     client = ChatGPTClient()
     logger = QuizLogger(args.db)
 
-    def on_question(text: str) -> None:
-        resp: ChatGPTResponse = client.ask(text)
+    def on_answer(text: str, resp: ChatGPTResponse) -> None:
         print(f"{text} -> {resp.answer}")
         ts = datetime.now().isoformat()
         input_tokens = getattr(resp.usage, "input_tokens", 0)
@@ -75,20 +115,114 @@ def run_headless(argv: list[str] | None = None) -> None:
             resp.cost,
         )
 
-    watcher = Watcher(
-        region,
-        on_question,
-        settings.poll_interval,
-        screenshot_dir=settings.screenshot_dir,
+    # Replaying flat out must see every frame and every question so runs are
+    # reproducible; live capture instead drops stale work to stay current.
+    exhaustive = source is not None and source.speed is None
+    # Solving and logging run on pipeline workers so capture never waits on
+    # the API.
+    pipeline = QuestionPipeline(
+        client.ask, on_answer, question_policy=BLOCK if exhaustive else DROP_OLDEST
+    )
+    pipeline.start()
+
+    options = watcher_options(settings)
+    poll_interval = settings.poll_interval
+    if exhaustive:
+        # Pull recorded frames back to back.
+        poll_interval = 0.0
+        options["scheduler"] = None
+    watcher: Watcher | MultiRegionWatcher
+    if len(regions) == 1:
+        watcher = Watcher(
+            regions[0],
+            pipeline.submit,
+            poll_interval,
+            capture=source,
+            async_ocr=not exhaustive,
+            **options,
+        )
+    else:
+        # One grab of the bounding box per tick feeds every region's chain.
+        # Each region deduplicates its own questions: the same question in
+        # two quiz windows must be answered in both.
+        child_options = {
+            k: v for k, v in options.items() if k not in ("scheduler", "dedup")
+        }
+        watcher = MultiRegionWatcher(
+            [
+                Watcher(
+                    region,
+                    pipeline.submit,
+                    poll_interval,
+                    dedup=question_dedup(settings),
+                    **child_options,
+                )
+                for region in regions
+            ],
+            poll_interval,
+            capture=source,
+            scheduler=options["scheduler"],
+        )
+    server = REGISTRY.serve(settings.metrics_port) if settings.metrics_port else None
+    if settings.trace_file:
+        TRACER.enable()
+    profile_dir = args.profile or settings.profile_dir
+    profiler = (
+        Profiler(
+            profile_dir,
+            interval=settings.profile_interval,
+            window=settings.profile_window,
+            keep=settings.profile_keep,
+            memory=settings.profile_memory,
+        ).start()
+        if profile_dir
+        else None
     )
+    started = time.perf_counter()
     watcher.start()
 
     try:
-        while True:
-            time.sleep(1)
+        # Runs until interrupted, or until a replay runs out of frames.
+        while watcher.is_alive():
+            watcher.join(timeout=1)
     except KeyboardInterrupt:
         pass
     finally:
         watcher.stop_flag.set()
         watcher.join()
+        options["ocr"].close()
+        if options["ocr_pool"] is not None:
+            options["ocr_pool"].close()
+        if options["archive"] is not None:
+            options["archive"].close()
+        pipeline.close()
+        logging.info("Pipeline queues: %s", pipeline.stats())
+        if options["scheduler"] is not None:
+            logging.info(
+                "Effective poll rate: %.2f Hz", options["scheduler"].poll_rate
+            )
+        if options["ocr_cache"] is not None:
+            logging.info("OCR cache: %s", options["ocr_cache"].stats())
+        logging.info("Stage latency: %s", format_stats(REGISTRY.stats()))
+        cache = vars(chatgpt_client).get("CACHE")  # not loaded if never asked
+        if hasattr(cache, "stats"):
+            logging.info("Answer cache: %s", cache.stats())
+        if server is not None:
+            server.shutdown()
+        if profiler is not None:
+            profiler.close()
+            logging.info(
+                "Profiler took %d samples; dumps in %s", profiler.samples, profile_dir
+            )
+        if settings.trace_file:
+            count = TRACER.export(settings.trace_file)
+            logging.info("Wrote %d trace events to %s", count, settings.trace_file)
+        if source is not None:
+            elapsed = time.perf_counter() - started
+            logging.info(
+                "Replayed %d frames (%d captures) in %.2fs",
+                source.frames_read,
+                source.captures,
+                elapsed,
+            )
         logger.close()
@@ -6,6 +6,9 @@ from typing import Dict, Tuple, Optional
 
 import pyautogui
 
+from .metrics import stage_timer
+from .tracing import TRACER
+
 
 LETTER_OFFSETS: Dict[str, int] = {"A": 0, "B": 1, "C": 2, "D": 3}
 
@@ -43,5 +46,6 @@ def click_answer(
     row_height = height // len(offsets)
     y = top + offsets[letter] * row_height + row_height // 2
     x = left + width // 2
-    pyautogui.click(x, y)
+    with stage_timer("click").time(), TRACER.span("click", letter=letter):
+        pyautogui.click(x, y)
     return x, y
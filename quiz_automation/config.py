@@ -20,6 +20,35 @@ class Settings(BaseSettings):
     openai_output_cost: float = Field(0.0, env="OPENAI_OUTPUT_COST")
     poll_interval: float = Field(0.5, env="POLL_INTERVAL")
     screenshot_dir: Path | None = Field(None, env="SCREENSHOT_DIR")
+    screenshot_format: str = Field("png", env="SCREENSHOT_FORMAT")
+    screenshot_compression: int = Field(1, env="SCREENSHOT_COMPRESSION")
+    change_threshold: float | None = Field(4.0, env="CHANGE_THRESHOLD")
+    ocr_backend: str = Field("auto", env="OCR_BACKEND")
+    ocr_profile: str | None = Field(None, env="OCR_PROFILE")
+    ocr_cache_size: int = Field(256, env="OCR_CACHE_SIZE")
+    ocr_cache_bytes: int = Field(4 * 1024 * 1024, env="OCR_CACHE_BYTES")
+    ocr_workers: int = Field(0, env="OCR_WORKERS")
+    ocr_tiles: str | None = Field(None, env="OCR_TILES")
+    adaptive_poll: bool = Field(False, env="ADAPTIVE_POLL")
+    poll_floor: float = Field(0.05, env="POLL_FLOOR")
+    poll_ceiling: float = Field(2.0, env="POLL_CEILING")
+    dedup_threshold: float | None = Field(0.95, env="DEDUP_THRESHOLD")
+    dedup_window: int = Field(8, env="DEDUP_WINDOW")
+    settle_ticks: int = Field(0, env="SETTLE_TICKS")
+    settle_ms: float = Field(0.0, env="SETTLE_MS")
+    metrics_port: int = Field(0, env="METRICS_PORT")
+    answer_cache_size: int = Field(10_000, env="ANSWER_CACHE_SIZE")
+    answer_cache_bytes: int = Field(0, env="ANSWER_CACHE_BYTES")
+    answer_cache_ttl: float = Field(0.0, env="ANSWER_CACHE_TTL")
+    answer_cache_ttls: str | None = Field(None, env="ANSWER_CACHE_TTLS")
+    answer_disk_entries: int = Field(0, env="ANSWER_DISK_ENTRIES")
+    near_duplicate_threshold: float | None = Field(None, env="NEAR_DUPLICATE_THRESHOLD")
+    trace_file: Path | None = Field(None, env="TRACE_FILE")
+    profile_dir: Path | None = Field(None, env="PROFILE_DIR")
+    profile_interval: float = Field(0.01, env="PROFILE_INTERVAL")
+    profile_window: float = Field(60.0, env="PROFILE_WINDOW")
+    profile_keep: int = Field(5, env="PROFILE_KEEP")
+    profile_memory: bool = Field(True, env="PROFILE_MEMORY")
 
 
 def get_settings() -> Settings:
@@ -27,6 +56,11 @@ def get_settings() -> Settings:
 
     load_dotenv()
     screenshot = os.getenv("SCREENSHOT_DIR")
+    change_threshold = os.getenv("CHANGE_THRESHOLD", "4.0")
+    dedup_threshold = os.getenv("DEDUP_THRESHOLD", "0.95")
+    near_threshold = os.getenv("NEAR_DUPLICATE_THRESHOLD")
+    trace_file = os.getenv("TRACE_FILE")
+    profile_dir = os.getenv("PROFILE_DIR")
     return Settings(
         openai_api_key=os.getenv("OPENAI_API_KEY", ""),
         openai_model=os.getenv("OPENAI_MODEL", "gpt-4o-mini-high"),
@@ -34,9 +68,35 @@ def get_settings() -> Settings:
         openai_input_cost=float(os.getenv("OPENAI_INPUT_COST", 0.0)),
         openai_output_cost=float(os.getenv("OPENAI_OUTPUT_COST", 0.0)),
         poll_interval=float(os.getenv("POLL_INTERVAL", 0.5)),
-        screenshot_dir=Path(screenshot_dir) if screenshot_dir else None,
-        openai_input_cost=float(os.getenv("OPENAI_INPUT_COST", 0.0)),
-        openai_output_cost=float(os.getenv("OPENAI_OUTPUT_COST", 0.0)),
-=======
         screenshot_dir=Path(screenshot) if screenshot else None,
+        screenshot_format=os.getenv("SCREENSHOT_FORMAT", "png"),
+        screenshot_compression=int(os.getenv("SCREENSHOT_COMPRESSION", 1)),
+        change_threshold=float(change_threshold) if change_threshold else None,
+        ocr_backend=os.getenv("OCR_BACKEND", "auto"),
+        ocr_profile=os.getenv("OCR_PROFILE") or None,
+        ocr_cache_size=int(os.getenv("OCR_CACHE_SIZE", 256)),
+        ocr_cache_bytes=int(os.getenv("OCR_CACHE_BYTES", 4 * 1024 * 1024)),
+        ocr_workers=int(os.getenv("OCR_WORKERS", 0)),
+        ocr_tiles=os.getenv("OCR_TILES") or None,
+        adaptive_poll=os.getenv("ADAPTIVE_POLL", "").lower() in ("1", "true", "yes"),
+        poll_floor=float(os.getenv("POLL_FLOOR", 0.05)),
+        poll_ceiling=float(os.getenv("POLL_CEILING", 2.0)),
+        dedup_threshold=float(dedup_threshold) if dedup_threshold else None,
+        dedup_window=int(os.getenv("DEDUP_WINDOW", 8)),
+        settle_ticks=int(os.getenv("SETTLE_TICKS", 0)),
+        settle_ms=float(os.getenv("SETTLE_MS", 0.0)),
+        metrics_port=int(os.getenv("METRICS_PORT", 0)),
+        answer_cache_size=int(os.getenv("ANSWER_CACHE_SIZE", 10_000)),
+        answer_cache_bytes=int(os.getenv("ANSWER_CACHE_BYTES", 0)),
+        answer_cache_ttl=float(os.getenv("ANSWER_CACHE_TTL", 0.0)),
+        answer_cache_ttls=os.getenv("ANSWER_CACHE_TTLS") or None,
+        answer_disk_entries=int(os.getenv("ANSWER_DISK_ENTRIES", 0)),
+        near_duplicate_threshold=float(near_threshold) if near_threshold else None,
+        trace_file=Path(trace_file) if trace_file else None,
+        profile_dir=Path(profile_dir) if profile_dir else None,
+        profile_interval=float(os.getenv("PROFILE_INTERVAL", 0.01)),
+        profile_window=float(os.getenv("PROFILE_WINDOW", 60.0)),
+        profile_keep=int(os.getenv("PROFILE_KEEP", 5)),
+        profile_memory=os.getenv("PROFILE_MEMORY", "true").lower()
+        in ("1", "true", "yes"),
     )
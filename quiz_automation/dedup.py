@@ -0,0 +1,79 @@
+"""Fuzzy deduplication of OCR'd questions.
+
+OCR output for an unchanged question is rarely byte-for-byte stable: a
+blinking cursor, anti-aliasing or an ``l``/``1`` confusion is enough to make
+an exact comparison report a new question and trigger another solve.
+:class:`QuestionDeduplicator` compares normalised text against a rolling
+window of recently emitted questions with a similarity threshold instead.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from difflib import SequenceMatcher
+
+# Characters Tesseract commonly confuses, folded to one representative.
+# Digits are only folded inside words so that numbers keep their meaning.
+_LETTER_CONFUSIONS = str.maketrans({"|": "l", "!": "l", "i": "l", "j": "l"})
+_DIGIT_CONFUSIONS = str.maketrans({"0": "o", "1": "l", "5": "s", "8": "b"})
+
+_WORD = re.compile(r"[^\W_]+")
+_NUMBER = re.compile(r"\d+")
+
+
+def _fold_word(match: re.Match[str]) -> str:
+    word = match.group()
+    if word.isdigit():
+        return word
+    return word.translate(_DIGIT_CONFUSIONS)
+
+
+def normalize(text: str) -> str:
+    """Return *text* with case, punctuation, spacing and OCR confusions folded."""
+    text = text.lower().translate(_LETTER_CONFUSIONS).replace("rn", "m")
+    return " ".join(_fold_word(m) for m in _WORD.finditer(text))
+
+
+class QuestionDeduplicator:
+    """Remember recent questions and flag near-identical repeats.
+
+    Two texts are duplicates when their normalised forms have a
+    :class:`~difflib.SequenceMatcher` ratio of at least ``threshold`` and
+    contain the same numbers, so "12 x 13" and "12 x 14" stay distinct.
+    Only the last ``window`` questions are kept.
+    """
+
+    def __init__(self, threshold: float = 0.95, window: int = 8) -> None:
+        self.threshold = threshold
+        self._recent: deque[tuple[str, list[str]]] = deque(maxlen=window)
+        self.duplicates = 0
+
+    def _similar(self, norm: str, other: str) -> bool:
+        if norm == other:
+            return True
+        matcher = SequenceMatcher(None, norm, other, autojunk=False)
+        # The cheap upper bounds rule out most unrelated questions.
+        return (
+            matcher.real_quick_ratio() >= self.threshold
+            and matcher.quick_ratio() >= self.threshold
+            and matcher.ratio() >= self.threshold
+        )
+
+    def is_duplicate(self, text: str) -> bool:
+        """Return True if *text* matches a question in the window."""
+        norm = normalize(text)
+        numbers = _NUMBER.findall(norm)
+        for other, other_numbers in self._recent:
+            if numbers == other_numbers and self._similar(norm, other):
+                self.duplicates += 1
+                return True
+        return False
+
+    def add(self, text: str) -> None:
+        """Record *text* as emitted."""
+        norm = normalize(text)
+        self._recent.append((norm, _NUMBER.findall(norm)))
+
+    def clear(self) -> None:
+        self._recent.clear()
@@ -0,0 +1,180 @@
+"""NumPy backed frames passed from capture to OCR without intermediate copies."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+from PIL import Image
+
+# Channel index of (red, green, blue) and the PIL raw mode for each layout.
+_LAYOUTS: dict[str, tuple[tuple[int, int, int], str, str]] = {
+    "BGRA": ((2, 1, 0), "RGB", "BGRX"),
+    "RGBA": ((0, 1, 2), "RGBA", "RGBA"),
+    "RGB": ((0, 1, 2), "RGB", "RGB"),
+}
+
+# Integer luma weights (ITU-R BT.601) scaled so they sum to 256.
+_R_WEIGHT, _G_WEIGHT, _B_WEIGHT = 77, 150, 29
+
+
+class FrameScratch:
+    """Reusable working buffers for grayscale conversion and thresholding."""
+
+    def __init__(self, height: int, width: int) -> None:
+        self.gray = np.empty((height, width), dtype=np.uint8)
+        self.acc = np.empty((height, width), dtype=np.uint16)
+        self.tmp = np.empty((height, width), dtype=np.uint16)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.gray.shape  # type: ignore[return-value]
+
+    def crop(self, top: int, left: int, height: int, width: int) -> "FrameScratch":
+        """Return scratch buffers viewing the same sub-rectangle."""
+        view = object.__new__(FrameScratch)
+        rows = slice(top, top + height)
+        cols = slice(left, left + width)
+        view.gray = self.gray[rows, cols]
+        view.acc = self.acc[rows, cols]
+        view.tmp = self.tmp[rows, cols]
+        return view
+
+
+class Frame:
+    """A captured image held as a NumPy array.
+
+    ``pixels`` is usually a view straight onto the buffer returned by
+    ``mss`` (BGRA layout), so building a frame costs nothing.  Cropping
+    returns another view and :meth:`gray`/:meth:`threshold` write into
+    reusable scratch buffers instead of allocating per frame.  A PIL image is
+    only produced when :meth:`to_image` or :meth:`save` is called.
+
+    Frames produced by :class:`~quiz_automation.capture.ScreenGrabber` share
+    their scratch buffers with the grabber and are only valid until the next
+    grab; use :meth:`copy` to keep one around.
+    """
+
+    __slots__ = ("pixels", "layout", "_scratch", "_image")
+
+    def __init__(
+        self,
+        pixels: np.ndarray,
+        layout: str = "BGRA",
+        scratch: FrameScratch | None = None,
+    ) -> None:
+        if layout not in _LAYOUTS and layout != "L":
+            raise ValueError(f"Unsupported layout: {layout}")
+        self.pixels = pixels
+        self.layout = layout
+        self._scratch = scratch
+        self._image: Image.Image | None = None
+
+    @classmethod
+    def from_image(cls, img: Image.Image) -> "Frame":
+        """Build a frame from a PIL image."""
+        if img.mode not in ("RGB", "RGBA", "L"):
+            img = img.convert("RGB")
+        frame = cls(np.asarray(img), img.mode)
+        frame._image = img
+        return frame
+
+    @property
+    def width(self) -> int:
+        return self.pixels.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.pixels.shape[0]
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """Return ``(width, height)`` like :attr:`PIL.Image.Image.size`."""
+        return self.width, self.height
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        # Expose the raw pixels (in ``layout`` order) to NumPy consumers.
+        if dtype is None:
+            return self.pixels
+        return self.pixels.astype(dtype)
+
+    def _get_scratch(self) -> FrameScratch:
+        scratch = self._scratch
+        if scratch is None or scratch.shape != self.pixels.shape[:2]:
+            scratch = self._scratch = FrameScratch(self.height, self.width)
+        return scratch
+
+    def crop(self, left: int, top: int, width: int, height: int) -> "Frame":
+        """Return a frame viewing a sub-rectangle of this one (no copy)."""
+        pixels = self.pixels[top : top + height, left : left + width]
+        scratch = None
+        if self._scratch is not None:
+            scratch = self._scratch.crop(top, left, pixels.shape[0], pixels.shape[1])
+        return Frame(pixels, self.layout, scratch)
+
+    def gray(self) -> np.ndarray:
+        """Return the luma channel, computed into the scratch buffer."""
+        if self.layout == "L":
+            return self.pixels
+        scratch = self._get_scratch()
+        r, g, b = _LAYOUTS[self.layout][0]
+        px = self.pixels
+        np.multiply(px[..., r], _R_WEIGHT, out=scratch.acc, dtype=np.uint16)
+        np.multiply(px[..., g], _G_WEIGHT, out=scratch.tmp, dtype=np.uint16)
+        scratch.acc += scratch.tmp
+        np.multiply(px[..., b], _B_WEIGHT, out=scratch.tmp, dtype=np.uint16)
+        scratch.acc += scratch.tmp
+        np.right_shift(scratch.acc, 8, out=scratch.acc)
+        np.copyto(scratch.gray, scratch.acc, casting="unsafe")
+        return scratch.gray
+
+    def threshold(self, level: float | None = None) -> np.ndarray:
+        """Binarise the grayscale buffer in place and return it.
+
+        Pixels brighter than ``level`` become 255 and the rest 0.  When
+        ``level`` is omitted the mean intensity is used.
+        """
+        scratch = self._get_scratch()
+        gray = self.gray()
+        if gray is not scratch.gray:
+            # Never binarise the caller's own grayscale pixels.
+            np.copyto(scratch.gray, gray)
+            gray = scratch.gray
+        if level is None:
+            level = float(gray.mean())
+        tmp = scratch.tmp
+        np.greater(gray, level, out=tmp, casting="unsafe")
+        np.multiply(tmp, 255, out=gray, casting="unsafe")
+        return gray
+
+    def copy(self) -> "Frame":
+        """Return a frame that owns its pixels."""
+        return Frame(self.pixels.copy(), self.layout)
+
+    def to_image(self) -> Image.Image:
+        """Return (and cache) a PIL image of the frame."""
+        if self._image is None:
+            if self.layout == "L":
+                self._image = Image.fromarray(np.ascontiguousarray(self.pixels))
+            else:
+                mode, rawmode = _LAYOUTS[self.layout][1:]
+                data = np.ascontiguousarray(self.pixels)
+                self._image = Image.frombuffer(
+                    mode, self.size, data, "raw", rawmode, 0, 1
+                )
+        return self._image
+
+    def save(self, fp: Any, format: str | None = None, **params: Any) -> None:
+        """Encode the frame with PIL; see :meth:`PIL.Image.Image.save`."""
+        self.to_image().save(fp, format, **params)
+
+
+def to_gray(img: Any) -> np.ndarray:
+    """Return *img* (frame, array or PIL image) as an 8-bit grayscale array."""
+    if isinstance(img, Frame):
+        return img.gray()
+    if isinstance(img, np.ndarray):
+        if img.ndim == 2:
+            return img.astype(np.uint8, copy=False)
+        return Frame(img, "RGBA" if img.shape[2] == 4 else "RGB").gray()
+    return np.asarray(img.convert("L"))
@@ -0,0 +1,71 @@
+"""Cheap change detection used to skip OCR on unchanged frames."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+
+def _as_array(img: Any) -> np.ndarray:
+    """Return *img* as a NumPy array without copying where possible."""
+    if isinstance(img, np.ndarray):
+        return img
+    return np.asarray(img)
+
+
+def fingerprint(img: Any, size: int = 32) -> np.ndarray:
+    """Return a ``size`` x ``size`` grayscale thumbnail of *img*.
+
+    The image is split into blocks and each block is reduced to its mean
+    intensity in a single vectorised pass, so small localised changes (a new
+    line of text, a highlighted option) still move at least one block value.
+    """
+    arr = _as_array(img)
+    if arr.ndim == 2:
+        arr = arr[..., np.newaxis]
+    height, width = arr.shape[:2]
+    block_h = max(1, height // size)
+    block_w = max(1, width // size)
+    rows = height // block_h
+    cols = width // block_w
+    trimmed = arr[: rows * block_h, : cols * block_w, :3]
+    blocks = trimmed.reshape(rows, block_h, cols, block_w, trimmed.shape[2])
+    return blocks.mean(axis=(1, 3, 4), dtype=np.float32)
+
+
+class ChangeDetector:
+    """Compare successive frames and report whether they differ.
+
+    ``threshold`` is expressed in grey levels (0-255): a frame counts as
+    changed when any fingerprint block moved by more than that amount since
+    the last frame that was reported as changed.
+    """
+
+    def __init__(self, threshold: float = 4.0, size: int = 32) -> None:
+        self.threshold = threshold
+        self.size = size
+        self._reference: np.ndarray | None = None
+
+    def changed(self, img: Any) -> bool:
+        """Return True if *img* differs from the last changed frame."""
+        try:
+            current = fingerprint(img, self.size)
+        except Exception:
+            # Frames we cannot fingerprint are always passed through.
+            self._reference = None
+            return True
+
+        reference = self._reference
+        if reference is None or reference.shape != current.shape:
+            self._reference = current
+            return True
+
+        if float(np.abs(current - reference).max()) > self.threshold:
+            self._reference = current
+            return True
+        return False
+
+    def reset(self) -> None:
+        """Forget the reference frame so the next frame counts as changed."""
+        self._reference = None
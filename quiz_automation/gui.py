@@ -8,12 +8,18 @@ from pathlib import Path
 import tkinter as tk
 from typing import Callable, Optional
 
-from .chatgpt_client import ChatGPTClient
+from .archive import ScreenshotArchive
+from .chatgpt_client import ChatGPTClient, ChatGPTResponse
 from .clicker import click_answer
 from .config import get_settings
 from .logger import QuizLogger
+from .metrics import REGISTRY, format_stats
+from .ocr import OCRBackend
+from .ocr_pool import OCRPool
+from .pipeline import QuestionPipeline
 from .region_selector import Region, select_region
-from .watcher import Watcher
+from .tracing import TRACER
+from .watcher import Watcher, watcher_options
 
 
 class QuizGUI:
@@ -34,8 +40,13 @@ class QuizGUI:
         self.root = tk.Tk()
         self.root.title("Quiz Automation")
         self.status_var = tk.StringVar(value="Idle")
+        self.stats_var = tk.StringVar(value="")
         self.event_queue: "queue.Queue[str]" = queue.Queue()
         self.watcher: Optional[Watcher] = None
+        self.pipeline: Optional[QuestionPipeline[ChatGPTResponse]] = None
+        self.ocr: Optional[OCRBackend] = None
+        self.ocr_pool: Optional[OCRPool] = None
+        self.archive: Optional[ScreenshotArchive] = None
         self.region: Optional[Region] = None
         self.total_cost = 0.0
 
@@ -44,6 +55,7 @@ class QuizGUI:
         stop_btn = tk.Button(self.root, text="Stop", command=self.stop)
         stop_btn.pack()
         tk.Label(self.root, textvariable=self.status_var).pack()
+        tk.Label(self.root, textvariable=self.stats_var).pack()
         self.root.after(100, self.process_events)
         self.root.protocol("WM_DELETE_WINDOW", self.shutdown)
 
@@ -53,27 +65,58 @@ class QuizGUI:
             return
         if self.region is None:
             self.region = select_region()
+        if self.settings.trace_file:
+            TRACER.enable()
+        self.pipeline = QuestionPipeline(self.solve, self.act)
+        self.pipeline.start()
+        options = watcher_options(self.settings)
+        self.ocr = options["ocr"]
+        self.ocr_pool = options["ocr_pool"]
+        self.archive = options["archive"]
         self.watcher = Watcher(
             self.region.as_tuple(),
-            self.on_question,
+            self.pipeline.submit,
             self.settings.poll_interval,
-            screenshot_dir=self.settings.screenshot_dir,
+            async_ocr=True,
+            **options,
         )
         self.watcher.start()
         self.status_var.set(f"Running – ${self.total_cost:.2f}")
 
     def stop(self) -> None:
-        """Stop the watcher thread."""
+        """Stop the watcher thread and drain the pipeline."""
         if self.watcher:
             self.watcher.stop_flag.set()
             self.watcher.join()
             self.watcher = None
             self.status_var.set("Stopped")
+        if self.ocr:
+            self.ocr.close()
+            self.ocr = None
+        if self.ocr_pool:
+            self.ocr_pool.close()
+            self.ocr_pool = None
+        if self.archive:
+            self.archive.close()
+            self.archive = None
+        if self.pipeline:
+            self.pipeline.close()
+            self.pipeline = None
+        if self.settings.trace_file and TRACER.enabled:
+            TRACER.export(self.settings.trace_file)
 
     def on_question(self, text: str) -> None:
+        """Solve *text* and act on the answer synchronously."""
+        self.act(text, self.solve(text))
+
+    def solve(self, text: str) -> ChatGPTResponse:
+        """Ask ChatGPT for the answer to *text*."""
         if self.client is None:
             self.client = ChatGPTClient()
-        resp = self.client.ask(text)
+        return self.client.ask(text)
+
+    def act(self, text: str, resp: ChatGPTResponse) -> None:
+        """Click the answer, log it and update the status line."""
         if self.region is None:  # pragma: no cover - defensive
             return
         x, y = self.click(resp.answer, self.region.as_tuple())
@@ -101,6 +144,8 @@ class QuizGUI:
         except queue.Empty:
             if self.watcher and self.watcher.is_alive():
                 self.status_var.set(f"Running – ${self.total_cost:.2f}")
+        if self.watcher:
+            self.stats_var.set(format_stats(REGISTRY.stats()))
         self.root.after(100, self.process_events)
 
     def run(self) -> None:
@@ -4,14 +4,24 @@ from __future__ import annotations
 
 import sqlite3
 from pathlib import Path
+from threading import Lock
+
+from .metrics import stage_timer
+from .tracing import TRACER
 
 
 class QuizLogger:
-    """Persist events into SQLite database."""
+    """Persist events into SQLite database.
+
+    The logger is usually created on the main thread but written to from a
+    pipeline worker, so the connection is shared across threads and guarded
+    by a lock.
+    """
 
     def __init__(self, path: Path) -> None:
         self.path = path
-        self.conn = sqlite3.connect(self.path)
+        self._lock = Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
         self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS events (
@@ -39,20 +49,22 @@ class QuizLogger:
         output_tokens: int,
         cost: float,
     ) -> float:
-        self.conn.execute(
-            """
-            INSERT INTO events (
-                ts, question, answer, x, y, input_tokens, output_tokens, cost
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (ts, question, answer, x, y, input_tokens, output_tokens, cost),
-        )
-        self.conn.commit()
+        with self._lock, stage_timer("log").time(), TRACER.span("log"):
+            self.conn.execute(
+                """
+                INSERT INTO events (
+                    ts, question, answer, x, y, input_tokens, output_tokens, cost
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (ts, question, answer, x, y, input_tokens, output_tokens, cost),
+            )
+            self.conn.commit()
         return cost
 
     def close(self) -> None:
         """Close the underlying SQLite connection."""
-        self.conn.close()
+        with self._lock:
+            self.conn.close()
 
     def __enter__(self) -> "QuizLogger":
         return self
@@ -0,0 +1,265 @@
+"""In-process metrics: counters, gauges and fixed-bucket latency histograms.
+
+Every stage of the pipeline records into the module-level :data:`REGISTRY`:
+
+* ``quiz_stage_seconds{stage=...}`` histograms for ``capture``, ``ocr``,
+  ``api``, ``click`` and ``log``;
+* ``quiz_frames_total{result=processed|skipped}``,
+  ``quiz_questions_total``, ``quiz_answer_cache_total{result=hit|disk|near|miss}``,
+  ``quiz_api_errors_total`` and ``quiz_tokens_total{kind=input|output}``
+  counters.
+
+The registry renders the Prometheus text format, which :meth:`serve`
+exposes on localhost, and :meth:`MetricsRegistry.stats` returns a plain
+snapshot for the GUI and CLI.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Any, Iterator, Union
+
+# Upper bounds in seconds, from 1 ms to 10 s.
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    inner = ",".join(f'{key}="{value}"' for key, value in pairs)
+    return "{" + inner + "}"
+
+
+class Counter:
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def samples(self, name: str, labels: Labels) -> list[str]:
+        return [f"{name}{_format_labels(labels)} {self.value:g}"]
+
+
+class Gauge:
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def samples(self, name: str, labels: Labels) -> list[str]:
+        return [f"{name}{_format_labels(labels)} {self.value:g}"]
+
+
+class Histogram:
+    """Count observations into fixed buckets, plus their count and sum."""
+
+    kind = "histogram"
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._lock = Lock()
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the wall time spent in the ``with`` block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the *q* quantile as the upper bound of its bucket."""
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for bound, count in zip(self.buckets, counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def samples(self, name: str, labels: Labels) -> list[str]:
+        with self._lock:
+            counts, total, value_sum = list(self.counts), self.count, self.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            le = _format_labels(labels, ("le", f"{bound:g}"))
+            lines.append(f"{name}_bucket{le} {cumulative}")
+        le = _format_labels(labels, ("le", "+Inf"))
+        lines.append(f"{name}_bucket{le} {total}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {value_sum:g}")
+        lines.append(f"{name}_count{_format_labels(labels)} {total}")
+        return lines
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    """Named, labelled metrics created on first use."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._metrics: dict[str, dict[Labels, Metric]] = {}
+        self._help: dict[str, str] = {}
+
+    def _get(self, cls: type, name: str, help: str, labels: dict[str, str]) -> Any:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            family = self._metrics.setdefault(name, {})
+            metric = family.get(key)
+            if metric is None:
+                metric = family[key] = cls()
+                self._help.setdefault(name, help)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} is already a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str = "", **labels: str) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str = "", **labels: str) -> Gauge:
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(self, name: str, help: str = "", **labels: str) -> Histogram:
+        return self._get(Histogram, name, help, labels)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+            self._help.clear()
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            families = {name: dict(family) for name, family in self._metrics.items()}
+        lines = []
+        for name, family in sorted(families.items()):
+            kind = next(iter(family.values())).kind
+            if self._help.get(name):
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in sorted(family.items()):
+                lines.extend(metric.samples(name, labels))
+        return "\n".join(lines) + "\n"
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot keyed by ``name`` or ``name{label=value,...}``.
+
+        Counters and gauges map to their value; histograms to their count,
+        mean and estimated p50/p95/p99 in milliseconds.
+        """
+        with self._lock:
+            families = {name: dict(family) for name, family in self._metrics.items()}
+        snapshot: dict[str, Any] = {}
+        for name, family in sorted(families.items()):
+            for labels, metric in sorted(family.items()):
+                key = name + _format_labels(labels).replace('"', "")
+                if isinstance(metric, Histogram):
+                    count = metric.count
+                    snapshot[key] = {
+                        "count": count,
+                        "mean_ms": metric.sum / count * 1000 if count else 0.0,
+                        "p50_ms": metric.quantile(0.50) * 1000,
+                        "p95_ms": metric.quantile(0.95) * 1000,
+                        "p99_ms": metric.quantile(0.99) * 1000,
+                    }
+                else:
+                    snapshot[key] = metric.value
+        return snapshot
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve :meth:`render` at ``/metrics`` from a daemon thread.
+
+        Call ``shutdown()`` on the returned server to stop it.
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logging.debug("metrics: " + format, *args)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+        return server
+
+
+def format_stats(stats: dict[str, Any]) -> str:
+    """Render the stage latencies of a :meth:`MetricsRegistry.stats` snapshot."""
+    parts = []
+    for key, value in stats.items():
+        if key.startswith("quiz_stage_seconds{") and value["count"]:
+            stage = key[len("quiz_stage_seconds{stage=") : -1]
+            parts.append(
+                f"{stage} p50 {value['p50_ms']:g}ms p95 {value['p95_ms']:g}ms"
+            )
+    return " | ".join(parts)
+
+
+REGISTRY = MetricsRegistry()
+
+
+def stage_timer(stage: str) -> Histogram:
+    """Return the latency histogram for pipeline *stage*."""
+    return REGISTRY.histogram(
+        "quiz_stage_seconds", "Latency of each pipeline stage", stage=stage
+    )
@@ -0,0 +1,178 @@
+"""Near-duplicate lookup of cached questions with MinHash and LSH banding.
+
+Exact cache keys miss whenever OCR introduces a typo or a quiz shuffles its
+options.  :class:`MinHashIndex` finds the cached question whose character
+n-grams overlap most with a new one without comparing against every entry:
+
+* each question is normalised (see :func:`quiz_automation.dedup.normalize`)
+  and split into overlapping character n-grams;
+* a MinHash signature of ``num_perm`` values estimates the Jaccard
+  similarity of two n-gram sets as the fraction of equal values;
+* signatures are cut into ``bands`` bands, and questions that agree on a
+  whole band share an LSH bucket.  Only bucket-mates are compared.
+
+A lookup costs one signature (a few NumPy operations) plus a handful of
+dictionary probes, independent of how many questions are indexed.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from threading import Lock
+
+import numpy as np
+
+from .dedup import normalize
+
+_NUMBER = re.compile(r"\d+")
+# Mersenne prime used for the universal hash family ``(a * x + b) % p``.
+_PRIME = (1 << 61) - 1
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class MinHashIndex:
+    """Map question texts to cache keys and find near-duplicates.
+
+    :meth:`query` returns the indexed key whose estimated Jaccard similarity
+    to the text is highest and at least ``threshold``.  As in
+    :class:`~quiz_automation.dedup.QuestionDeduplicator`, texts whose numbers
+    differ never match, so "12 x 13" and "12 x 14" stay distinct.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        *,
+        num_perm: int = 64,
+        bands: int = 16,
+        ngram: int = 3,
+        seed: int = 1,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+        self._lock = Lock()
+        # Signatures live in the rows of one matrix so that all candidates
+        # of a query are compared in a single vectorised step.
+        self._signatures = np.zeros((64, num_perm), dtype=np.uint32)
+        self._slots: dict[str, int] = {}
+        self._slot_keys: list[str | None] = []
+        self._slot_numbers: list[tuple[str, ...]] = []
+        self._free: list[int] = []
+        self._buckets: list[dict[bytes, set[int]]] = [{} for _ in range(bands)]
+        self.queries = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slots
+
+    def signature(self, text: str) -> tuple[np.ndarray, tuple[str, ...]]:
+        """Return the MinHash signature and the numbers of *text*."""
+        norm = normalize(text)
+        numbers = tuple(_NUMBER.findall(norm))
+        n = self.ngram
+        grams = {norm[i : i + n] for i in range(max(len(norm) - n + 1, 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(g.encode("utf-8")) for g in grams),
+            dtype=np.uint64,
+            count=len(grams),
+        )
+        # The product can exceed 64 bits; NumPy wraps it modulo 2**64, which
+        # keeps each value a fixed, well-mixed function of its n-gram.
+        mixed = (hashes[:, None] * self._a + self._b) % np.uint64(_PRIME)
+        signature = (mixed & _MAX_HASH).min(axis=0).astype(np.uint32)
+        return signature, numbers
+
+    def _bands(self, signature: np.ndarray) -> list[bytes]:
+        return [
+            signature[i * self.rows : (i + 1) * self.rows].tobytes()
+            for i in range(self.bands)
+        ]
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        slot = len(self._slot_keys)
+        if slot == len(self._signatures):
+            grown = np.zeros((2 * slot, self.num_perm), dtype=np.uint32)
+            grown[:slot] = self._signatures
+            self._signatures = grown
+        self._slot_keys.append(None)
+        self._slot_numbers.append(())
+        return slot
+
+    def add(self, text: str, key: str) -> None:
+        """Index *text* under cache *key*, replacing any previous entry."""
+        signature, numbers = self.signature(text)
+        with self._lock:
+            self._remove(key)
+            slot = self._allocate()
+            self._slots[key] = slot
+            self._slot_keys[slot] = key
+            self._slot_numbers[slot] = numbers
+            self._signatures[slot] = signature
+            for buckets, band in zip(self._buckets, self._bands(signature)):
+                buckets.setdefault(band, set()).add(slot)
+
+    def _remove(self, key: str) -> None:
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        for buckets, band in zip(self._buckets, self._bands(self._signatures[slot])):
+            members = buckets.get(band)
+            if members is not None:
+                members.discard(slot)
+                if not members:
+                    del buckets[band]
+        self._slot_keys[slot] = None
+        self._free.append(slot)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def query(self, text: str) -> tuple[str, float] | None:
+        """Return ``(key, similarity)`` of the closest match, or None."""
+        signature, numbers = self.signature(text)
+        with self._lock:
+            self.queries += 1
+            groups = [
+                members
+                for buckets, band in zip(self._buckets, self._bands(signature))
+                if (members := buckets.get(band))
+            ]
+            if not groups:
+                return None
+            candidates = np.fromiter(set().union(*groups), dtype=np.intp)
+            matches = np.count_nonzero(
+                self._signatures[candidates] == signature, axis=1
+            )
+            needed = int(np.ceil(self.threshold * self.num_perm - 1e-9))
+            for i in np.argsort(-matches, kind="stable"):
+                if matches[i] < needed:
+                    break
+                slot = int(candidates[i])
+                if self._slot_numbers[slot] == numbers:
+                    key = self._slot_keys[slot]
+                    assert key is not None
+                    return key, int(matches[i]) / self.num_perm
+            return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slots.clear()
+            self._slot_keys.clear()
+            self._slot_numbers.clear()
+            self._free.clear()
+            for buckets in self._buckets:
+                buckets.clear()
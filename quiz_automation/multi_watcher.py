@@ -0,0 +1,117 @@
+"""Watch several screen regions from a single grab per tick."""
+
+from __future__ import annotations
+
+import logging
+from threading import Event, Thread
+from typing import Any, Callable, Sequence, Tuple
+
+import numpy as np
+
+from .capture import ScreenGrabber
+from .frame import Frame
+from .scheduler import AdaptivePoller
+from .tracing import TRACER
+from .watcher import Watcher
+
+Region = Tuple[int, int, int, int]
+
+
+def bounding_region(regions: Sequence[Region]) -> Region:
+    """Return the smallest region containing every region in *regions*."""
+    if not regions:
+        raise ValueError("At least one region is required")
+    left = min(r[0] for r in regions)
+    top = min(r[1] for r in regions)
+    right = max(r[0] + r[2] for r in regions)
+    bottom = max(r[1] + r[3] for r in regions)
+    return left, top, right - left, bottom - top
+
+
+def crop(img: Any, left: int, top: int, width: int, height: int) -> Any:
+    """Return the sub-rectangle of *img*, as a view where the type allows."""
+    if isinstance(img, Frame):
+        return img.crop(left, top, width, height)
+    if isinstance(img, np.ndarray):
+        return img[top : top + height, left : left + width]
+    return img.crop((left, top, left + width, top + height))
+
+
+class MultiRegionWatcher(Thread):
+    """Drive several :class:`Watcher` chains from one screen grab.
+
+    Each tick grabs the bounding box of all child regions once and hands
+    every child a zero-copy view of its own region through
+    :meth:`Watcher.feed`, so each region keeps its own change detection,
+    preprocessing, OCR cache, deduplication and ``on_question`` callback
+    while the capture cost stays constant as regions are added.
+
+    The children are never started as threads themselves.  Their OCR runs
+    inline on this thread; use a
+    :class:`~quiz_automation.pipeline.QuestionPipeline` as their
+    ``on_question`` to keep solving off it.
+    """
+
+    def __init__(
+        self,
+        watchers: Sequence[Watcher],
+        poll_interval: float = 0.5,
+        *,
+        capture: Callable[[Region], Any] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+        scheduler: AdaptivePoller | None = None,
+    ) -> None:
+        super().__init__(daemon=True, name="multi-watcher")
+        self.watchers = list(watchers)
+        self.region = bounding_region([w.region for w in self.watchers])
+        self.poll_interval = poll_interval
+        self.capture = capture
+        self.on_error = on_error
+        self.scheduler = scheduler
+        self.stop_flag = Event()
+        self.grabs = 0
+
+    def _wait(self, changed: bool) -> None:
+        if self.scheduler is None:
+            interval = self.poll_interval
+        else:
+            interval = self.scheduler.next_interval(changed)
+        self.stop_flag.wait(interval)
+
+    def tick(self, img: Any) -> bool:
+        """Feed each child its slice of *img*; True if any region changed."""
+        left, top = self.region[:2]
+        changed = False
+        for watcher in self.watchers:
+            r_left, r_top, width, height = watcher.region
+            view = crop(img, r_left - left, r_top - top, width, height)
+            with TRACER.context(TRACER.new_trace()):
+                changed = watcher.feed(view) or changed
+        for watcher in self.watchers:
+            watcher.collect_results()
+        return changed
+
+    def run(self) -> None:  # pragma: no cover - exercised via tests
+        grabber = ScreenGrabber() if self.capture is None else None
+        capture = self.capture or grabber.grab
+        try:
+            while not self.stop_flag.is_set():
+                try:
+                    with TRACER.span("capture"):
+                        img = capture(self.region)
+                except StopIteration:
+                    logging.info("Capture source exhausted")
+                    break
+                except Exception as exc:  # pragma: no cover - logging behaviour
+                    logging.exception("Screenshot capture failed")
+                    if self.on_error:
+                        self.on_error(exc)
+                    self._wait(False)
+                    continue
+                self.grabs += 1
+                self._wait(self.tick(img))
+            for watcher in self.watchers:
+                watcher.collect_results(wait=True)
+        finally:
+            if grabber is not None:
+                grabber.close()
@@ -0,0 +1,145 @@
+"""OCR backends usable as the ``ocr`` callable of a Watcher.
+
+Two engines are provided:
+
+* :class:`TesserocrBackend` keeps a warm ``libtesseract`` handle per thread
+  through the optional ``tesserocr`` package, so language data is loaded once
+  and frames are passed as raw pixels.
+* :class:`PytesseractBackend` shells out to the ``tesseract`` binary for every
+  frame.  It is always available and used as the fallback.
+"""
+
+from __future__ import annotations
+
+import logging
+import shlex
+import threading
+from typing import Any, Protocol
+
+import numpy as np
+import pytesseract
+
+from .frame import Frame, to_gray
+
+
+class OCRBackend(Protocol):
+    """Callable turning an image into text."""
+
+    name: str
+
+    def __call__(self, img: Any) -> str: ...
+
+    def close(self) -> None: ...
+
+
+class PytesseractBackend:
+    """Run the ``tesseract`` executable once per frame via ``pytesseract``."""
+
+    name = "pytesseract"
+
+    def __init__(
+        self,
+        lang: str = "eng",
+        psm: int | None = None,
+        variables: dict[str, str] | None = None,
+    ) -> None:
+        self.lang = lang
+        args = [f"--psm {psm}"] if psm is not None else []
+        args += [
+            f"-c {shlex.quote(f'{key}={value}')}"
+            for key, value in (variables or {}).items()
+        ]
+        self.config = " ".join(args)
+
+    def __call__(self, img: Any) -> str:
+        if isinstance(img, Frame):
+            # Tesseract works on luma anyway; skip building an RGB image.
+            img = img.gray()
+        return pytesseract.image_to_string(
+            img, lang=self.lang, config=self.config
+        ).strip()
+
+    def close(self) -> None:
+        pass
+
+
+class TesserocrBackend:
+    """Keep one initialised ``tesserocr`` API handle per thread.
+
+    ``PyTessBaseAPI`` objects are not thread safe, so each thread that calls
+    the backend lazily gets its own handle.  :meth:`close` releases all of
+    them and should be called once the calling threads have stopped.
+    """
+
+    name = "tesserocr"
+
+    def __init__(
+        self,
+        lang: str = "eng",
+        psm: int | None = None,
+        variables: dict[str, str] | None = None,
+    ) -> None:
+        import tesserocr  # optional dependency
+
+        self._tesserocr = tesserocr
+        self.lang = lang
+        self.psm = psm
+        self.variables = dict(variables or {})
+        self._local = threading.local()
+        self._apis: list[Any] = []
+        self._lock = threading.Lock()
+
+    def _api(self) -> Any:
+        api = getattr(self._local, "api", None)
+        if api is None:
+            kwargs: dict[str, Any] = {"lang": self.lang}
+            if self.psm is not None:
+                kwargs["psm"] = self.psm
+            api = self._tesserocr.PyTessBaseAPI(**kwargs)
+            for key, value in self.variables.items():
+                api.SetVariable(key, value)
+            self._local.api = api
+            with self._lock:
+                self._apis.append(api)
+        return api
+
+    def __call__(self, img: Any) -> str:
+        arr = np.ascontiguousarray(to_gray(img))
+        height, width = arr.shape
+        api = self._api()
+        api.SetImageBytes(arr.tobytes(), width, height, 1, width)
+        return api.GetUTF8Text().strip()
+
+    def close(self) -> None:
+        with self._lock:
+            apis, self._apis = self._apis, []
+        for api in apis:
+            api.End()
+        self._local = threading.local()
+
+
+BACKENDS = {
+    PytesseractBackend.name: PytesseractBackend,
+    TesserocrBackend.name: TesserocrBackend,
+}
+
+
+def get_ocr_backend(name: str = "auto", **options: Any) -> OCRBackend:
+    """Return the OCR backend called *name*.
+
+    ``"auto"`` prefers :class:`TesserocrBackend` and falls back to
+    :class:`PytesseractBackend` when ``tesserocr`` is not installed.  Both
+    accept ``lang``, ``psm`` (page segmentation mode) and ``variables``
+    (Tesseract config variables such as ``tessedit_char_whitelist``).
+    """
+    if name == "auto":
+        try:
+            return TesserocrBackend(**options)
+        except ImportError:
+            logging.info("tesserocr not available, falling back to pytesseract")
+            name = PytesseractBackend.name
+    try:
+        backend = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown OCR backend: {name}") from None
+    return backend(**options)
@@ -0,0 +1,100 @@
+"""Bounded LRU cache of OCR results keyed by a hash of the frame pixels."""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+from collections import OrderedDict
+from threading import Lock
+from typing import Any
+
+import numpy as np
+
+from .frame import Frame
+
+# Rough per-entry bookkeeping cost (dict slot, key bytes, str header).
+_ENTRY_OVERHEAD = 160
+
+
+def frame_key(img: Any) -> bytes:
+    """Return a 16-byte digest identifying the pixels of *img*.
+
+    Shape and dtype are mixed in so that identical bytes with a different
+    geometry do not collide.
+    """
+    if isinstance(img, Frame):
+        arr = img.pixels
+    elif isinstance(img, np.ndarray):
+        arr = img
+    else:
+        arr = np.asarray(img)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((arr.shape, arr.dtype.str)).encode())
+    digest.update(np.ascontiguousarray(arr).data)
+    return digest.digest()
+
+
+class OCRCache:
+    """Thread-safe LRU mapping of frame digests to recognised text.
+
+    The cache is bounded both by ``max_entries`` and by an approximate
+    ``max_bytes`` budget; the least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 4 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[bytes, str] = OrderedDict()
+        self._lock = Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _size(key: bytes, text: str) -> int:
+        return _ENTRY_OVERHEAD + len(key) + sys.getsizeof(text)
+
+    def get(self, key: bytes) -> str | None:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key: bytes, text: str) -> None:
+        size = self._size(key, text)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= self._size(key, old)
+            self._entries[key] = text
+            self.nbytes += size
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                old_key, old_text = self._entries.popitem(last=False)
+                self.nbytes -= self._size(old_key, old_text)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
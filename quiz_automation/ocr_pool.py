@@ -0,0 +1,187 @@
+"""Multi-process OCR fed through a shared-memory frame ring buffer.
+
+OCR is CPU bound and, when run on the watcher thread, holds the GIL for much
+of its work, so one process only ever uses one core.  :class:`OCRPool` hands
+frames to a :class:`~concurrent.futures.ProcessPoolExecutor` instead.  Pixels
+are written once into a slot of a :class:`SharedFrameRing` and workers read
+them in place; only the slot coordinates are pickled.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from threading import Lock, Semaphore
+from typing import Any, Callable
+
+import numpy as np
+
+from .frame import to_gray
+from .ocr import get_ocr_backend
+
+
+class SharedFrameRing:
+    """Fixed-size frame slots inside one shared memory block."""
+
+    def __init__(self, slots: int, slot_bytes: int) -> None:
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.shm = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write(self, slot: int, arr: np.ndarray) -> int:
+        """Copy *arr* into *slot* and return the byte offset of the slot."""
+        if arr.nbytes > self.slot_bytes:
+            raise ValueError("Frame does not fit in a ring slot")
+        offset = slot * self.slot_bytes
+        target = np.ndarray(arr.shape, arr.dtype, buffer=self.shm.buf, offset=offset)
+        np.copyto(target, arr)
+        return offset
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+# Per worker process state, set up by ``_init_worker``.
+_worker_ocr: Callable[[Any], str] | None = None
+_attached: dict[str, shared_memory.SharedMemory] = {}
+
+
+def _init_worker(
+    ocr: Callable[[Any], str] | None, backend: str, options: dict[str, Any]
+) -> None:
+    global _worker_ocr
+    _worker_ocr = ocr or get_ocr_backend(backend, **options)
+
+
+def _ocr_slot(shm_name: str, offset: int, shape: tuple[int, ...], dtype: str) -> str:
+    shm = _attached.get(shm_name)
+    if shm is None:
+        # The ring is replaced when frames outgrow it; drop stale mappings.
+        for old in _attached.values():
+            old.close()
+        _attached.clear()
+        shm = _attached[shm_name] = shared_memory.SharedMemory(name=shm_name)
+    arr = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf, offset=offset)
+    assert _worker_ocr is not None
+    return _worker_ocr(arr)
+
+
+class OCRPool:
+    """Run OCR in worker processes on frames passed through shared memory.
+
+    Frames are converted to 8-bit grayscale and copied into a free ring slot;
+    :meth:`submit` blocks while every slot is in flight, which bounds memory
+    and applies backpressure to the caller.  Workers build their own OCR
+    backend (``backend``/``options`` as for
+    :func:`~quiz_automation.ocr.get_ocr_backend`) unless a picklable ``ocr``
+    callable is given.
+
+    Workers are started with ``forkserver`` (``spawn`` where that is not
+    available) rather than forked from the running application, whose
+    watcher, pipeline and server threads may hold locks at fork time.
+
+    A :class:`~quiz_automation.watcher.Watcher` given an ``ocr_pool`` submits
+    frames without waiting and emits the results strictly in frame order.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        *,
+        slots: int | None = None,
+        slot_bytes: int = 1920 * 1080,
+        backend: str = "auto",
+        options: dict[str, Any] | None = None,
+        ocr: Callable[[Any], str] | None = None,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.slots = slots or 2 * self.workers
+        self._slot_bytes = slot_bytes
+        if ocr is not None:
+            try:
+                pickle.dumps(ocr)
+            except Exception as exc:
+                raise TypeError("ocr must be picklable to reach the workers") from exc
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context(
+            "forkserver" if "forkserver" in methods else "spawn"
+        )
+        self._executor = ProcessPoolExecutor(
+            self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(ocr, backend, dict(options or {})),
+        )
+        self._ring: SharedFrameRing | None = None
+        self._free = list(range(self.slots))
+        self._available = Semaphore(self.slots)
+        # The ring lock serialises writers and ring replacement.  Writers
+        # take it before a slot permit, so while the ring is replaced only
+        # frames already in flight hold permits and their completion
+        # callbacks, which need just the free list lock, return them.
+        self._ring_lock = Lock()
+        self._free_lock = Lock()
+        self.submitted = 0
+
+    def _ensure_ring(self, nbytes: int) -> SharedFrameRing:
+        ring = self._ring
+        if ring is not None and nbytes <= ring.slot_bytes:
+            return ring
+        # Grow the ring: wait until no slot is in flight, then replace it.
+        for _ in range(self.slots):
+            self._available.acquire()
+        try:
+            if ring is not None:
+                ring.close()
+            self._slot_bytes = max(self._slot_bytes, nbytes)
+            self._ring = SharedFrameRing(self.slots, self._slot_bytes)
+        finally:
+            for _ in range(self.slots):
+                self._available.release()
+        return self._ring
+
+    def submit(self, img: Any) -> "Future[str]":
+        """Queue *img* for OCR and return a future for its text."""
+        arr = np.ascontiguousarray(to_gray(img))
+        with self._ring_lock:
+            ring = self._ensure_ring(arr.nbytes)
+            self._available.acquire()
+            slot = None
+            try:
+                with self._free_lock:
+                    slot = self._free.pop()
+                offset = ring.write(slot, arr)
+                future = self._executor.submit(
+                    _ocr_slot, ring.name, offset, arr.shape, arr.dtype.str
+                )
+            except BaseException:
+                self._release(slot)
+                raise
+        self.submitted += 1
+        future.add_done_callback(lambda _: self._release(slot))
+        return future
+
+    def _release(self, slot: int | None) -> None:
+        if slot is not None:
+            with self._free_lock:
+                self._free.append(slot)
+        self._available.release()
+
+    def __call__(self, img: Any) -> str:
+        """Recognise *img* synchronously (usable as a Watcher ``ocr``)."""
+        return self.submit(img).result()
+
+    def close(self) -> None:
+        """Wait for in-flight frames, stop the workers and free the ring."""
+        self._executor.shutdown(wait=True)
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
@@ -0,0 +1,259 @@
+"""Bounded queues and worker stages used to decouple capture from solving.
+
+The watcher thread must keep capturing at its poll rate even when a single
+``ChatGPTClient.ask`` call takes seconds.  Work is therefore split into
+stages connected by :class:`StageQueue` instances.  Each queue is bounded and
+has an explicit overflow policy so backpressure shows up as counters instead
+of unbounded memory growth or a stalled capture loop:
+
+``BLOCK``
+    The producer waits for space.  Used where losing work is not acceptable
+    (answers waiting to be clicked and logged).
+``DROP_NEWEST``
+    The incoming item is discarded when the queue is full.
+``DROP_OLDEST``
+    The oldest queued item is discarded, so the queue coalesces to the most
+    recent items.  Used for frames and questions where only the latest screen
+    state matters.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from threading import Condition, Thread
+from typing import Any, Callable, Generic, Optional, Tuple, TypeVar
+
+from .tracing import TRACER
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Queued question: text, trace id and submit time.
+Question = Tuple[str, Optional[str], float]
+
+BLOCK = "block"
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+POLICIES = (BLOCK, DROP_NEWEST, DROP_OLDEST)
+
+
+class QueueClosed(Exception):
+    """Raised by :meth:`StageQueue.get` once the queue is closed and empty."""
+
+
+class StageQueue(Generic[T]):
+    """Bounded FIFO queue with an overflow policy and backpressure counters."""
+
+    def __init__(self, name: str, maxsize: int = 1, policy: str = DROP_OLDEST) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy}")
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self._items: deque[T] = deque()
+        self._cond = Condition()
+        self._closed = False
+        self.accepted = 0
+        self.dropped = 0
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+    def put(self, item: T) -> bool:
+        """Queue *item* according to the policy.
+
+        Returns False if *item* itself was dropped (``DROP_NEWEST`` on a full
+        queue, or any put after :meth:`close`).
+        """
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._items) >= self.maxsize:
+                if self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    logging.debug("Queue %s full, dropping newest item", self.name)
+                    return False
+                if self.policy == DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+                    logging.debug("Queue %s full, dropping oldest item", self.name)
+                else:
+                    while len(self._items) >= self.maxsize and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        return False
+            self._items.append(item)
+            self.accepted += 1
+            self.high_water = max(self.high_water, len(self._items))
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout: float | None = None) -> T:
+        """Return the next item, waiting for one if necessary.
+
+        Raises :class:`QueueClosed` once the queue is closed and drained, and
+        :class:`TimeoutError` if *timeout* expires first.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout):
+                raise TimeoutError(self.name)
+            if not self._items:
+                raise QueueClosed(self.name)
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def close(self) -> None:
+        """Stop accepting items; consumers drain what is left and exit."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of the queue's depth and counters."""
+        with self._cond:
+            return {
+                "depth": len(self._items),
+                "maxsize": self.maxsize,
+                "policy": self.policy,
+                "accepted": self.accepted,
+                "dropped": self.dropped,
+                "high_water": self.high_water,
+            }
+
+
+class Stage(Generic[T]):
+    """One or more worker threads feeding items from *inbox* to *handler*."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[T], Any],
+        inbox: StageQueue[T],
+        *,
+        workers: int = 1,
+        on_error: Callable[[Exception], None] | None = None,
+    ) -> None:
+        self.name = name
+        self.handler = handler
+        self.inbox = inbox
+        self.on_error = on_error
+        self.processed = 0
+        self._threads = [
+            Thread(target=self._work, name=f"{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+    def start(self) -> None:
+        for thread in self._threads:
+            thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def _work(self) -> None:
+        while True:
+            try:
+                item = self.inbox.get()
+            except QueueClosed:
+                return
+            try:
+                self.handler(item)
+            except Exception as exc:  # pragma: no cover - logging behaviour
+                logging.exception("Stage %s failed", self.name)
+                if self.on_error:
+                    self.on_error(exc)
+            self.processed += 1
+
+
+class QuestionPipeline(Generic[R]):
+    """Resolve and act on questions off the watcher thread.
+
+    ``solve`` turns question text into an answer (typically
+    :meth:`ChatGPTClient.ask`) and ``act`` clicks and logs it.  Questions wait
+    in a small ``DROP_OLDEST`` queue so a burst of new questions coalesces to
+    the latest one, while solved answers wait in a ``BLOCK`` queue so none are
+    lost.  :meth:`submit` has the same signature as a Watcher ``on_question``
+    callback.
+
+    The trace id current when a question is submitted (see
+    :mod:`quiz_automation.tracing`) is carried to both workers, and the time
+    the question spent queued is recorded as a ``queue_wait`` span.
+    """
+
+    def __init__(
+        self,
+        solve: Callable[[str], R],
+        act: Callable[[str, R], None],
+        *,
+        solve_workers: int = 1,
+        question_queue: int = 2,
+        question_policy: str = DROP_OLDEST,
+        answer_queue: int = 16,
+        answer_policy: str = BLOCK,
+        on_error: Callable[[Exception], None] | None = None,
+    ) -> None:
+        self.solve = solve
+        self.act = act
+        self.questions: StageQueue[Question] = StageQueue(
+            "questions", question_queue, question_policy
+        )
+        self.answers: StageQueue[tuple[str, R, str | None]] = StageQueue(
+            "answers", answer_queue, answer_policy
+        )
+        self.solve_stage = Stage(
+            "solve",
+            self._solve,
+            self.questions,
+            workers=solve_workers,
+            on_error=on_error,
+        )
+        # Clicks must happen one at a time, so acting is single threaded.
+        self.act_stage = Stage("act", self._act, self.answers, on_error=on_error)
+
+    def _solve(self, item: Question) -> None:
+        text, trace, submitted = item
+        with TRACER.context(trace):
+            TRACER.record("queue_wait", submitted, time.perf_counter())
+            with TRACER.span("solve"):
+                answer = self.solve(text)
+        self.answers.put((text, answer, trace))
+
+    def _act(self, item: tuple[str, R, str | None]) -> None:
+        text, answer, trace = item
+        with TRACER.context(trace), TRACER.span("act"):
+            self.act(text, answer)
+
+    def submit(self, text: str) -> bool:
+        """Queue *text* for solving; usable as a Watcher ``on_question``."""
+        return self.questions.put((text, TRACER.current(), time.perf_counter()))
+
+    __call__ = submit
+
+    def start(self) -> None:
+        self.solve_stage.start()
+        self.act_stage.start()
+
+    def close(self, timeout: float | None = None) -> None:
+        """Finish queued work and stop the worker threads."""
+        self.questions.close()
+        self.solve_stage.join(timeout)
+        self.answers.close()
+        self.act_stage.join(timeout)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return queue snapshots keyed by queue name."""
+        return {
+            self.questions.name: self.questions.stats(),
+            self.answers.name: self.answers.stats(),
+        }
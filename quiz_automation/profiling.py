@@ -0,0 +1,182 @@
+"""Opt-in sampling profiler and allocation tracker for long-running sessions.
+
+A :class:`Profiler` runs a daemon thread that samples the stack of every
+other thread (watcher, OCR, pipeline workers, ...) at a fixed interval.  At
+the end of each window it writes the aggregated stacks in the collapsed
+"folded" format understood by ``flamegraph.pl`` and speedscope, and, when
+memory tracking is on, the top ``tracemalloc`` allocation growth since the
+previous window.  Only the newest ``keep`` dumps of each kind are kept.
+
+Sampling reads :func:`sys._current_frames`, so it needs no cooperation from
+the profiled code and costs nothing when the profiler is not running.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+
+_DUMP_NAME = re.compile(r"(?:stacks|memory)-(\d+)\.(?:folded|txt)")
+
+
+def _dump_index(path: Path) -> int:
+    match = _DUMP_NAME.fullmatch(path.name)
+    return int(match.group(1)) if match else 0
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def collapse_stack(frame: Any) -> str:
+    """Return the stack ending at *frame* as ``outer;...;inner``."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class Profiler:
+    """Periodically sample thread stacks and allocation growth to *directory*.
+
+    Every ``interval`` seconds the stack of each live thread is recorded;
+    every ``window`` seconds the counts are written to
+    ``stacks-NNNNN.folded`` (one ``thread;frames... count`` line per unique
+    stack) and, with ``memory``, the ``top`` allocation sites that grew the
+    most to ``memory-NNNNN.txt``.  :meth:`close` writes a final window.
+    Numbering continues after the dumps already in *directory*, so a new
+    session never overwrites or rotates out its own dumps first.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        interval: float = 0.01,
+        window: float = 60.0,
+        keep: int = 5,
+        memory: bool = True,
+        top: int = 25,
+        frames: int = 5,
+    ) -> None:
+        if interval <= 0 or window <= 0:
+            raise ValueError("interval and window must be positive")
+        if keep < 1:
+            raise ValueError("keep must be at least 1")
+        self.directory = Path(directory)
+        self.interval = interval
+        self.window = window
+        self.keep = keep
+        self.memory = memory
+        self.top = top
+        self.frames = frames
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.dumps = 0
+        self._index: int | None = None
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._started_tracemalloc = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="profiler", daemon=True
+        )
+
+    def start(self) -> "Profiler":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self._started_tracemalloc = True
+            self._snapshot = self._take_snapshot()
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Stop sampling, write the last window and stop ``tracemalloc``."""
+        if self._thread.is_alive():
+            self._stop.set()
+            self._thread.join()
+            self.dump()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def __enter__(self) -> "Profiler":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def sample(self) -> None:
+        """Record the current stack of every thread but the profiler's own."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            name = names.get(ident, str(ident))
+            self.stacks[f"{name};{collapse_stack(frame)}"] += 1
+        self.samples += 1
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+
+    def _rotate(self, pattern: str) -> None:
+        paths = sorted(self.directory.glob(pattern), key=_dump_index)
+        for path in paths[: -self.keep]:
+            path.unlink(missing_ok=True)
+
+    def dump(self) -> list[Path]:
+        """Write the current window to disk, reset it and return the paths."""
+        if self._index is None:
+            self._index = max(map(_dump_index, self.directory.iterdir()), default=0)
+        self._index += 1
+        self.dumps += 1
+        written = []
+        stacks, self.stacks = self.stacks, Counter()
+        path = self.directory / f"stacks-{self._index:05d}.folded"
+        with path.open("w", encoding="utf-8") as fh:
+            for stack, count in stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+        written.append(path)
+        self._rotate("stacks-*.folded")
+
+        if self.memory and tracemalloc.is_tracing():
+            snapshot = self._take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            path = self.directory / f"memory-{self._index:05d}.txt"
+            with path.open("w", encoding="utf-8") as fh:
+                fh.write(f"# traced {current} bytes, peak {peak} bytes\n")
+                if self._snapshot is not None:
+                    diff = snapshot.compare_to(self._snapshot, "lineno")
+                    for stat in diff[: self.top]:
+                        fh.write(f"{stat}\n")
+            self._snapshot = snapshot
+            written.append(path)
+            self._rotate("memory-*.txt")
+        logging.debug("Profiler wrote %s", ", ".join(map(str, written)))
+        return written
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.window
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+                if time.monotonic() >= deadline:
+                    self.dump()
+                    deadline = time.monotonic() + self.window
+            except Exception:  # pragma: no cover - never kill the session
+                logging.exception("Profiler sample failed")
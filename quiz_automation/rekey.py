@@ -0,0 +1,108 @@
+"""Re-key an answer cache file to the current normalised key format.
+
+Usage::
+
+    python -m quiz_automation.rekey [--cache chatgpt_cache.json] [--db events.db]
+
+Entries stored under an older key (the raw-text hash, or an older
+``vN:`` prefix) are moved to :func:`~quiz_automation.utils.cache_key`.  The
+question text comes from the entry itself or, for entries written before it
+was recorded, from the questions logged in the ``events`` table.  Entries
+whose question cannot be recovered are kept as they are; ``ask`` still finds
+raw-hash entries through its legacy fallback.
+
+The report replays the logged questions in order and compares how many
+would have been cache hits with raw and with normalised keys.  Run it while
+no quiz session is using the cache file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .answer_store import AnswerLog, Record
+from .utils import KEY_VERSION, cache_key, hash_text
+
+
+def load_questions(db: Path) -> list[str]:
+    """Return the questions logged in the ``events`` table, oldest first."""
+    conn = sqlite3.connect(db)
+    try:
+        rows = conn.execute("SELECT question FROM events ORDER BY rowid").fetchall()
+    finally:
+        conn.close()
+    return [row[0] for row in rows if row[0]]
+
+
+def replay_hits(questions: Iterable[str], key: Callable[[str], str]) -> int:
+    """Count questions whose *key* was already seen earlier in the sequence."""
+    seen: set[str] = set()
+    hits = 0
+    for question in questions:
+        k = key(question)
+        if k in seen:
+            hits += 1
+        seen.add(k)
+    return hits
+
+
+def rekey(
+    records: dict[str, Record], questions: Iterable[str] = ()
+) -> tuple[dict[str, Record], int]:
+    """Return *records* under current keys and the number of entries moved."""
+    current = f"v{KEY_VERSION}:"
+    by_raw_hash = {hash_text(q): q for q in questions}
+    result: dict[str, Record] = {}
+    moved = 0
+    for key, record in records.items():
+        if key.startswith(current):
+            result[key] = record
+            continue
+        text = record.get("question") or by_raw_hash.get(key)
+        if text is None:
+            result.setdefault(key, record)
+            continue
+        new_key = cache_key(text)
+        # Entries are oldest first, so a later answer for the same key wins.
+        result.pop(new_key, None)
+        result[new_key] = {**record, "question": text}
+        moved += 1
+    return result, moved
+
+
+def _rate(hits: int, total: int) -> str:
+    return f"{hits}/{total} ({hits / total:.1%})" if total else "n/a"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cache", type=Path, default=Path("chatgpt_cache.json"))
+    parser.add_argument("--db", type=Path, default=Path("events.db"))
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report without rewriting the cache"
+    )
+    args = parser.parse_args(argv)
+
+    questions = load_questions(args.db) if args.db.exists() else []
+    raw_hits = replay_hits(questions, hash_text)
+    normalized_hits = replay_hits(questions, cache_key)
+    print(f"Logged questions:       {len(questions)}")
+    print(f"Hit rate, raw keys:     {_rate(raw_hits, len(questions))}")
+    print(f"Hit rate, v{KEY_VERSION} keys:      {_rate(normalized_hits, len(questions))}")
+
+    log = AnswerLog(args.cache)
+    records = log.load()
+    rekeyed, moved = rekey(records, questions)
+    stale = sum(1 for key in rekeyed if not key.startswith(f"v{KEY_VERSION}:"))
+    print(f"Cache entries:          {len(records)} -> {len(rekeyed)}")
+    print(f"Re-keyed:               {moved} ({stale} left under old keys)")
+    if not args.dry_run and moved:
+        log.compact(rekeyed)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
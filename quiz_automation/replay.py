@@ -0,0 +1,149 @@
+"""Replay recorded frames as a Watcher ``capture`` source.
+
+A :class:`ReplaySource` stands in for the screen so the whole pipeline can
+run headlessly and deterministically: from a directory of PNG screenshots,
+a pack archive written by :class:`~quiz_automation.archive.PackWriter`, or a
+video file (with the optional ``opencv-python`` package).
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Tuple
+
+from PIL import Image
+
+from .archive import PackReader
+from .frame import Frame
+
+Region = Tuple[int, int, int, int]
+TimedFrame = Tuple[float, Frame]
+
+
+def iter_png_dir(directory: Path) -> Iterator[TimedFrame]:
+    """Yield PNG files in modification order, timed by their mtimes."""
+    paths = sorted(
+        Path(directory).glob("*.png"), key=lambda p: (p.stat().st_mtime, p.name)
+    )
+    start = paths[0].stat().st_mtime if paths else 0.0
+    for path in paths:
+        with Image.open(path) as img:
+            img.load()
+            yield path.stat().st_mtime - start, Frame.from_image(img)
+
+
+def iter_pack(directory: Path, interval: float = 0.5) -> Iterator[TimedFrame]:
+    """Yield frames from a pack archive, spaced *interval* seconds apart."""
+    for i, (_, frame) in enumerate(PackReader(directory)):
+        yield i * interval, frame
+
+
+def iter_video(path: Path) -> Iterator[TimedFrame]:
+    """Yield the frames of a video file, timed by its frame rate."""
+    import cv2  # optional dependency
+
+    video = cv2.VideoCapture(str(path))
+    if not video.isOpened():
+        raise OSError(f"Cannot open video: {path}")
+    fps = video.get(cv2.CAP_PROP_FPS) or 30.0
+    try:
+        i = 0
+        while True:
+            ok, bgr = video.read()
+            if not ok:
+                return
+            yield i / fps, Frame(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB), "RGB")
+            i += 1
+    finally:
+        video.release()
+
+
+def open_recording(path: Path, *, interval: float = 0.5) -> Iterator[TimedFrame]:
+    """Return timed frames from a pack archive, PNG directory or video file."""
+    path = Path(path)
+    if path.is_dir():
+        if any(path.glob("frames-*.pack")):
+            return iter_pack(path, interval)
+        return iter_png_dir(path)
+    if path.is_file():
+        return iter_video(path)
+    raise FileNotFoundError(path)
+
+
+class ReplaySource:
+    """Serve recorded frames through the ``capture(region)`` interface.
+
+    With a ``speed`` the recording plays on its own timeline (``2.0`` is
+    twice real time): each call returns the frame that would be on screen at
+    that moment, so frames are skipped or repeated exactly as a live screen
+    would be sampled.  With ``speed=None`` every frame is returned exactly
+    once, as fast as the caller asks for them.
+
+    Once the recording is exhausted the source raises :class:`StopIteration`,
+    which makes a Watcher finish its run.  Frames larger than the requested
+    region are cropped to it.
+    """
+
+    def __init__(
+        self,
+        frames: Iterable[TimedFrame],
+        speed: float | None = 1.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive or None")
+        self._frames = iter(frames)
+        self.speed = speed
+        self._clock = clock
+        self._start = 0.0
+        self._t0 = 0.0
+        self._current: TimedFrame | None = None
+        self._next: TimedFrame | None = next(self._frames, None)
+        self._served_current = False
+        self.frames_read = 0
+        self.captures = 0
+
+    @property
+    def region(self) -> Region:
+        """The full-frame region of the recording."""
+        head = self._next or self._current
+        if head is None:
+            return 0, 0, 0, 0
+        return 0, 0, head[1].width, head[1].height
+
+    def _advance(self) -> None:
+        self._current = self._next
+        self._next = next(self._frames, None)
+        self._served_current = False
+        self.frames_read += 1
+
+    def _select(self) -> Frame:
+        if self._current is None:
+            if self._next is None:
+                raise StopIteration
+            self._advance()
+            self._t0 = self._current[0]  # type: ignore[index]
+            self._start = self._clock()
+        elif self.speed is None:
+            if self._next is None:
+                raise StopIteration
+            self._advance()
+        else:
+            position = (self._clock() - self._start) * self.speed
+            while self._next is not None and self._next[0] - self._t0 <= position:
+                self._advance()
+            if self._next is None and self._served_current:
+                raise StopIteration
+        assert self._current is not None
+        self._served_current = True
+        return self._current[1]
+
+    def __call__(self, region: Region) -> Frame:
+        frame = self._select()
+        self.captures += 1
+        left, top, width, height = region
+        if width and height and (width, height) != frame.size:
+            return frame.crop(left, top, width, height)
+        return frame
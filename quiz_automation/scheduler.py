@@ -0,0 +1,70 @@
+"""Adaptive poll interval for the watcher loop."""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+
+class AdaptivePoller:
+    """Poll fast while the screen changes and back off while it is stable.
+
+    Every stable tick multiplies the interval by ``backoff`` up to
+    ``ceiling``; a change snaps it straight back to ``floor``.  The effective
+    poll rate (ticks per second, including capture and OCR time) is tracked as
+    an exponential moving average so it can be compared with latency targets.
+    """
+
+    def __init__(
+        self,
+        floor: float = 0.05,
+        ceiling: float = 2.0,
+        backoff: float = 2.0,
+        *,
+        smoothing: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if floor <= 0 or ceiling < floor:
+            raise ValueError("Require 0 < floor <= ceiling")
+        if backoff < 1:
+            raise ValueError("backoff must be >= 1")
+        self.floor = floor
+        self.ceiling = ceiling
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.interval = floor
+        self._clock = clock
+        self._last_tick: float | None = None
+        self._avg_period: float | None = None
+
+    def next_interval(self, changed: bool) -> float:
+        """Record a tick and return how long to sleep before the next one."""
+        self._record_tick()
+        if changed:
+            self.interval = self.floor
+        else:
+            self.interval = min(self.ceiling, self.interval * self.backoff)
+        return self.interval
+
+    def _record_tick(self) -> None:
+        now = self._clock()
+        if self._last_tick is not None:
+            period = now - self._last_tick
+            if self._avg_period is None:
+                self._avg_period = period
+            else:
+                self._avg_period += self.smoothing * (period - self._avg_period)
+        self._last_tick = now
+
+    @property
+    def poll_rate(self) -> float:
+        """Return the smoothed number of ticks per second (0 until known)."""
+        if not self._avg_period:
+            return 0.0
+        return 1.0 / self._avg_period
+
+    def reset(self) -> None:
+        """Return to the fast interval and forget rate history."""
+        self.interval = self.floor
+        self._last_tick = None
+        self._avg_period = None
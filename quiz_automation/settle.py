@@ -0,0 +1,103 @@
+"""Hold OCR text back until the screen has stopped changing."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable
+
+from .dedup import normalize
+
+
+@dataclass(frozen=True)
+class Settled:
+    """A question that stayed stable long enough to be emitted."""
+
+    text: str
+    payload: Any
+    ticks: int
+    settle_time: float  # seconds from first sighting to emission
+
+
+class SettleGate:
+    """Release a text once it has been stable for ``ticks`` or ``duration``.
+
+    A page that is still animating or loading produces a series of partial
+    OCR results.  Every result is passed to :meth:`observe`; the gate only
+    returns it once the same (normalised) text has been seen on ``ticks``
+    consecutive observations or has persisted for ``duration`` seconds,
+    whichever comes first.  Each settled text is released once.
+
+    Frames skipped by a change detector never reach OCR, so the watcher
+    reports them through :meth:`unchanged`, which counts as another stable
+    observation of the current text.  :meth:`changed` marks that a new frame
+    is on its way to OCR, pausing those stable ticks until its result
+    arrives.
+    """
+
+    def __init__(
+        self,
+        ticks: int | None = 3,
+        duration: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ticks is None and duration is None:
+            raise ValueError("Require ticks or duration")
+        self.ticks = ticks
+        self.duration = duration
+        self._clock = clock
+        self._lock = Lock()
+        self.last: Settled | None = None
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._key: str | None = None
+            self._text = ""
+            self._payload: Any = None
+            self._count = 0
+            self._first = 0.0
+            self._released = False
+            self._waiting = False
+
+    def _check(self) -> Settled | None:
+        if self._key is None or self._released:
+            return None
+        elapsed = self._clock() - self._first
+        if (self.ticks is not None and self._count >= self.ticks) or (
+            self.duration is not None and elapsed >= self.duration
+        ):
+            self._released = True
+            self.last = Settled(self._text, self._payload, self._count, elapsed)
+            return self.last
+        return None
+
+    def observe(self, text: str, payload: Any = None) -> Settled | None:
+        """Record an OCR result; return it once it has settled."""
+        key = normalize(text)
+        with self._lock:
+            self._waiting = False
+            if key != self._key:
+                self._key = key
+                self._count = 0
+                self._first = self._clock()
+                self._released = False
+            self._count += 1
+            self._text = text
+            self._payload = payload
+            return self._check()
+
+    def unchanged(self) -> Settled | None:
+        """Count a frame identical to the last OCR'd one as a stable tick."""
+        with self._lock:
+            if self._waiting or self._key is None:
+                return None
+            self._count += 1
+            return self._check()
+
+    def changed(self) -> None:
+        """Note that a changed frame has been sent to OCR."""
+        with self._lock:
+            self._waiting = True
@@ -0,0 +1,120 @@
+"""Incremental OCR that only re-reads the parts of a frame that changed."""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import numpy as np
+
+from .frame import to_gray
+
+Bounds = tuple[int, int, int, int]  # top, bottom, left, right
+
+
+def parse_grid(spec: str) -> tuple[int, int]:
+    """Parse a ``"ROWSxCOLS"`` grid specification such as ``"6x1"``."""
+    try:
+        rows, cols = (int(part) for part in spec.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"Invalid tile grid: {spec!r}") from None
+    if rows < 1 or cols < 1:
+        raise ValueError(f"Invalid tile grid: {spec!r}")
+    return rows, cols
+
+
+def _cuts(activity: np.ndarray, parts: int) -> list[int]:
+    """Split ``len(activity)`` into *parts*, snapping cuts to quiet lines.
+
+    Each cut moves to the least active row (or column) within half a tile of
+    its nominal position so that text lines are not sliced in two.
+    """
+    length = len(activity)
+    step = length / parts
+    cuts = [0]
+    for k in range(1, parts):
+        nominal = round(k * step)
+        lo = max(cuts[-1] + 1, nominal - int(step // 2))
+        hi = min(length - 1, nominal + int(step // 2))
+        if lo > hi:
+            cuts.append(min(max(nominal, cuts[-1] + 1), length - 1))
+            continue
+        window = activity[lo : hi + 1]
+        candidates = np.flatnonzero(window == window.min()) + lo
+        cuts.append(int(candidates[np.argmin(np.abs(candidates - nominal))]))
+    cuts.append(length)
+    return cuts
+
+
+class TiledOCR:
+    """Wrap an OCR callable to re-recognise only changed tiles.
+
+    The grayscale frame is split into a ``rows`` x ``cols`` grid whose edges
+    are snapped to blank lines.  Each tile is compared with the same tile of
+    the previous frame and only tiles whose pixels differ are passed to
+    ``ocr``; the others reuse their cached text.  Tile texts are joined in
+    reading order, so a highlighted option or ticking timer costs one tile
+    of OCR rather than the whole region.
+
+    An instance keeps state for one region and must only be called from one
+    thread at a time.
+    """
+
+    def __init__(
+        self, ocr: Callable[[Any], str], rows: int = 4, cols: int = 1
+    ) -> None:
+        self.ocr = ocr
+        self.rows = rows
+        self.cols = cols
+        self._tiles: dict[int, tuple[Bounds, np.ndarray, str]] = {}
+        self.tiles_ocred = 0
+        self.tiles_reused = 0
+
+    def grid(self, gray: np.ndarray) -> list[Bounds]:
+        """Return the tile bounds for *gray* in reading order."""
+        height, width = gray.shape
+        rows = min(self.rows, height)
+        cols = min(self.cols, width)
+        row_cuts = _cuts(np.ptp(gray, axis=1), rows)
+        col_cuts = _cuts(np.ptp(gray, axis=0), cols)
+        return [
+            (row_cuts[r], row_cuts[r + 1], col_cuts[c], col_cuts[c + 1])
+            for r in range(rows)
+            for c in range(cols)
+        ]
+
+    def __call__(self, img: Any) -> str:
+        gray = to_gray(img)
+        if gray.size == 0:
+            return ""
+        bounds = self.grid(gray)
+        if len(bounds) != len(self._tiles):
+            self._tiles.clear()
+        texts = []
+        for index, box in enumerate(bounds):
+            top, bottom, left, right = box
+            tile = gray[top:bottom, left:right]
+            cached = self._tiles.get(index)
+            if (
+                cached is not None
+                and cached[0] == box
+                and np.array_equal(cached[1], tile)
+            ):
+                text = cached[2]
+                self.tiles_reused += 1
+            else:
+                text = self.ocr(tile)
+                self._tiles[index] = (box, tile.copy(), text)
+                self.tiles_ocred += 1
+            if text:
+                texts.append(text)
+        return "\n".join(texts)
+
+    def reset(self) -> None:
+        self._tiles.clear()
+
+    def close(self) -> None:
+        """Close the wrapped backend, if it has a ``close`` method."""
+        self.reset()
+        close = getattr(self.ocr, "close", None)
+        if close is not None:
+            close()
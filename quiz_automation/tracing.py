@@ -0,0 +1,161 @@
+"""Per-question trace spans exported in the Chrome trace-event format.
+
+Aggregate histograms (see :mod:`quiz_automation.metrics`) show that a stage
+is slow; traces show *which* question was slow and where its time went.
+Every captured frame gets a trace id which follows the frame through OCR,
+settling, the question pipeline, :meth:`ChatGPTClient.ask` (each attempt and
+backoff), the click and the log write.  The id is held in a thread-local
+and carried across threads by :class:`~quiz_automation.pipeline.QuestionPipeline`.
+
+The module-level :data:`TRACER` is disabled by default; in that state
+:meth:`Tracer.span` returns a shared no-op context manager, so instrumented
+code pays one attribute check per span.  Load the file written by
+:meth:`Tracer.export` in ``chrome://tracing`` or https://ui.perfetto.dev.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, ContextManager
+
+_NULL: ContextManager[None] = nullcontext()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, args: dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.record(self.name, self.start, time.perf_counter(), **self.args)
+
+
+class _TraceContext:
+    __slots__ = ("local", "trace_id", "previous")
+
+    def __init__(self, local: threading.local, trace_id: str) -> None:
+        self.local = local
+        self.trace_id = trace_id
+
+    def __enter__(self) -> str:
+        self.previous = getattr(self.local, "trace_id", None)
+        self.local.trace_id = self.trace_id
+        return self.trace_id
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.local.trace_id = self.previous
+
+
+class Tracer:
+    """Collect timed spans and instant events for later export.
+
+    At most ``max_events`` events are kept; the oldest are discarded first.
+    """
+
+    def __init__(self, max_events: int = 100_000) -> None:
+        self.enabled = False
+        self._events: deque[dict[str, Any]] = deque(maxlen=max_events)
+        self._threads: dict[int, str] = {}
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+        self._prefix = f"{os.getpid():x}"
+        self._origin = time.perf_counter()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        self._events.clear()
+        self._threads.clear()
+
+    def new_trace(self) -> str | None:
+        """Return a fresh trace id, or None while tracing is disabled."""
+        if not self.enabled:
+            return None
+        return f"{self._prefix}-{next(self._ids)}"
+
+    def current(self) -> str | None:
+        """Return the trace id active on this thread."""
+        return getattr(self._local, "trace_id", None)
+
+    def context(self, trace_id: str | None) -> ContextManager[Any]:
+        """Make *trace_id* the active trace for the ``with`` block."""
+        if trace_id is None:
+            return _NULL
+        return _TraceContext(self._local, trace_id)
+
+    def span(self, name: str, **args: Any) -> ContextManager[Any]:
+        """Time the ``with`` block as a span of the current trace."""
+        if not self.enabled:
+            return _NULL
+        return _Span(self, name, args)
+
+    def _event(self, name: str, phase: str, start: float, args: dict[str, Any]) -> dict[str, Any]:
+        thread = threading.current_thread()
+        self._threads.setdefault(thread.ident or 0, thread.name)
+        trace_id = args.pop("trace_id", None) or self.current()
+        if trace_id is not None:
+            args["trace_id"] = trace_id
+        return {
+            "name": name,
+            "ph": phase,
+            "ts": (start - self._origin) * 1e6,
+            "pid": os.getpid(),
+            "tid": thread.ident or 0,
+            "args": args,
+        }
+
+    def record(self, name: str, start: float, end: float, **args: Any) -> None:
+        """Add a span between two :func:`time.perf_counter` readings."""
+        if not self.enabled:
+            return
+        event = self._event(name, "X", start, args)
+        event["dur"] = (end - start) * 1e6
+        self._events.append(event)
+
+    def instant(self, name: str, **args: Any) -> None:
+        """Add a point-in-time event to the current trace."""
+        if not self.enabled:
+            return
+        event = self._event(name, "i", time.perf_counter(), args)
+        event["s"] = "t"
+        self._events.append(event)
+
+    def events(self) -> list[dict[str, Any]]:
+        return list(self._events)
+
+    def export(self, path: Path) -> int:
+        """Write the collected events as Chrome trace JSON; return the count."""
+        events = self.events()
+        pid = os.getpid()
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self._threads.items())
+        ]
+        Path(path).write_text(
+            json.dumps({"traceEvents": metadata + events, "displayTimeUnit": "ms"}),
+            encoding="utf-8",
+        )
+        return len(events)
+
+
+TRACER = Tracer()
@@ -3,8 +3,37 @@
 from __future__ import annotations
 
 import hashlib
+import unicodedata
 
 
 def hash_text(text: str) -> str:
     """Return SHA256 hash of text."""
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# Bump when canonical_question changes so old cache keys stay distinct.
+KEY_VERSION = 1
+
+# Typographic quotes and dashes that OCR and quiz pages use interchangeably.
+_PUNCTUATION = str.maketrans(
+    {
+        **dict.fromkeys("\u2018\u2019\u201a\u201b\u2032", "'"),
+        **dict.fromkeys("\u201c\u201d\u201e\u2033", '"'),
+        **dict.fromkeys("\u2010\u2011\u2012\u2013\u2014\u2212", "-"),
+    }
+)
+
+
+def canonical_question(text: str) -> str:
+    """Return *text* with Unicode forms, quotes, dashes, case and spacing folded.
+
+    Only differences that cannot change a question's meaning are removed;
+    OCR letter confusions are left to :mod:`quiz_automation.dedup`.
+    """
+    text = unicodedata.normalize("NFKC", text).translate(_PUNCTUATION)
+    return " ".join(text.casefold().split())
+
+
+def cache_key(text: str) -> str:
+    """Return the versioned answer-cache key for question *text*."""
+    return f"v{KEY_VERSION}:{hash_text(canonical_question(text))}"
@@ -1,112 +1,434 @@
-"""Simplified watcher implementation for tests."""
-
-from __future__ import annotations
-
-from threading import Event, Thread
-from typing import Any, Callable, Tuple
-
-=======
+"""Background thread that watches a screen region for new quiz questions."""
 
 from __future__ import annotations
 
 import logging
+import time
+from collections import deque
+from concurrent.futures import Future
 from pathlib import Path
-from threading import Event, Thread
+from threading import Event, Lock, Thread
 from typing import Any, Callable, Tuple
 
-from mss import mss
-from PIL import Image
-import pytesseract
+from .archive import ScreenshotArchive
+from .capture import ScreenGrabber
+from .config import Settings
+from .dedup import QuestionDeduplicator
+from .frame import Frame
+from .frame_diff import ChangeDetector
+from .metrics import REGISTRY, stage_timer
+from .ocr import get_ocr_backend
+from .ocr_cache import OCRCache, frame_key
+from .ocr_pool import OCRPool
+from .pipeline import DROP_OLDEST, Stage, StageQueue
+from .preprocess import get_profile
+from .scheduler import AdaptivePoller
+from .settle import SettleGate
+from .tiles import TiledOCR, parse_grid
+from .tracing import TRACER
 from .utils import hash_text
 
 
-def _capture(region: Tuple[int, int, int, int]) -> Image.Image:
+def _capture(region: Tuple[int, int, int, int]) -> Frame:
+    """Capture *region* once with a short-lived grabber."""
+    with ScreenGrabber() as grabber:
+        return grabber.grab(region)
 
-    left, top, width, height = region
-    monitor = {"left": left, "top": top, "width": width, "height": height}
-    with mss() as sct:
-        shot = sct.grab(monitor)
-        return Image.frombytes("RGB", shot.size, shot.rgb)
 
+def question_dedup(settings: Settings) -> QuestionDeduplicator | None:
+    """Return a fresh deduplicator configured by *settings*, if enabled."""
+    if settings.dedup_threshold is None:
+        return None
+    return QuestionDeduplicator(settings.dedup_threshold, settings.dedup_window)
 
-def _ocr(img: Any) -> str:
 
-    return pytesseract.image_to_string(img).strip()
+def watcher_options(settings: Settings) -> dict[str, Any]:
+    """Return :class:`Watcher` keyword arguments configured by *settings*.
+
+    The ``ocr`` backend, ``ocr_pool`` and ``archive`` in the result are not
+    owned by the watcher; close them once the watcher thread has stopped.
+    The ``dedup`` state belongs to one watcher; give every other watcher its
+    own from :func:`question_dedup`.
+    """
+    profile = get_profile(settings.ocr_profile) if settings.ocr_profile else None
+    ocr_options = profile.ocr_options() if profile else {}
+    return {
+        "archive": (
+            ScreenshotArchive(
+                settings.screenshot_dir,
+                settings.screenshot_format,
+                level=settings.screenshot_compression,
+            )
+            if settings.screenshot_dir
+            else None
+        ),
+        "ocr": get_ocr_backend(settings.ocr_backend, **ocr_options),
+        "ocr_pool": (
+            OCRPool(
+                settings.ocr_workers,
+                backend=settings.ocr_backend,
+                options=ocr_options,
+            )
+            if settings.ocr_workers > 0
+            else None
+        ),
+        "preprocess": profile,
+        "ocr_cache": (
+            OCRCache(settings.ocr_cache_size, settings.ocr_cache_bytes)
+            if settings.ocr_cache_size > 0
+            else None
+        ),
+        "change_threshold": settings.change_threshold,
+        "scheduler": (
+            AdaptivePoller(settings.poll_floor, settings.poll_ceiling)
+            if settings.adaptive_poll
+            else None
+        ),
+        "dedup": question_dedup(settings),
+        "ocr_tiles": parse_grid(settings.ocr_tiles) if settings.ocr_tiles else None,
+        "settle_ticks": settings.settle_ticks or None,
+        "settle_time": settings.settle_ms / 1000 if settings.settle_ms else None,
+    }
 
 
 class Watcher(Thread):
-    """Thread that repeatedly captures a region and emits new questions."""
+    """Thread that repeatedly captures a region and emits new questions.
+
+    When no ``capture`` callable is supplied the thread owns a
+    :class:`~quiz_automation.capture.ScreenGrabber` for its whole lifetime;
+    likewise, without an ``ocr`` callable it owns the default backend from
+    :func:`~quiz_automation.ocr.get_ocr_backend`.
+
+    With ``async_ocr`` the thread only captures and filters frames; OCR runs
+    on a separate ``ocr`` stage fed through a one-slot ``DROP_OLDEST`` queue,
+    so slow recognition never delays the next capture.  Combine it with a
+    :class:`~quiz_automation.pipeline.QuestionPipeline` as ``on_question`` to
+    keep solving and clicking off both threads.
+
+    ``preprocess`` (for example a
+    :class:`~quiz_automation.preprocess.PreprocessProfile`) runs on each
+    changed frame right before OCR.  An ``ocr_cache`` short-circuits OCR for
+    (preprocessed) frames whose pixels were recognised before, e.g. when the
+    quiz flips back to a screen it has already shown.
+
+    An ``ocr_pool`` moves recognition to worker processes: frames are
+    submitted without waiting and results are emitted in frame order as they
+    complete, so OCR throughput scales with cores.
+
+    A ``scheduler`` replaces the fixed ``poll_interval`` with an
+    :class:`~quiz_automation.scheduler.AdaptivePoller`; frames that pass the
+    change detector (every frame when there is none) count as changes.
+
+    A ``dedup`` :class:`~quiz_automation.dedup.QuestionDeduplicator` makes
+    :meth:`is_new_question` ignore texts that are near-identical to any
+    recently emitted question, so OCR jitter does not trigger another solve.
+
+    ``settle_ticks`` and/or ``settle_time`` hold each text back until it has
+    been stable for that many ticks or seconds (see
+    :class:`~quiz_automation.settle.SettleGate`), so half-rendered pages are
+    not emitted.  The settle time of every question is logged.
+
+    ``ocr_tiles=(rows, cols)`` wraps ``ocr`` in a
+    :class:`~quiz_automation.tiles.TiledOCR` so that only the grid tiles whose
+    pixels changed are re-recognised.  It does not apply to ``ocr_pool``.
+
+    A ``capture`` callable may raise :class:`StopIteration` to end the run
+    (see :class:`~quiz_automation.replay.ReplaySource`); frames already
+    captured are still recognised and emitted.
+
+    Every captured frame gets a :data:`~quiz_automation.tracing.TRACER` trace
+    id that stays current while its text is recognised, settled and passed
+    to ``on_question``; with tracing disabled this costs nothing.
+
+    Screenshots of new questions go to an ``archive``
+    (:class:`~quiz_automation.archive.ScreenshotArchive`) on a background
+    thread.  Given only ``screenshot_dir``, the watcher writes PNG files
+    through an archive of its own that is flushed when :meth:`run` returns.
+    """
 
     def __init__(
         self,
         region: Tuple[int, int, int, int],
         on_question: Callable[[str], None],
         poll_interval: float = 0.5,
-        screenshot_dir=None,
-=======
         *,
         screenshot_dir: Path | None = None,
+        archive: ScreenshotArchive | None = None,
         capture: Callable[[Tuple[int, int, int, int]], Any] | None = None,
         ocr: Callable[[Any], str] | None = None,
+        preprocess: Callable[[Any], Any] | None = None,
+        ocr_cache: OCRCache | None = None,
+        ocr_pool: OCRPool | None = None,
         on_error: Callable[[Exception], None] | None = None,
+        change_threshold: float | None = None,
+        async_ocr: bool = False,
+        scheduler: AdaptivePoller | None = None,
+        dedup: QuestionDeduplicator | None = None,
+        settle_ticks: int | None = None,
+        settle_time: float | None = None,
+        ocr_tiles: tuple[int, int] | None = None,
     ) -> None:
         super().__init__(daemon=True)
         self.region = region
         self.on_question = on_question
         self.poll_interval = poll_interval
-        self.capture = capture or (lambda r: None)
-        self.ocr = ocr or (lambda img: "")
-=======
-        self.capture = capture or _capture
-        self.ocr = ocr or _ocr
+        self.capture = capture
+        self._owns_ocr = ocr is None
+        self.ocr = ocr or get_ocr_backend()
+        if ocr_tiles is not None:
+            self.ocr = TiledOCR(self.ocr, *ocr_tiles)
+        self.preprocess = preprocess
+        self.ocr_cache = ocr_cache
+        self.ocr_pool = ocr_pool
+        self._pending: deque[
+            tuple[Future[str], Any, bytes | None, str | None]
+        ] = deque()
         self.on_error = on_error
         self.screenshot_dir = screenshot_dir
+        self.archive = archive
+        self._owns_archive = False
+        self.change_detector = (
+            ChangeDetector(change_threshold) if change_threshold is not None else None
+        )
+        self.async_ocr = async_ocr
+        self.scheduler = scheduler
+        self.dedup = dedup
+        self.settle = (
+            SettleGate(settle_ticks, settle_time)
+            if settle_ticks is not None or settle_time is not None
+            else None
+        )
+        self.ocr_queue: StageQueue[Any] | None = None
         self.stop_flag = Event()
         self._last_text = ""
+        # With ``async_ocr`` or an ``ocr_pool`` questions are emitted from
+        # both the capture and the OCR thread; this makes the new-question
+        # check and its bookkeeping atomic so none is emitted twice.
+        self._emit_lock = Lock()
+        # Frames that went through OCR vs. frames skipped as unchanged.
+        self.frames_processed = 0
+        self.frames_skipped = 0
 
-    def is_new_question(self, text: str) -> bool:
-        """Return True if ``text`` is different from the last value."""
+    @property
+    def poll_rate(self) -> float | None:
+        """Effective captures per second when an adaptive scheduler is used."""
+        return self.scheduler.poll_rate if self.scheduler else None
 
-        if text and text != self._last_text:
-            return True
-        return False
-=======
+    def _wait(self, changed: bool) -> None:
+        """Sleep until the next tick, adapting the interval if configured."""
+        if self.scheduler is None:
+            interval = self.poll_interval
+        else:
+            interval = self.scheduler.next_interval(changed)
+        self.stop_flag.wait(interval)
+
+    def is_new_question(self, text: str) -> bool:
         """Return True if *text* represents a new quiz question."""
-        return text != "" and text != self._last_text
+        if text == "" or text == self._last_text:
+            return False
+        return self.dedup is None or not self.dedup.is_duplicate(text)
 
     def run(self) -> None:  # pragma: no cover - exercised via tests
+        grabber = ScreenGrabber() if self.capture is None else None
+        capture = self.capture or grabber.grab
+        ocr_stage = None
+        if self.async_ocr:
+            # Only the most recent changed frame is worth recognising.
+            self.ocr_queue = StageQueue("frames", 1, DROP_OLDEST)
+            ocr_stage = Stage(
+                "ocr", self._process_queued, self.ocr_queue, on_error=self.on_error
+            )
+            ocr_stage.start()
+        try:
+            self._loop(capture)
+            self.collect_results(wait=True)
+        finally:
+            if ocr_stage is not None:
+                self.ocr_queue.close()
+                ocr_stage.join()
+            if grabber is not None:
+                grabber.close()
+            if self._owns_ocr:
+                self.ocr.close()  # type: ignore[attr-defined]
+            if self._owns_archive and self.archive is not None:
+                self.archive.close()
+                self.archive = None
+                self._owns_archive = False
+
+    def _loop(self, capture: Callable[[Tuple[int, int, int, int]], Any]) -> None:
         while not self.stop_flag.is_set():
-            try:
-                img = self.capture(self.region)
-            except Exception as exc:  # pragma: no cover - logging behaviour
-                logging.exception("Screenshot capture failed")
-                if self.on_error:
-                    self.on_error(exc)
-                self.stop_flag.wait(self.poll_interval)
-                continue
+            with TRACER.context(TRACER.new_trace()):
+                start = time.perf_counter()
+                try:
+                    with TRACER.span("capture"):
+                        img = capture(self.region)
+                except StopIteration:
+                    logging.info("Capture source exhausted")
+                    return
+                except Exception as exc:  # pragma: no cover - logging behaviour
+                    logging.exception("Screenshot capture failed")
+                    if self.on_error:
+                        self.on_error(exc)
+                    self._wait(False)
+                    continue
+                stage_timer("capture").observe(time.perf_counter() - start)
+
+                changed = self.feed(img)
+            self.collect_results()
+            self._wait(changed)
+
+    def feed(self, img: Any) -> bool:
+        """Pass one captured frame through change detection and OCR.
+
+        Returns False if the frame was skipped as unchanged.  OCR runs inline,
+        is queued to the OCR stage when ``async_ocr`` is active, or is
+        submitted to the ``ocr_pool`` (see :meth:`collect_results`).
+        """
+        if self.change_detector and not self.change_detector.changed(img):
+            self.frames_skipped += 1
+            REGISTRY.counter(
+                "quiz_frames_total", "Captured frames", result="skipped"
+            ).inc()
+            if self.settle is not None:
+                settled = self.settle.unchanged()
+                if settled is not None:
+                    self._emit(settled.text, settled.payload)
+            return False
+        self.frames_processed += 1
+        REGISTRY.counter(
+            "quiz_frames_total", "Captured frames", result="processed"
+        ).inc()
+        if self.settle is not None:
+            self.settle.changed()
+
+        if self.ocr_pool is not None:
+            self._submit(img)
+        elif self.ocr_queue is not None:
+            self.ocr_queue.put((img, TRACER.current()))
+        else:
+            self.process_frame(img)
+        return True
+
+    def _cache_key(self, img: Any) -> bytes | None:
+        if self.ocr_cache is None:
+            return None
+        try:
+            return frame_key(img)
+        except (TypeError, ValueError):
+            return None
+
+    def _recognise(self, img: Any) -> str:
+        """Return OCR text for *img*, consulting the OCR cache if enabled."""
+        key = self._cache_key(img)
+        if key is None:
+            return self.ocr(img)
+        text = self.ocr_cache.get(key)  # type: ignore[union-attr]
+        if text is None:
+            text = self.ocr(img)
+            self.ocr_cache.put(key, text)  # type: ignore[union-attr]
+        return text
+
+    def _ocr_failed(self, exc: Exception) -> None:
+        logging.error("OCR failed", exc_info=exc)
+        if self.change_detector:
+            # Retry OCR on the next frame even if it is identical.
+            self.change_detector.reset()
+        if self.on_error:
+            self.on_error(exc)
+
+    def _process_queued(self, item: tuple[Any, str | None]) -> None:
+        img, trace = item
+        with TRACER.context(trace):
+            self.process_frame(img)
+
+    def process_frame(self, img: Any) -> None:
+        """Run OCR on *img* and emit the text if it is a new question."""
+        try:
+            with stage_timer("ocr").time(), TRACER.span("ocr"):
+                prepared = self.preprocess(img) if self.preprocess else img
+                text = self._recognise(prepared)
+        except Exception as exc:  # pragma: no cover - logging behaviour
+            self._ocr_failed(exc)
+            return
+        self._handle_text(text, img)
+
+    def _submit(self, img: Any) -> None:
+        """Hand *img* to the OCR pool, or resolve it from the cache."""
+        try:
+            prepared = self.preprocess(img) if self.preprocess else img
+            key = self._cache_key(prepared)
+            text = self.ocr_cache.get(key) if key is not None else None  # type: ignore[union-attr]
+            if text is None:
+                future = self.ocr_pool.submit(prepared)  # type: ignore[union-attr]
+            else:
+                # Keep cache hits in line behind frames still in flight.
+                future = Future()
+                future.set_result(text)
+                key = None
+        except Exception as exc:  # pragma: no cover - logging behaviour
+            self._ocr_failed(exc)
+            return
+        self._pending.append((future, img, key, TRACER.current()))
+
+    def collect_results(self, wait: bool = False) -> None:
+        """Emit finished pool results in the order their frames arrived.
+
+        Only completed results at the head of the queue are handled, so a
+        slow frame holds back later ones.  With ``wait`` every pending frame
+        is waited for.
+        """
+        while self._pending and (wait or self._pending[0][0].done()):
+            future, img, key, trace = self._pending.popleft()
+            with TRACER.context(trace):
+                try:
+                    with TRACER.span("ocr_wait"):
+                        text = future.result()
+                except Exception as exc:  # pragma: no cover - logging behaviour
+                    self._ocr_failed(exc)
+                    continue
+                if key is not None:
+                    self.ocr_cache.put(key, text)  # type: ignore[union-attr]
+                self._handle_text(text, img)
+
+    def _handle_text(self, text: str, img: Any) -> None:
+        if self.settle is not None:
+            settled = self.settle.observe(text, img)
+            if settled is None:
+                return
+            text, img = settled.text, settled.payload
+        self._emit(text, img)
+
+    def _get_archive(self) -> ScreenshotArchive | None:
+        if self.archive is None and self.screenshot_dir:
+            self.archive = ScreenshotArchive(self.screenshot_dir)
+            self._owns_archive = True
+        return self.archive
 
+    def _emit(self, text: str, img: Any) -> None:
+        with self._emit_lock:
+            if not self.is_new_question(text):
+                return
+            self._last_text = text
+            if self.dedup is not None:
+                self.dedup.add(text)
+        if self.settle is not None and self.settle.last is not None:
+            settled = self.settle.last
+            logging.info(
+                "Question settled after %.3fs (%d ticks)",
+                settled.settle_time,
+                settled.ticks,
+            )
+            now = time.perf_counter()
+            TRACER.record(
+                "settle", now - settled.settle_time, now, ticks=settled.ticks
+            )
+        archive = self._get_archive()
+        if archive is not None:
             try:
-                text = self.ocr(img)
-            except Exception as exc:  # pragma: no cover - logging behaviour
-                logging.exception("OCR failed")
-                if self.on_error:
-                    self.on_error(exc)
-                self.stop_flag.wait(self.poll_interval)
-                continue
-
-            if self.is_new_question(text):
-                self._last_text = text
-                if self.screenshot_dir:
-                    try:
-                        self.screenshot_dir.mkdir(parents=True, exist_ok=True)
-                        filename = hash_text(text)
-                        img.save(self.screenshot_dir / f"{filename}.png")
-                    except Exception:  # pragma: no cover - best effort, log only
-                        logging.exception("Failed to save screenshot")
-                # Emit the new question to the caller.
-                self.on_question(text)
-
-            self.stop_flag.wait(self.poll_interval)
-
-    def run(self) -> None:  # pragma: no cover - thread loop stub
-        pass
+                archive.save(hash_text(text), img)
+            except Exception:  # pragma: no cover - best effort, log only
+                logging.exception("Failed to save screenshot")
+        # Emit the new question to the caller.
+        REGISTRY.counter("quiz_questions_total", "Questions emitted").inc()
+        TRACER.instant("question", text=text[:80])
+        self.on_question(text)
@@ -7,3 +7,9 @@ class OpenAI:
     def __init__(self, api_key: str = "") -> None:  # pragma: no cover
         self.api_key = api_key
         self.responses = None
+
+
+class AsyncOpenAI:
+    def __init__(self, api_key: str = "") -> None:  # pragma: no cover
+        self.api_key = api_key
+        self.responses = None
@@ -0,0 +1,87 @@
+from threading import Thread
+from types import SimpleNamespace
+
+import pytest
+
+from quiz_automation.answer_cache import AnswerCache, entry_size, parse_ttls
+from quiz_automation.chatgpt_client import ChatGPTResponse
+
+
+def _resp(answer: str = "A") -> ChatGPTResponse:
+    return ChatGPTResponse(answer, SimpleNamespace(input_tokens=1, output_tokens=1), 0.0)
+
+
+def test_lru_eviction_and_counters() -> None:
+    cache = AnswerCache(max_entries=2)
+    cache["a"] = _resp("A")
+    cache["b"] = _resp("B")
+    assert cache.get("a").answer == "A"  # a is now most recent
+    cache["c"] = _resp("C")
+
+    assert "b" not in cache
+    assert sorted(cache) == ["a", "c"]
+    assert cache.get("b") is None
+    assert cache.stats() == {
+        "entries": 2,
+        "bytes": cache.nbytes,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+        "expirations": 0,
+    }
+
+
+def test_byte_budget() -> None:
+    size = entry_size("k0", _resp())
+    cache = AnswerCache(max_entries=100, max_bytes=size * 3)
+    for i in range(5):
+        cache[f"k{i}"] = _resp()
+    assert len(cache) == 3
+    assert cache.nbytes <= size * 3
+    del cache["k4"]
+    assert len(cache) == 2
+
+
+def test_ttl_per_tag() -> None:
+    now = [0.0]
+    cache = AnswerCache(ttl=100, ttls={"old-model": 10}, clock=lambda: now[0])
+    cache.put("a", _resp(), tag="old-model")
+    cache.put("b", _resp(), tag="new-model")
+    cache.put("c", _resp(), stored=-95.0)
+
+    now[0] = 11.0
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert "c" not in cache
+    assert cache.stats()["expirations"] == 2
+    assert [key for key, _ in cache.items()] == ["b"]
+
+
+def test_parse_ttls() -> None:
+    assert parse_ttls("gpt-4o=60, prompt=v2=5,keep=0,") == {
+        "gpt-4o": 60.0,
+        "prompt=v2": 5.0,
+        "keep": None,
+    }
+    with pytest.raises(ValueError):
+        parse_ttls("gpt-4o")
+
+
+def test_dict_compatible_and_thread_safe() -> None:
+    cache = AnswerCache(max_entries=50)
+
+    def worker(n: int) -> None:
+        for i in range(200):
+            cache[f"{n}-{i}"] = _resp()
+            cache.get(f"{n}-{i // 2}")
+
+    threads = [Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) == 50
+    assert len(dict(cache.items())) == 50
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
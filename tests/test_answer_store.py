@@ -0,0 +1,62 @@
+import json
+
+from quiz_automation.answer_store import AnswerLog
+
+
+def _record(answer: str) -> dict:
+    return {"answer": answer, "usage": None, "cost": 0.0}
+
+
+def test_append_and_load_round_trip(tmp_path) -> None:
+    log = AnswerLog(tmp_path / "cache.json")
+    log.append("k1", _record("A"))
+    log.append("k2", _record("B"))
+    log.append("k1", _record("C"))
+
+    reloaded = AnswerLog(tmp_path / "cache.json")
+    assert reloaded.load() == {"k1": _record("C"), "k2": _record("B")}
+    assert reloaded.lines == 3
+
+
+def test_torn_tail_is_dropped_and_truncated(tmp_path) -> None:
+    path = tmp_path / "cache.json"
+    log = AnswerLog(path)
+    log.append("k1", _record("A"))
+    intact = path.stat().st_size
+    with path.open("ab") as fh:
+        fh.write(b'{"key":"k2","answer":"B","us')
+
+    assert log.load() == {"k1": _record("A")}
+    assert path.stat().st_size == intact
+    log.append("k3", _record("C"))
+    assert AnswerLog(path).load() == {"k1": _record("A"), "k3": _record("C")}
+
+
+def test_corrupt_line_is_skipped(tmp_path) -> None:
+    path = tmp_path / "cache.json"
+    path.write_text('{"key":"k1","answer":"A","usage":null,"cost":0}\nnot json\n'
+                    '{"key":"k2","answer":"B","usage":null,"cost":0}\n')
+    assert set(AnswerLog(path).load()) == {"k1", "k2"}
+
+
+def test_compact_replaces_log_atomically(tmp_path) -> None:
+    path = tmp_path / "cache.json"
+    log = AnswerLog(path)
+    for i in range(5):
+        log.append("k", _record(str(i)))
+    log.compact({"k": _record("4")})
+
+    assert log.lines == 1
+    assert path.read_text().count("\n") == 1
+    assert not list(tmp_path.glob("*.tmp"))
+    assert AnswerLog(path).load() == {"k": _record("4")}
+
+
+def test_legacy_json_file_is_converted(tmp_path) -> None:
+    path = tmp_path / "cache.json"
+    path.write_text(json.dumps({"k1": _record("A"), "k2": _record("B")}))
+
+    log = AnswerLog(path)
+    assert log.load() == {"k1": _record("A"), "k2": _record("B")}
+    assert path.read_text().count("\n") == 2
+    assert AnswerLog(path).load() == {"k1": _record("A"), "k2": _record("B")}
@@ -0,0 +1,67 @@
+import numpy as np
+from PIL import Image
+
+from quiz_automation.archive import PackReader, PackWriter, ScreenshotArchive
+from quiz_automation.frame import Frame
+from quiz_automation.utils import hash_text
+
+
+def test_pack_round_trip_with_and_without_compression(tmp_path) -> None:
+    bgra = Frame(np.arange(2 * 3 * 4, dtype=np.uint8).reshape(2, 3, 4), "BGRA")
+    gray = np.full((4, 5), 7, dtype=np.uint8)
+    for level in (0, 1):
+        directory = tmp_path / str(level)
+        writer = PackWriter(directory, level=level)
+        writer.write(hash_text("q1"), bgra)
+        writer.write(hash_text("q2"), Frame(gray, "L"))
+        writer.close()
+
+        reader = PackReader(directory)
+        assert len(reader) == 2 and hash_text("q1") in reader
+        frame = reader.get(hash_text("q1"))
+        assert frame.layout == "BGRA"
+        assert (frame.pixels == bgra.pixels).all()
+        keys = [key for key, _ in reader]
+        assert keys == [hash_text("q1"), hash_text("q2")]
+
+
+def test_pack_writer_rolls_segments_and_appends(tmp_path) -> None:
+    frame = Frame(np.zeros((8, 8), dtype=np.uint8), "L")
+    writer = PackWriter(tmp_path, level=0, segment_bytes=64)
+    for i in range(3):
+        writer.write(hash_text(f"q{i}"), frame)
+    writer.close()
+    # Reopening continues the last segment rather than overwriting it.
+    writer = PackWriter(tmp_path, level=0, segment_bytes=64)
+    writer.write(hash_text("q3"), frame)
+    writer.close()
+
+    assert len(list(tmp_path.glob("frames-*.pack"))) == 4
+    reader = PackReader(tmp_path)
+    assert [key for key, _ in reader] == [hash_text(f"q{i}") for i in range(4)]
+    assert (reader.get(hash_text("q3")).pixels == 0).all()
+
+
+def test_reader_ignores_truncated_tail(tmp_path) -> None:
+    writer = PackWriter(tmp_path, level=0)
+    writer.write(hash_text("q1"), Frame(np.ones((2, 2), dtype=np.uint8), "L"))
+    writer.write(hash_text("q2"), Frame(np.ones((2, 2), dtype=np.uint8), "L"))
+    writer.close()
+    segment = tmp_path / "frames-00000.pack"
+    segment.write_bytes(segment.read_bytes()[:-1])
+
+    assert [key for key, _ in PackReader(tmp_path)] == [hash_text("q1")]
+
+
+def test_archive_copies_frames_and_writes_in_background(tmp_path) -> None:
+    pixels = np.zeros((2, 2, 3), dtype=np.uint8)
+    archive = ScreenshotArchive(tmp_path / "png")
+    archive.save("abc", Image.fromarray(pixels))
+    archive.close()
+    assert (tmp_path / "png" / "abc.png").exists()
+
+    archive = ScreenshotArchive(tmp_path / "pack", "pack")
+    archive.save("abc", pixels)
+    pixels[:] = 255  # the caller may reuse its buffer straight away
+    archive.close()
+    assert (PackReader(tmp_path / "pack").get("abc").pixels == 0).all()
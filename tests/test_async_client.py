@@ -0,0 +1,178 @@
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import quiz_automation.chatgpt_client as cg
+from quiz_automation.async_client import AsyncChatGPTClient
+from quiz_automation.chatgpt_client import ChatGPTClient
+
+
+def _completion(answer: str):
+    text = json.dumps({"answer": answer})
+    return SimpleNamespace(
+        output=[SimpleNamespace(content=[SimpleNamespace(text=text)])],
+        usage=SimpleNamespace(input_tokens=10, output_tokens=20),
+    )
+
+
+class AsyncResponses:
+    """Fake ``responses`` API that answers after a per-question delay."""
+
+    def __init__(self, delays=None, failures=0):
+        self.delays = delays or {}
+        self.failures = failures
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, **kwargs):
+        question = kwargs["input"].rsplit(": ", 1)[1]
+        self.calls.append(question)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            if question in self.delays:
+                await asyncio.sleep(self.delays[question])
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("boom")
+            return _completion(question[-1].upper())
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def responses(monkeypatch, tmp_path):
+    fake = AsyncResponses()
+    monkeypatch.setattr(
+        cg, "AsyncOpenAI", lambda api_key: SimpleNamespace(responses=fake)
+    )
+    monkeypatch.setattr(cg.settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(cg, "CACHE_FILE", tmp_path / "cache.json")
+    monkeypatch.setattr(cg, "CACHE", {})
+    return fake
+
+
+def test_ask_many_yields_answers_as_they_finish(responses) -> None:
+    responses.delays = {"slow a": 0.05, "fast b": 0.0, "medium c": 0.02}
+    client = AsyncChatGPTClient(concurrency=2)
+
+    async def run():
+        return [item async for item in client.ask_many(responses.delays)]
+
+    results = asyncio.run(run())
+
+    assert [(i, resp.answer) for i, resp in results] == [(1, "B"), (2, "C"), (0, "A")]
+    assert responses.peak == 2
+
+
+def test_async_client_shares_the_cache(responses, monkeypatch) -> None:
+    client = AsyncChatGPTClient()
+    response = asyncio.run(client.ask("question a"))
+    assert response.answer == "A"
+    assert response.cost == 0.0
+
+    monkeypatch.setattr(cg, "OpenAI", lambda api_key: None)
+    assert ChatGPTClient().ask("Question  A").answer == "A"
+    assert asyncio.run(client.ask("question a")).answer == "A"
+    assert responses.calls == ["question a"]
+    record = json.loads(cg.CACHE_FILE.read_text().splitlines()[0])
+    assert record["question"] == "question a"
+
+
+def test_concurrent_duplicates_share_one_request(responses) -> None:
+    responses.delays = {"question a": 0.01}
+    client = AsyncChatGPTClient()
+
+    async def run():
+        return [resp async for _, resp in client.ask_many(["question a"] * 3)]
+
+    assert [resp.answer for resp in asyncio.run(run())] == ["A", "A", "A"]
+    assert responses.calls == ["question a"]
+
+
+def test_leaving_ask_many_cancels_outstanding_requests(responses) -> None:
+    questions = [f"question {c}" for c in "abcdef"]
+    responses.delays = dict.fromkeys(questions, 0.05)
+    responses.delays["question a"] = 0.0
+    client = AsyncChatGPTClient(concurrency=2)
+
+    async def run():
+        async for index, _ in client.ask_many(questions):
+            break
+        await asyncio.sleep(0.2)
+        return index
+
+    assert asyncio.run(run()) == 0
+    # Only the first answer and the requests already admitted were started.
+    assert len(responses.calls) <= 3
+    assert responses.active == 0
+    assert not client._inflight and not client._waiters
+
+
+def test_cancelled_caller_does_not_cancel_shared_request(responses) -> None:
+    responses.delays = {"question a": 0.05}
+    client = AsyncChatGPTClient()
+
+    async def run():
+        first = asyncio.ensure_future(client.ask("question a"))
+        second = asyncio.ensure_future(client.ask("question a"))
+        await asyncio.sleep(0.02)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()).answer == "A"
+    assert responses.calls == ["question a"]
+
+
+def test_cache_io_runs_off_the_event_loop(responses, monkeypatch) -> None:
+    import quiz_automation.async_client as ac
+
+    threads = []
+
+    def record(func):
+        def wrapper(*args):
+            threads.append(threading.current_thread())
+            return func(*args)
+
+        return wrapper
+
+    monkeypatch.setattr(ac, "_cached_answer", record(ac._cached_answer))
+    monkeypatch.setattr(ac, "_store_answer", record(ac._store_answer))
+    asyncio.run(AsyncChatGPTClient().ask("question a"))
+
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+def test_async_client_retries_with_asyncio_sleep(responses, monkeypatch) -> None:
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    responses.failures = 1
+    client = AsyncChatGPTClient()
+    assert asyncio.run(client.ask("question b")).answer == "B"
+    assert sleeps == [1.0]
+
+    responses.failures = 3
+    answer = asyncio.run(client.ask("question c"))
+    assert answer.answer == "Error: malformed response"
+    assert sleeps == [1.0, 1.0, 2.0]
+    assert "question c" not in [
+        json.loads(line)["question"]
+        for line in cg.CACHE_FILE.read_text().splitlines()
+    ]
+
+
+def test_async_client_validates_arguments(responses, monkeypatch) -> None:
+    with pytest.raises(ValueError):
+        AsyncChatGPTClient(concurrency=0)
+    monkeypatch.setattr(cg.settings, "openai_api_key", "")
+    with pytest.raises(ValueError):
+        AsyncChatGPTClient()
@@ -0,0 +1,63 @@
+import argparse
+
+import pytest
+
+from benchmarks.suite import bench_click, bench_pipeline, compare, summarize
+
+
+def test_summarize_reports_percentiles_in_ms() -> None:
+    stats = summarize([i / 1000 for i in range(1, 101)])
+    assert stats["n"] == 100
+    assert (stats["p50"], stats["p95"], stats["p99"]) == (51.0, 96.0, 100.0)
+    assert summarize([]) == {"n": 0}
+
+
+def test_compare_flags_slower_percentiles_and_lower_throughput() -> None:
+    baseline = {
+        "results": {
+            "ocr": {"p50": 10.0, "p95": 20.0, "p99": 30.0},
+            "click": {"p50": 0.001, "p95": 0.002, "p99": 0.003},
+            "pipeline": {"throughput_qps": 100.0},
+        }
+    }
+    current = {
+        "results": {
+            "ocr": {"p50": 10.5, "p95": 40.0, "p99": 30.0},
+            "click": {"p50": 0.004, "p95": 0.004, "p99": 0.004},
+            "pipeline": {"throughput_qps": 40.0},
+            "new_stage": {"p50": 1.0},
+        }
+    }
+    regressions = compare(current, baseline, tolerance=0.5)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("ocr p95")
+    assert regressions[1].startswith("pipeline")
+
+
+def test_pipeline_benchmark_runs_end_to_end(tmp_path, monkeypatch) -> None:
+    import quiz_automation.chatgpt_client as cg
+
+    monkeypatch.setattr(cg, "CACHE_FILE", tmp_path / "cache.json")
+    monkeypatch.setattr(cg, "CACHE", {})
+    args = argparse.Namespace(
+        n=5,
+        size=(64, 48),
+        api_latency=0.0,
+        ocr_latency=0.0,
+        click_latency=0.0,
+        solve_workers=2,
+        workdir=str(tmp_path),
+    )
+    latencies, throughput = bench_pipeline(args, None)
+    assert len(latencies) == 5
+    assert throughput > 0
+
+
+def test_click_benchmark_uses_a_fake_mouse(monkeypatch) -> None:
+    import quiz_automation.clicker as clicker
+
+    real = clicker.pyautogui
+    monkeypatch.setattr(real, "click", lambda *a: pytest.fail("real click"))
+    args = argparse.Namespace(n=3, click_latency=0.0)
+    assert len(bench_click(args)) == 3
+    assert clicker.pyautogui is real
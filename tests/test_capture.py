@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+from quiz_automation.capture import ScreenGrabber
+
+
+class FakeMSS:
+    instances = 0
+
+    def __init__(self):
+        FakeMSS.instances += 1
+        self.closed = False
+        self.grabs = 0
+
+    def grab(self, monitor):
+        self.grabs += 1
+        width, height = monitor["width"], monitor["height"]
+        # Every pixel is B=1, G=2, R=3, A=255.
+        raw = bytearray([1, 2, 3, 255] * (width * height))
+        return SimpleNamespace(raw=raw, size=(width, height))
+
+    def close(self):
+        self.closed = True
+
+
+def test_grabber_reuses_handle_and_buffer():
+    FakeMSS.instances = 0
+    grabber = ScreenGrabber(factory=FakeMSS)
+
+    first = grabber.grab((0, 0, 4, 2))
+    scratch = grabber._scratch
+    second = grabber.grab((0, 0, 4, 2))
+
+    assert FakeMSS.instances == 1
+    assert grabber._sct.grabs == 2
+    assert grabber._scratch is scratch
+    assert second.size == (4, 2)
+    assert first.gray() is second.gray()
+    assert second.to_image().getpixel((0, 0)) == (3, 2, 1)
+
+
+def test_grabber_frames_view_mss_buffer():
+    grabber = ScreenGrabber(factory=FakeMSS)
+    frame = grabber.grab((0, 0, 2, 2))
+    # The frame wraps the bytearray returned by mss instead of copying it.
+    assert not frame.pixels.flags.owndata
+    assert frame.pixels.shape == (2, 2, 4)
+    assert tuple(frame.pixels[0, 0]) == (1, 2, 3, 255)
+
+
+def test_grabber_close_releases_handle():
+    grabber = ScreenGrabber(factory=FakeMSS)
+    grabber.grab((0, 0, 1, 1))
+    sct = grabber._sct
+    with grabber:
+        pass
+    assert sct.closed
+    assert grabber._sct is None
@@ -4,6 +4,7 @@ from types import SimpleNamespace
 import pytest
 import openai  # noqa: F401  # ensure stub is loaded
 
+from quiz_automation.answer_store import AnswerLog
 from quiz_automation.chatgpt_client import ChatGPTClient, ChatGPTResponse
 
 
@@ -29,7 +30,7 @@ def patch_openai(monkeypatch, tmp_path):
     cache_file = tmp_path / "cache.json"
     monkeypatch.setattr(cg, "CACHE_FILE", cache_file)
     cg.CACHE = {}
-    cg._save_cache()
+    AnswerLog(cache_file).compact({})
 
 
 def test_chatgpt_client_parsing(monkeypatch):
@@ -140,9 +141,6 @@ def test_chatgpt_client_uses_cache(monkeypatch):
     monkeypatch.setattr("quiz_automation.chatgpt_client.CACHE", {})
 
     client = ChatGPTClient()
-    client.ask("What?")
-    client.ask("What?")
-=======
     client.ask("question")
     client.ask("question")
 
@@ -193,3 +191,217 @@ def test_chatgpt_client_persistent_cache(monkeypatch):
     assert isinstance(response, ChatGPTResponse)
     assert response.answer == "A"
 
+
+
+def test_chatgpt_client_records_metrics():
+    from quiz_automation.metrics import REGISTRY
+
+    REGISTRY.clear()
+    client = ChatGPTClient()
+    client.ask("question")
+    client.ask("question")
+
+    stats = REGISTRY.stats()
+    assert stats["quiz_answer_cache_total{result=miss}"] == 1
+    assert stats["quiz_answer_cache_total{result=hit}"] == 1
+    assert stats["quiz_tokens_total{kind=input}"] == 10
+    assert stats["quiz_tokens_total{kind=output}"] == 20
+    assert stats["quiz_stage_seconds{stage=api}"]["count"] == 1
+
+
+def test_chatgpt_client_appends_cache_entries(monkeypatch):
+    import quiz_automation.chatgpt_client as cg
+
+    client = ChatGPTClient()
+    client.ask("first")
+    client.ask("second")
+
+    lines = cg.CACHE_FILE.read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[1])["answer"] == "A"
+
+    monkeypatch.setattr(cg, "COMPACT_SLACK", 1)
+    monkeypatch.setattr(cg.settings, "answer_disk_entries", 1)
+    client.ask("third")
+    (line,) = cg.CACHE_FILE.read_text().splitlines()
+    assert json.loads(line)["key"] == cg.cache_key("third")
+
+
+def test_chatgpt_client_reads_evicted_answers_from_disk(monkeypatch):
+    import quiz_automation.chatgpt_client as cg
+    from quiz_automation.answer_cache import AnswerCache
+    from quiz_automation.metrics import REGISTRY
+
+    calls = []
+
+    class CountingResponses(DummyResponses):
+        def create(self, **kwargs):
+            calls.append(kwargs["input"])
+            return super().create(**kwargs)
+
+    monkeypatch.setattr(
+        cg, "OpenAI", lambda api_key: SimpleNamespace(responses=CountingResponses())
+    )
+    monkeypatch.setattr(cg, "CACHE", AnswerCache(max_entries=1))
+    REGISTRY.clear()
+    client = ChatGPTClient()
+    client.ask("first")
+    client.ask("second")
+    assert list(cg.CACHE) == [cg.cache_key("second")]
+
+    response = client.ask("first")
+    assert response.answer == "A"
+    assert response.usage.input_tokens == 10
+    assert len(calls) == 2
+    assert REGISTRY.stats()["quiz_answer_cache_total{result=disk}"] == 1
+    assert cg.CACHE.stats()["evictions"] == 2
+
+
+def test_import_has_no_side_effects(tmp_path):
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    root = Path(__file__).resolve().parent.parent
+    code = (
+        "import sys\n"
+        "import quiz_automation.chatgpt_client as cg\n"
+        "assert 'openai' not in sys.modules\n"
+        "assert 'numpy' not in sys.modules\n"
+        "assert not {'settings', 'OpenAI', 'CACHE'} & set(vars(cg))\n"
+        "assert len(cg.CACHE) == 0 and 'settings' in vars(cg)\n"
+    )
+    env = {"PYTHONPATH": os.pathsep.join([str(root), str(root / "tests" / "stubs")])}
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True
+    )
+    assert result.returncode == 0, result.stderr.decode()
+
+
+def test_chatgpt_client_normalizes_keys_and_reads_legacy_entries(monkeypatch):
+    import quiz_automation.chatgpt_client as cg
+
+    calls = []
+
+    class CountingResponses(DummyResponses):
+        def create(self, **kwargs):
+            calls.append(kwargs["input"])
+            return super().create(**kwargs)
+
+    monkeypatch.setattr(
+        cg, "OpenAI", lambda api_key: SimpleNamespace(responses=CountingResponses())
+    )
+    cg.CACHE[cg.hash_text("Legacy question?")] = ChatGPTResponse("C", None, 0.0)
+    client = ChatGPTClient()
+
+    assert client.ask("What’s the  answer?").answer == "A"
+    assert client.ask("what's the answer?\n").answer == "A"
+    assert client.ask("Legacy question?").answer == "C"
+    assert len(calls) == 1
+    assert cg.cache_key("legacy  question?") in cg.CACHE
+    record = json.loads(cg.CACHE_FILE.read_text().splitlines()[0])
+    assert record["question"] == "What’s the  answer?"
+
+
+def test_chatgpt_client_serves_near_duplicates(monkeypatch):
+    import quiz_automation.chatgpt_client as cg
+    from quiz_automation.metrics import REGISTRY
+    from quiz_automation.minhash import MinHashIndex
+
+    calls = []
+
+    class CountingResponses(DummyResponses):
+        def create(self, **kwargs):
+            calls.append(kwargs["input"])
+            return super().create(**kwargs)
+
+    monkeypatch.setattr(
+        cg, "OpenAI", lambda api_key: SimpleNamespace(responses=CountingResponses())
+    )
+    monkeypatch.setattr(cg, "NEAR_INDEX", MinHashIndex(0.8))
+    REGISTRY.clear()
+    client = ChatGPTClient()
+    client.ask("Which planet is known as the Red Planet? A) Mars B) Venus")
+    near = client.ask("Whlch planet is kn0wn as the Red Planet? A) Mars B) Venus")
+    client.ask("Which ocean is the largest? A) Pacific B) Atlantic")
+
+    assert near.answer == "A"
+    assert len(calls) == 2
+    assert REGISTRY.stats()["quiz_answer_cache_total{result=near}"] == 1
+
+    # The index is rebuilt from the question texts stored on disk.
+    monkeypatch.setattr(cg.settings, "near_duplicate_threshold", 0.8)
+    cg._load_cache()
+    cg._NEAR_BUILDER.join(timeout=10)
+    assert len(cg.NEAR_INDEX) == 2
+
+
+def test_chatgpt_client_does_not_serve_expired_answers_from_disk(monkeypatch):
+    import time
+
+    import quiz_automation.chatgpt_client as cg
+    from quiz_automation.answer_cache import AnswerCache
+
+    calls = []
+
+    class CountingResponses(DummyResponses):
+        def create(self, **kwargs):
+            calls.append(kwargs["input"])
+            return super().create(**kwargs)
+
+    monkeypatch.setattr(
+        cg, "OpenAI", lambda api_key: SimpleNamespace(responses=CountingResponses())
+    )
+    now = [time.time()]
+    cache = AnswerCache(max_entries=1, ttl=100, clock=lambda: now[0])
+    monkeypatch.setattr(cg, "CACHE", cache)
+    client = ChatGPTClient()
+    client.ask("first")
+    client.ask("second")  # evicts "first" from memory
+
+    # Read back from disk with its original timestamp and model.
+    client.ask("first")
+    _, tag, stored = cache.get_entry(cg.cache_key("first"))
+    record = json.loads(cg.CACHE_FILE.read_text().splitlines()[0])
+    assert (tag, stored) == (record["model"], record["ts"])
+    assert len(calls) == 2
+
+    now[0] += 200
+    client.ask("first")
+    assert len(calls) == 3
+
+
+def test_answer_cache_ttls_come_from_settings(monkeypatch):
+    import quiz_automation.chatgpt_client as cg
+
+    monkeypatch.setattr(cg.settings, "answer_cache_ttls", "gpt-4o=60,old=5")
+    assert cg._new_cache().ttls == {"gpt-4o": 60.0, "old": 5.0}
+
+
+def test_near_index_is_built_without_blocking_the_cache(monkeypatch):
+    import threading
+
+    import quiz_automation.chatgpt_client as cg
+    from quiz_automation.minhash import MinHashIndex
+
+    client = ChatGPTClient()
+    client.ask("Which planet is known as the Red Planet?")
+    release = threading.Event()
+    real_add = MinHashIndex.add
+
+    def slow_add(self, text, key):
+        release.wait(10)
+        real_add(self, text, key)
+
+    monkeypatch.setattr(MinHashIndex, "add", slow_add)
+    monkeypatch.setattr(cg.settings, "near_duplicate_threshold", 0.8)
+    monkeypatch.setattr(cg, "NEAR_INDEX", None)
+    cg._load_cache()
+
+    # Exact hits are served while the index is still being filled.
+    assert client.ask("Which planet is known as the Red Planet?").answer == "A"
+    assert len(cg.NEAR_INDEX) == 0
+    release.set()
+    cg._NEAR_BUILDER.join(timeout=10)
+    assert len(cg.NEAR_INDEX) == 1
@@ -4,7 +4,10 @@ from pathlib import Path
 import json
 import time
 
+from PIL import Image
+
 from quiz_automation.chatgpt_client import ChatGPTResponse
+from quiz_automation.config import Settings
 import quiz_automation.cli as cli
 
 
@@ -45,7 +48,9 @@ def _setup(monkeypatch):
     monkeypatch.setattr(cli, "ChatGPTClient", lambda: DummyClient())
     monkeypatch.setattr(cli, "QuizLogger", DummyLogger)
     monkeypatch.setattr(
-        cli, "get_settings", lambda: SimpleNamespace(poll_interval=0.1, screenshot_dir=None)
+        cli,
+        "get_settings",
+        lambda: Settings(openai_api_key="", poll_interval=0.1, screenshot_dir=None),
     )
     real_sleep = time.sleep
 
@@ -72,3 +77,65 @@ def test_run_headless_with_config(monkeypatch, capsys, tmp_path):
     out = capsys.readouterr().out.strip()
     assert out == "What is 2+2? -> A"
     assert LOGGERS and LOGGERS[-1].closed
+
+
+def test_load_regions_from_config(tmp_path):
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({"regions": [[0, 0, 1, 1], [5, 5, 2, 2]]}))
+    args = SimpleNamespace(region=None, config=cfg)
+    assert cli._load_regions(args) == [(0, 0, 1, 1), (5, 5, 2, 2)]
+
+
+def test_run_headless_replays_recording(monkeypatch, tmp_path):
+    _setup(monkeypatch)
+    seen = {}
+
+    class RecordingWatcher(DummyWatcher):
+        def __init__(self, region, on_question, poll_interval, **kwargs):
+            super().__init__(region, on_question, poll_interval, **kwargs)
+            seen.update(
+                region=region,
+                on_question=on_question,
+                poll_interval=poll_interval,
+                **kwargs,
+            )
+
+    monkeypatch.setattr(cli, "Watcher", RecordingWatcher)
+    Image.new("RGB", (4, 3)).save(tmp_path / "q.png")
+    cli.run_headless(["--replay", str(tmp_path), "--speed", "0"])
+
+    assert seen["region"] == (0, 0, 4, 3)
+    assert seen["poll_interval"] == 0.0
+    assert seen["capture"].speed is None
+    # Fast replays must not drop frames or questions.
+    assert seen["async_ocr"] is False
+    assert seen["on_question"].__self__.questions.policy == "block"
+
+
+def test_run_headless_profiles_session(monkeypatch, tmp_path):
+    _setup(monkeypatch)
+    profile_dir = tmp_path / "profile"
+    cli.run_headless(["--region", "0", "0", "1", "1", "--profile", str(profile_dir)])
+
+    assert list(profile_dir.glob("stacks-*.folded"))
+    assert list(profile_dir.glob("memory-*.txt"))
+
+
+def test_run_headless_gives_each_region_its_own_dedup(monkeypatch):
+    _setup(monkeypatch)
+    children = []
+
+    class ChildWatcher:
+        def __init__(self, region, on_question, poll_interval, **kwargs):
+            children.append(kwargs)
+
+    class DummyMulti(DummyWatcher):
+        def __init__(self, watchers, poll_interval, **kwargs):
+            super().__init__(None, lambda _: None, poll_interval)
+
+    monkeypatch.setattr(cli, "Watcher", ChildWatcher)
+    monkeypatch.setattr(cli, "MultiRegionWatcher", DummyMulti)
+    cli.run_headless(["--region", "0", "0", "1", "1", "--region", "2", "2", "1", "1"])
+
+    first, second = (child["dedup"] for child in children)
+    assert first is not None and second is not None and first is not second
@@ -10,6 +10,8 @@ def test_config_defaults(monkeypatch):
     monkeypatch.delenv("SCREENSHOT_DIR", raising=False)
     monkeypatch.delenv("OPENAI_INPUT_COST", raising=False)
     monkeypatch.delenv("OPENAI_OUTPUT_COST", raising=False)
+    monkeypatch.delenv("CHANGE_THRESHOLD", raising=False)
+    monkeypatch.delenv("DEDUP_THRESHOLD", raising=False)
 
     settings = get_settings()
     assert settings.poll_interval == 0.5
@@ -18,6 +20,8 @@ def test_config_defaults(monkeypatch):
     assert settings.screenshot_dir is None
     assert settings.openai_input_cost == 0.0
     assert settings.openai_output_cost == 0.0
+    assert settings.change_threshold == 4.0
+    assert settings.dedup_threshold == 0.95
 
 
 def test_env_var_overrides(monkeypatch):
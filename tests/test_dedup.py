@@ -0,0 +1,58 @@
+from quiz_automation.dedup import QuestionDeduplicator, normalize
+from quiz_automation.watcher import Watcher
+
+
+def test_normalize_folds_case_punctuation_and_confusions() -> None:
+    assert normalize("  What  IS the capita1 of |taly?? ") == normalize(
+        "what is the capital of italy"
+    )
+    # Standalone numbers are left alone.
+    assert normalize("Is 10 > 5?") == "ls 10 5"
+
+
+def test_near_identical_text_is_a_duplicate() -> None:
+    dedup = QuestionDeduplicator()
+    dedup.add("Which planet is known as the Red Planet?")
+    assert dedup.is_duplicate("Which planet is known as the Red Planet ?_")
+    assert dedup.is_duplicate("Whlch planet is known as the Red PIanet?")
+    assert not dedup.is_duplicate("Which planet is known as the Blue Planet?")
+    assert dedup.duplicates == 2
+
+
+def test_different_numbers_are_never_duplicates() -> None:
+    dedup = QuestionDeduplicator(threshold=0.5)
+    dedup.add("What is 12 x 13?")
+    assert not dedup.is_duplicate("What is 12 x 14?")
+
+
+def test_window_only_remembers_recent_questions() -> None:
+    dedup = QuestionDeduplicator(window=2)
+    for text in ("first question here", "second question here", "third one"):
+        dedup.add(text)
+    assert dedup.is_duplicate("second question here")
+    assert not dedup.is_duplicate("first question here")
+
+
+def test_watcher_suppresses_jittered_repeats(mocker) -> None:
+    on_question = mocker.Mock()
+    watcher = Watcher(
+        (0, 0, 1, 1),
+        on_question,
+        capture=lambda r: None,
+        ocr=mocker.Mock(
+            side_effect=[
+                "Name the largest ocean.",
+                "Name the largest ocean,",
+                "Name the smallest continent.",
+                "Name the largest ocean.",
+            ]
+        ),
+        dedup=QuestionDeduplicator(),
+    )
+    for _ in range(4):
+        watcher.process_frame(mocker.Mock())
+
+    assert [c.args[0] for c in on_question.call_args_list] == [
+        "Name the largest ocean.",
+        "Name the smallest continent.",
+    ]
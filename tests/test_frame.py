@@ -0,0 +1,71 @@
+import numpy as np
+from PIL import Image
+
+from quiz_automation.frame import Frame, FrameScratch
+
+
+def _bgra(height: int, width: int) -> np.ndarray:
+    px = np.zeros((height, width, 4), dtype=np.uint8)
+    px[..., 3] = 255
+    return px
+
+
+def test_gray_uses_scratch_buffer_and_luma_weights():
+    px = _bgra(2, 2)
+    px[0, 0, 2] = 255  # red
+    px[0, 1, :3] = 255  # white
+    scratch = FrameScratch(2, 2)
+    frame = Frame(px, "BGRA", scratch)
+
+    gray = frame.gray()
+    assert gray is scratch.gray
+    assert gray[0, 0] == 255 * 77 // 256
+    assert gray[0, 1] == 255
+    assert gray[1, 0] == 0
+
+
+def test_crop_returns_views():
+    px = _bgra(4, 4)
+    scratch = FrameScratch(4, 4)
+    frame = Frame(px, "BGRA", scratch)
+    part = frame.crop(1, 2, 2, 2)
+
+    assert part.size == (2, 2)
+    assert np.shares_memory(part.pixels, px)
+    px[2, 1, :3] = 255
+    assert part.gray()[0, 0] == 255
+    assert np.shares_memory(part.gray(), scratch.gray)
+
+
+def test_threshold_in_place_does_not_touch_pixels():
+    px = _bgra(1, 3)
+    px[0, :, :3] = [[10, 10, 10], [100, 100, 100], [200, 200, 200]]
+    frame = Frame(px, "BGRA")
+    out = frame.threshold(50)
+    assert out.tolist() == [[0, 255, 255]]
+    assert px[0, 1, 0] == 100
+
+    gray_frame = Frame(np.array([[10, 200]], dtype=np.uint8), "L")
+    assert gray_frame.threshold().tolist() == [[0, 255]]
+    assert gray_frame.pixels.tolist() == [[10, 200]]
+
+
+def test_image_round_trip_and_save(tmp_path):
+    img = Image.new("RGB", (3, 2), (10, 20, 30))
+    frame = Frame.from_image(img)
+    assert frame.layout == "RGB"
+    assert frame.to_image() is img
+
+    px = _bgra(2, 3)
+    px[..., 0], px[..., 1], px[..., 2] = 30, 20, 10
+    bgra = Frame(px)
+    assert bgra.to_image().getpixel((0, 0)) == (10, 20, 30)
+    bgra.save(tmp_path / "frame.png")
+    assert Image.open(tmp_path / "frame.png").getpixel((2, 1)) == (10, 20, 30)
+
+
+def test_copy_detaches_from_buffer():
+    px = _bgra(1, 1)
+    copy = Frame(px).copy()
+    px[0, 0, 0] = 99
+    assert copy.pixels[0, 0, 0] == 0
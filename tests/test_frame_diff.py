@@ -0,0 +1,43 @@
+import numpy as np
+from PIL import Image
+
+from quiz_automation.frame_diff import ChangeDetector, fingerprint
+
+
+def test_fingerprint_downsamples_to_grid():
+    img = np.zeros((64, 128, 3), dtype=np.uint8)
+    img[:32, :64] = 255
+    fp = fingerprint(img, size=8)
+    assert fp.shape == (8, 8)
+    assert fp[0, 0] == 255
+    assert fp[-1, -1] == 0
+
+
+def test_fingerprint_accepts_pil_and_grayscale():
+    assert fingerprint(Image.new("RGB", (4, 4)), size=2).shape == (2, 2)
+    assert fingerprint(np.zeros((4, 4), dtype=np.uint8), size=2).shape == (2, 2)
+
+
+def test_change_detector_skips_identical_frames():
+    detector = ChangeDetector(threshold=4.0, size=8)
+    frame = np.zeros((32, 32, 3), dtype=np.uint8)
+    assert detector.changed(frame)
+    assert not detector.changed(frame.copy())
+
+    noisy = frame.copy()
+    noisy[0, 0] = 2  # below threshold once averaged into its block
+    assert not detector.changed(noisy)
+
+    changed = frame.copy()
+    changed[:4, :4] = 255
+    assert detector.changed(changed)
+    assert not detector.changed(changed)
+
+
+def test_change_detector_reset_and_unknown_frames():
+    detector = ChangeDetector()
+    frame = np.zeros((8, 8, 3), dtype=np.uint8)
+    assert detector.changed(frame)
+    detector.reset()
+    assert detector.changed(frame)
+    assert detector.changed(None)
@@ -23,3 +23,15 @@ def test_logger_closes_connection(tmp_path: Path):
         logger.log("ts", "question", "A", 1, 2, 3, 4, 0.5)
     with pytest.raises(sqlite3.ProgrammingError):
         logger.conn.execute("SELECT 1")
+
+
+def test_logger_accepts_writes_from_other_threads(tmp_path: Path):
+    from threading import Thread
+
+    db_path = tmp_path / "events.db"
+    with QuizLogger(db_path) as logger:
+        t = Thread(target=logger.log, args=("ts", "q", "B", 0, 0, 1, 1, 0.1))
+        t.start()
+        t.join()
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT answer FROM events").fetchone() == ("B",)
@@ -0,0 +1,79 @@
+import urllib.request
+
+import pytest
+
+from quiz_automation.metrics import REGISTRY, MetricsRegistry, format_stats
+
+
+def test_counters_gauges_and_labels() -> None:
+    registry = MetricsRegistry()
+    registry.counter("hits", "Hits", kind="a").inc()
+    registry.counter("hits", kind="a").inc(2)
+    registry.counter("hits", kind="b").inc()
+    gauge = registry.gauge("depth")
+    gauge.set(5)
+    gauge.dec()
+
+    stats = registry.stats()
+    assert stats["hits{kind=a}"] == 3
+    assert stats["hits{kind=b}"] == 1
+    assert stats["depth"] == 4
+    with pytest.raises(ValueError):
+        registry.gauge("hits", kind="a")
+
+
+def test_histogram_buckets_and_quantiles() -> None:
+    registry = MetricsRegistry()
+    hist = registry.histogram("latency", stage="ocr")
+    for value in [0.002] * 90 + [0.2] * 10:
+        hist.observe(value)
+
+    assert hist.quantile(0.5) == 0.0025
+    assert hist.quantile(0.95) == 0.25
+    stats = registry.stats()["latency{stage=ocr}"]
+    assert stats["count"] == 100
+    assert stats["p50_ms"] == 2.5
+    assert stats["mean_ms"] == pytest.approx(21.8)
+
+
+def test_prometheus_rendering() -> None:
+    registry = MetricsRegistry()
+    registry.counter("quiz_questions_total", "Questions emitted").inc()
+    hist = registry.histogram("quiz_stage_seconds", "Latency", stage="api")
+    hist.observe(0.003)
+    text = registry.render()
+
+    assert "# HELP quiz_questions_total Questions emitted" in text
+    assert "# TYPE quiz_stage_seconds histogram" in text
+    assert 'quiz_stage_seconds_bucket{stage="api",le="0.0025"} 0' in text
+    assert 'quiz_stage_seconds_bucket{stage="api",le="0.005"} 1' in text
+    assert 'quiz_stage_seconds_bucket{stage="api",le="+Inf"} 1' in text
+    assert 'quiz_stage_seconds_count{stage="api"} 1' in text
+
+
+def test_serve_exposes_metrics_on_localhost() -> None:
+    registry = MetricsRegistry()
+    registry.counter("up").inc()
+    server = registry.serve(0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as resp:
+            assert b"up 1" in resp.read()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_stages_record_into_the_global_registry(tmp_path) -> None:
+    from quiz_automation.clicker import click_answer
+    from quiz_automation.logger import QuizLogger
+
+    REGISTRY.clear()
+    click_answer("A", (0, 0, 100, 100))
+    with QuizLogger(tmp_path / "db.sqlite") as logger:
+        logger.log("ts", "q", "A", 0, 0, 1, 1, 0.0)
+
+    stats = REGISTRY.stats()
+    assert stats["quiz_stage_seconds{stage=click}"]["count"] == 1
+    assert stats["quiz_stage_seconds{stage=log}"]["count"] == 1
+    assert format_stats(stats).startswith("click p50")
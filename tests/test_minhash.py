@@ -0,0 +1,41 @@
+import pytest
+
+from quiz_automation.minhash import MinHashIndex
+
+QUESTION = "Which planet is known as the Red Planet?\nA) Mars B) Venus C) Jupiter D) Saturn"
+
+
+def test_finds_ocr_typos_and_reordered_options() -> None:
+    index = MinHashIndex(0.8)
+    index.add(QUESTION, "mars")
+
+    typo = QUESTION.replace("known", "kn0wn").replace("Which", "Whlch")
+    reordered = "Which planet is known as the Red Planet?\nA) Venus B) Mars C) Saturn D) Jupiter"
+    assert index.query(typo)[0] == "mars"
+    key, similarity = index.query(reordered)
+    assert key == "mars" and 0.8 <= similarity < 1.0
+    assert index.query("Who painted the Mona Lisa?\nA) Da Vinci B) Monet") is None
+
+
+def test_numbers_must_match() -> None:
+    index = MinHashIndex(0.5)
+    index.add("What is 12 x 13? A) 156 B) 144", "q13")
+    assert index.query("What is 12 x 13? A) 156 B) 144")[0] == "q13"
+    assert index.query("What is 12 x 14? A) 156 B) 144") is None
+
+
+def test_add_replaces_and_remove_unindexes() -> None:
+    index = MinHashIndex(0.8)
+    index.add(QUESTION, "k")
+    index.add("Something else entirely", "k")
+    assert len(index) == 1
+    assert index.query(QUESTION) is None
+    index.remove("k")
+    assert "k" not in index
+    assert index.query("Something else entirely") is None
+    assert all(not buckets for buckets in index._buckets)
+
+
+def test_invalid_band_layout() -> None:
+    with pytest.raises(ValueError):
+        MinHashIndex(num_perm=64, bands=10)
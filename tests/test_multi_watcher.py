@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from quiz_automation.frame import Frame
+from quiz_automation.multi_watcher import MultiRegionWatcher, bounding_region, crop
+from quiz_automation.watcher import Watcher
+
+
+def test_bounding_region():
+    assert bounding_region([(10, 20, 5, 5), (0, 30, 8, 10)]) == (0, 20, 15, 20)
+    with pytest.raises(ValueError):
+        bounding_region([])
+
+
+def test_crop_returns_views():
+    px = np.zeros((10, 10, 4), dtype=np.uint8)
+    view = crop(Frame(px), 2, 3, 4, 5)
+    assert view.size == (4, 5)
+    assert np.shares_memory(view.pixels, px)
+    assert np.shares_memory(crop(px, 0, 0, 2, 2), px)
+    assert crop(Image.new("RGB", (10, 10)), 1, 1, 3, 2).size == (3, 2)
+
+
+def test_one_grab_feeds_each_region(mocker):
+    seen: dict[str, list[tuple[int, ...]]] = {"question": [], "timer": []}
+
+    def make(name: str, region: tuple[int, int, int, int]) -> Watcher:
+        def ocr(img: Frame) -> str:
+            seen[name].append(tuple(img.pixels[0, 0, :3]))
+            return f"{name}-{img.pixels[0, 0, 0]}"
+
+        return Watcher(region, on_question, ocr=ocr, change_threshold=4.0)
+
+    on_question = mocker.Mock()
+    question = make("question", (100, 50, 4, 4))
+    timer = make("timer", (110, 60, 2, 2))
+
+    grabs: list[tuple[int, int, int, int]] = []
+    frames = []
+    for value in (0, 0, 200):
+        px = np.zeros((12, 12, 4), dtype=np.uint8)
+        px[10:, 10:, :3] = value  # only the timer area changes
+        frames.append(Frame(px))
+
+    def capture(region):
+        grabs.append(region)
+        frame = frames.pop(0)
+        if not frames:
+            multi.stop_flag.set()
+        return frame
+
+    multi = MultiRegionWatcher([question, timer], 0.001, capture=capture)
+    assert multi.region == (100, 50, 12, 12)
+    multi.start()
+    multi.join(timeout=1)
+
+    assert grabs == [(100, 50, 12, 12)] * 3
+    assert multi.grabs == 3
+    assert seen["question"] == [(0, 0, 0)]
+    assert seen["timer"] == [(0, 0, 0), (200, 200, 200)]
+    assert question.frames_skipped == 2
+    assert [c.args[0] for c in on_question.call_args_list] == [
+        "question-0",
+        "timer-0",
+        "timer-200",
+    ]
@@ -0,0 +1,96 @@
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from quiz_automation.frame import Frame
+from quiz_automation.ocr import (
+    PytesseractBackend,
+    TesserocrBackend,
+    get_ocr_backend,
+)
+
+
+class FakeAPI:
+    created = 0
+
+    def __init__(self, lang="eng", psm=None):
+        FakeAPI.created += 1
+        self.lang = lang
+        self.psm = psm
+        self.variables = {}
+        self.images = []
+        self.ended = False
+
+    def SetVariable(self, key, value):
+        self.variables[key] = value
+
+    def SetImageBytes(self, data, width, height, bpp, bpl):
+        self.images.append((len(data), width, height, bpp, bpl))
+
+    def GetUTF8Text(self):
+        return " text \n"
+
+    def End(self):
+        self.ended = True
+
+
+@pytest.fixture
+def fake_tesserocr(monkeypatch):
+    FakeAPI.created = 0
+    module = SimpleNamespace(PyTessBaseAPI=FakeAPI)
+    monkeypatch.setitem(sys.modules, "tesserocr", module)
+    return module
+
+
+def test_pytesseract_backend_passes_gray_and_config(monkeypatch):
+    calls = {}
+
+    def image_to_string(img, lang, config):
+        calls["img"] = img
+        calls["args"] = (lang, config)
+        return " answer \n"
+
+    monkeypatch.setattr("quiz_automation.ocr.pytesseract.image_to_string", image_to_string)
+    backend = PytesseractBackend(psm=6, variables={"tessedit_char_whitelist": "AB"})
+    frame = Frame(np.zeros((2, 3, 4), dtype=np.uint8))
+
+    assert backend(frame) == "answer"
+    assert calls["img"].shape == (2, 3)
+    assert calls["args"] == ("eng", "--psm 6 -c tessedit_char_whitelist=AB")
+
+
+def test_tesserocr_backend_reuses_handle_per_thread(fake_tesserocr):
+    from threading import Thread
+
+    backend = TesserocrBackend(psm=7, variables={"a": "b"})
+    frame = Frame(np.zeros((2, 3, 4), dtype=np.uint8))
+    assert backend(frame) == "text"
+    assert backend(Image.new("RGB", (3, 2))) == "text"
+    assert FakeAPI.created == 1
+
+    t = Thread(target=backend, args=(np.zeros((2, 3), dtype=np.uint8),))
+    t.start()
+    t.join()
+    assert FakeAPI.created == 2
+
+    api = backend._apis[0]
+    assert api.psm == 7 and api.variables == {"a": "b"}
+    assert api.images == [(6, 3, 2, 1, 3), (6, 3, 2, 1, 3)]
+    apis = list(backend._apis)
+    backend.close()
+    assert all(a.ended for a in apis)
+
+
+def test_get_ocr_backend_auto_prefers_tesserocr(fake_tesserocr):
+    assert isinstance(get_ocr_backend(), TesserocrBackend)
+
+
+def test_get_ocr_backend_auto_falls_back(monkeypatch):
+    monkeypatch.setitem(sys.modules, "tesserocr", None)
+    assert isinstance(get_ocr_backend(), PytesseractBackend)
+    assert isinstance(get_ocr_backend("pytesseract"), PytesseractBackend)
+    with pytest.raises(ValueError):
+        get_ocr_backend("nope")
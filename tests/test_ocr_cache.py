@@ -0,0 +1,65 @@
+import numpy as np
+from PIL import Image
+
+from quiz_automation.frame import Frame
+from quiz_automation.ocr_cache import OCRCache, frame_key
+
+
+def test_frame_key_depends_on_pixels_and_shape():
+    a = np.zeros((2, 4), dtype=np.uint8)
+    assert frame_key(a) == frame_key(a.copy())
+    assert frame_key(a) != frame_key(a.reshape(4, 2))
+    b = a.copy()
+    b[0, 0] = 1
+    assert frame_key(a) != frame_key(b)
+    # Frames, cropped views and PIL images are all accepted.
+    frame = Frame(np.zeros((4, 4, 4), dtype=np.uint8))
+    assert frame_key(frame.crop(0, 0, 2, 2)) == frame_key(np.zeros((2, 2, 4), np.uint8))
+    assert len(frame_key(Image.new("L", (2, 2)))) == 16
+
+
+def test_lru_eviction_and_counters():
+    cache = OCRCache(max_entries=2)
+    cache.put(b"a", "A")
+    cache.put(b"b", "B")
+    assert cache.get(b"a") == "A"  # a becomes most recent
+    cache.put(b"c", "C")
+    assert cache.get(b"b") is None
+    assert cache.get(b"c") == "C"
+    assert cache.stats() == {
+        "entries": 2,
+        "bytes": cache.nbytes,
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+    }
+
+
+def test_byte_budget_limits_entries():
+    one = OCRCache._size(b"k0", "x" * 100)
+    cache = OCRCache(max_entries=100, max_bytes=one * 3)
+    for i in range(5):
+        cache.put(f"k{i}".encode(), "x" * 100)
+    assert len(cache) == 3
+    assert cache.nbytes <= cache.max_bytes
+    # Entries bigger than the whole budget are never stored.
+    cache.put(b"huge", "x" * (one * 4))
+    assert cache.get(b"huge") is None
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_watcher_skips_ocr_on_cache_hit(mocker):
+    from quiz_automation.watcher import Watcher
+
+    ocr = mocker.Mock(return_value="q1")
+    cache = OCRCache()
+    watcher = Watcher((0, 0, 1, 1), lambda _: None, ocr=ocr, ocr_cache=cache)
+    frame = np.zeros((3, 3), dtype=np.uint8)
+    watcher.process_frame(frame)
+    watcher.process_frame(frame.copy())
+    assert ocr.call_count == 1
+    assert cache.hits == 1
+    # Frames that cannot be hashed still go through OCR.
+    watcher.process_frame(None)
+    assert ocr.call_count == 2
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from quiz_automation.ocr_pool import OCRPool, SharedFrameRing
+from quiz_automation.watcher import Watcher
+
+
+def shape_ocr(arr: np.ndarray) -> str:
+    """Picklable fake OCR returning the frame size and its first pixel."""
+    return f"{arr.shape[1]}x{arr.shape[0]}:{arr[0, 0]}"
+
+
+def test_ring_write_round_trips_through_shared_memory() -> None:
+    ring = SharedFrameRing(2, 16)
+    try:
+        arr = np.arange(12, dtype=np.uint8).reshape(3, 4)
+        offset = ring.write(1, arr)
+        view = np.ndarray(arr.shape, arr.dtype, buffer=ring.shm.buf, offset=offset)
+        assert offset == 16
+        assert (view == arr).all()
+    finally:
+        del view
+        ring.close()
+
+
+def test_pool_recognises_frames_in_worker_processes() -> None:
+    pool = OCRPool(2, slots=2, slot_bytes=8, ocr=shape_ocr)
+    try:
+        frames = [np.full((2, 3), i, dtype=np.uint8) for i in range(5)]
+        futures = [pool.submit(frame) for frame in frames]
+        assert [f.result(timeout=30) for f in futures] == [
+            f"3x2:{i}" for i in range(5)
+        ]
+        # A larger frame grows the ring instead of failing.
+        assert pool(np.zeros((10, 20), dtype=np.uint8)) == "20x10:0"
+        assert pool.submitted == 6
+    finally:
+        pool.close()
+
+
+def test_pool_is_shareable_between_threads() -> None:
+    pool = OCRPool(1, slots=2, slot_bytes=4, ocr=shape_ocr)
+    try:
+        # The ring is created on first use and grown by larger frames while
+        # the other thread may be holding a slot.
+        frames = [np.full((i % 3 + 2, 4), i, dtype=np.uint8) for i in range(12)]
+        with ThreadPoolExecutor(2) as threads:
+            texts = list(threads.map(pool, frames, timeout=60))
+        assert texts == [f"4x{i % 3 + 2}:{i}" for i in range(12)]
+    finally:
+        pool.close()
+
+
+def test_watcher_emits_pool_results_in_frame_order(mocker) -> None:
+    pool = OCRPool(2, ocr=shape_ocr)
+    on_question = mocker.Mock()
+    watcher = Watcher(
+        (0, 0, 3, 2),
+        on_question,
+        ocr=mocker.Mock(),
+        ocr_pool=pool,
+        change_threshold=None,
+    )
+    try:
+        for i in (1, 2, 2, 3):
+            watcher.feed(np.full((2, 3), i, dtype=np.uint8))
+        watcher.collect_results(wait=True)
+    finally:
+        pool.close()
+
+    assert [c.args[0] for c in on_question.call_args_list] == [
+        "3x2:1",
+        "3x2:2",
+        "3x2:3",
+    ]
+    watcher.ocr.assert_not_called()
+
+
+def test_pool_does_not_fork_and_requires_picklable_ocr() -> None:
+    pool = OCRPool(1, ocr=shape_ocr)
+    try:
+        assert pool._executor._mp_context.get_start_method() != "fork"
+    finally:
+        pool.close()
+    with pytest.raises(TypeError):
+        OCRPool(1, ocr=lambda arr: "")
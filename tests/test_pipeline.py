@@ -0,0 +1,118 @@
+from threading import Event, Thread
+
+import pytest
+
+from quiz_automation.pipeline import (
+    BLOCK,
+    DROP_NEWEST,
+    DROP_OLDEST,
+    QueueClosed,
+    QuestionPipeline,
+    StageQueue,
+)
+
+
+def test_drop_oldest_coalesces_to_latest():
+    q = StageQueue("frames", 2, DROP_OLDEST)
+    for item in (1, 2, 3):
+        assert q.put(item)
+    assert [q.get(), q.get()] == [2, 3]
+    stats = q.stats()
+    assert stats["dropped"] == 1
+    assert stats["accepted"] == 3
+    assert stats["high_water"] == 2
+
+
+def test_drop_newest_rejects_incoming():
+    q = StageQueue("questions", 1, DROP_NEWEST)
+    assert q.put("a")
+    assert not q.put("b")
+    assert q.get() == "a"
+    assert q.stats()["dropped"] == 1
+
+
+def test_block_waits_for_space():
+    q = StageQueue("answers", 1, BLOCK)
+    q.put(1)
+    done = Event()
+
+    def producer() -> None:
+        q.put(2)
+        done.set()
+
+    t = Thread(target=producer)
+    t.start()
+    assert not done.wait(0.05)
+    assert q.get() == 1
+    assert done.wait(1)
+    assert q.get() == 2
+    t.join()
+
+
+def test_close_drains_then_raises():
+    q = StageQueue("x", 2)
+    q.put(1)
+    q.close()
+    assert not q.put(2)
+    assert q.get() == 1
+    with pytest.raises(QueueClosed):
+        q.get()
+    with pytest.raises(TimeoutError):
+        StageQueue("y").get(timeout=0.01)
+
+
+def test_invalid_queue_arguments():
+    with pytest.raises(ValueError):
+        StageQueue("x", 0)
+    with pytest.raises(ValueError):
+        StageQueue("x", 1, "bogus")
+
+
+def test_question_pipeline_solves_and_acts_in_order():
+    acted: list[tuple[str, str]] = []
+    pipeline = QuestionPipeline(
+        lambda text: text.upper(), lambda text, ans: acted.append((text, ans)),
+        question_queue=8,
+    )
+    pipeline.start()
+    for text in ("a", "b", "c"):
+        assert pipeline.submit(text)
+    pipeline.close(timeout=1)
+
+    assert acted == [("a", "A"), ("b", "B"), ("c", "C")]
+    assert pipeline.stats()["questions"]["accepted"] == 3
+    assert not pipeline.solve_stage.is_alive()
+    assert not pipeline.act_stage.is_alive()
+
+
+def test_question_pipeline_does_not_block_submitter():
+    release = Event()
+    acted: list[str] = []
+
+    def slow_solve(text: str) -> str:
+        release.wait(1)
+        return text
+
+    pipeline = QuestionPipeline(slow_solve, lambda text, ans: acted.append(ans))
+    pipeline.start()
+    # The first question occupies the solver; later ones coalesce.
+    for text in ("q1", "q2", "q3", "q4"):
+        pipeline.submit(text)
+    release.set()
+    pipeline.close(timeout=1)
+
+    assert acted[-1] == "q4"
+    assert pipeline.stats()["questions"]["dropped"] >= 1
+
+
+def test_stage_errors_are_reported():
+    errors: list[Exception] = []
+
+    def solve(text: str) -> str:
+        raise RuntimeError(text)
+
+    pipeline = QuestionPipeline(solve, lambda *_: None, on_error=errors.append)
+    pipeline.start()
+    pipeline.submit("boom")
+    pipeline.close(timeout=1)
+    assert [str(e) for e in errors] == ["boom"]
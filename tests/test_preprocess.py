@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from quiz_automation.frame import Frame
+from quiz_automation.preprocess import (
+    PROFILES,
+    adaptive_threshold,
+    crop_border,
+    get_profile,
+    global_threshold,
+    invert_if_dark,
+    rescale,
+)
+
+
+def test_crop_border_trims_uniform_margin():
+    gray = np.full((10, 10), 255, dtype=np.uint8)
+    gray[3:5, 2:7] = 0
+    cropped = crop_border(gray)
+    assert cropped.shape == (2, 5)
+    assert np.shares_memory(cropped, gray)
+    blank = np.full((3, 3), 7, dtype=np.uint8)
+    assert crop_border(blank) is blank
+
+
+def test_invert_if_dark():
+    dark = np.array([[0, 10]], dtype=np.uint8)
+    assert invert_if_dark(dark).tolist() == [[255, 245]]
+    light = np.array([[200, 250]], dtype=np.uint8)
+    assert invert_if_dark(light) is light
+
+
+def test_rescale_nearest_neighbour():
+    gray = np.array([[1, 2], [3, 4]], dtype=np.uint8)
+    assert rescale(gray, 2).tolist() == [
+        [1, 1, 2, 2],
+        [1, 1, 2, 2],
+        [3, 3, 4, 4],
+        [3, 3, 4, 4],
+    ]
+    assert rescale(rescale(gray, 2), 0.5).tolist() == gray.tolist()
+    assert rescale(gray, 1) is gray
+
+
+def test_thresholds():
+    gray = np.array([[10, 200]], dtype=np.uint8)
+    assert global_threshold(gray).tolist() == [[0, 255]]
+
+    # Dark text on a gradient background stays separable locally.
+    background = np.tile(np.linspace(100, 250, 40, dtype=np.uint8), (9, 1))
+    gray = background.copy()
+    gray[4, 5] -= 60
+    gray[4, 35] -= 60
+    binary = adaptive_threshold(gray, block=7, offset=10)
+    assert binary[4, 5] == 0 and binary[4, 35] == 0
+    assert (binary == 0).sum() == 2
+
+
+def test_profiles_produce_grayscale_and_ocr_options():
+    frame = Frame(np.zeros((4, 6, 4), dtype=np.uint8))
+    fast = get_profile("fast")
+    out = fast(frame)
+    assert out.shape == (4, 6)
+    assert fast.ocr_options()["psm"] == 6
+    assert "tessedit_char_whitelist" in fast.ocr_options()["variables"]
+
+    img = Image.new("RGB", (6, 4), "black")
+    accurate = PROFILES["accurate"](img)
+    assert accurate.dtype == np.uint8
+    assert accurate.shape == (8, 12)
+    # Dark theme inverted to a light background.
+    assert accurate.min() == 255
+
+    with pytest.raises(ValueError):
+        get_profile("nope")
+
+
+def test_watcher_runs_preprocess_before_ocr(mocker):
+    from quiz_automation.watcher import Watcher
+
+    seen = []
+    watcher = Watcher(
+        (0, 0, 1, 1),
+        lambda _: None,
+        capture=lambda r: None,
+        ocr=lambda img: seen.append(img) or "",
+        preprocess=lambda img: "prepared",
+    )
+    watcher.process_frame("raw")
+    assert seen == ["prepared"]
@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+from quiz_automation.profiling import Profiler, collapse_stack
+
+
+def _busy_worker(stop: threading.Event) -> None:
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+def test_collapse_stack_lists_outer_frames_first() -> None:
+    import sys
+
+    def inner():
+        return collapse_stack(sys._getframe())
+
+    stack = inner().split(";")
+    assert stack[-1].startswith("inner (test_profiling.py:")
+    assert stack[-2].startswith("test_collapse_stack_lists_outer_frames_first ")
+
+
+def test_sample_and_dump_writes_folded_stacks(tmp_path) -> None:
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_worker, args=(stop,), name="watcher")
+    worker.start()
+    profiler = Profiler(tmp_path, memory=False)
+    try:
+        for _ in range(3):
+            profiler.sample()
+    finally:
+        stop.set()
+        worker.join()
+
+    (path,) = profiler.dump()
+    assert path.name == "stacks-00001.folded"
+    lines = path.read_text().splitlines()
+    watcher_lines = [line for line in lines if line.startswith("watcher;")]
+    assert watcher_lines and "_busy_worker" in watcher_lines[0]
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in watcher_lines) == 3
+    assert profiler.stacks == {}
+
+
+def test_dumps_rotate_and_track_allocation_growth(tmp_path) -> None:
+    profiler = Profiler(tmp_path, keep=2, window=3600).start()
+    try:
+        hoard = [bytearray(1024) for _ in range(2000)]  # noqa: F841
+        profiler.dump()
+        profiler.dump()
+    finally:
+        profiler.close()
+
+    assert sorted(p.name for p in tmp_path.glob("stacks-*")) == [
+        "stacks-00002.folded",
+        "stacks-00003.folded",
+    ]
+    assert sorted(p.name for p in tmp_path.glob("memory-*")) == [
+        "memory-00002.txt",
+        "memory-00003.txt",
+    ]
+    assert profiler.dumps == 3  # close() writes the final window
+
+
+def test_new_session_continues_numbering(tmp_path) -> None:
+    for i in range(1, 5):
+        (tmp_path / f"stacks-{i:05d}.folded").write_text("")
+    profiler = Profiler(tmp_path, keep=2, memory=False)
+
+    (path,) = profiler.dump()
+    assert path.name == "stacks-00005.folded"
+    assert sorted(p.name for p in tmp_path.glob("stacks-*")) == [
+        "stacks-00004.folded",
+        "stacks-00005.folded",
+    ]
+
+
+def test_first_memory_dump_reports_growth(tmp_path) -> None:
+    profiler = Profiler(tmp_path, window=3600).start()
+    try:
+        hoard = [bytearray(1024) for _ in range(2000)]  # noqa: F841
+        paths = profiler.dump()
+    finally:
+        profiler.close()
+    report = paths[1].read_text()
+    assert report.startswith("# traced ")
+    assert "test_profiling.py" in report
+
+
+def test_background_thread_dumps_each_window(tmp_path) -> None:
+    with Profiler(tmp_path, interval=0.001, window=0.02, memory=False) as profiler:
+        time.sleep(0.1)
+    assert profiler.dumps >= 2
+    assert profiler.samples > 0
+
+
+def test_invalid_arguments(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        Profiler(tmp_path, interval=0)
+    with pytest.raises(ValueError):
+        Profiler(tmp_path, keep=0)
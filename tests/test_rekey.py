@@ -0,0 +1,47 @@
+from quiz_automation.answer_store import AnswerLog
+from quiz_automation.logger import QuizLogger
+from quiz_automation.rekey import main, rekey, replay_hits
+from quiz_automation.utils import cache_key, hash_text
+
+
+def _record(answer: str, **extra) -> dict:
+    return {"answer": answer, "usage": None, "cost": 0.0, **extra}
+
+
+def test_replay_hits_counts_repeats() -> None:
+    questions = ["What is 2+2?", "what is 2+2?", "What is 2+2?", "Other"]
+    assert replay_hits(questions, hash_text) == 1
+    assert replay_hits(questions, cache_key) == 2
+
+
+def test_rekey_moves_recoverable_entries() -> None:
+    records = {
+        hash_text("Q one"): _record("A"),
+        hash_text("Unknown"): _record("B"),
+        "v0:old": _record("C", question="Q  Three"),
+        cache_key("Q two"): _record("D"),
+    }
+    result, moved = rekey(records, ["Q one"])
+
+    assert moved == 2
+    assert result[cache_key("q one")] == _record("A", question="Q one")
+    assert result[cache_key("q three")]["answer"] == "C"
+    assert result[hash_text("Unknown")] == _record("B")
+    assert cache_key("Q two") in result
+    assert "v0:old" not in result
+
+
+def test_main_reports_and_rewrites_cache(tmp_path, capsys) -> None:
+    db = tmp_path / "events.db"
+    with QuizLogger(db) as logger:
+        for question in ["Capital of France?", "capital of  France?", "Other"]:
+            logger.log("ts", question, "A", 0, 0, 0, 0, 0.0)
+    cache = tmp_path / "cache.json"
+    AnswerLog(cache).append(hash_text("Capital of France?"), _record("A"))
+
+    assert main(["--cache", str(cache), "--db", str(db)]) == 0
+    out = capsys.readouterr().out
+    assert "Hit rate, raw keys:     0/3 (0.0%)" in out
+    assert "Hit rate, v1 keys:      1/3 (33.3%)" in out
+    assert "Re-keyed:               1 (0 left under old keys)" in out
+    assert set(AnswerLog(cache).load()) == {cache_key("capital of france?")}
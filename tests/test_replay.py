@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from quiz_automation.archive import PackWriter
+from quiz_automation.frame import Frame
+from quiz_automation.replay import ReplaySource, open_recording
+from quiz_automation.watcher import Watcher
+
+
+def frames(*values: int, step: float = 1.0):
+    return [
+        (i * step, Frame(np.full((2, 3), v, dtype=np.uint8), "L"))
+        for i, v in enumerate(values)
+    ]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_fast_replay_returns_every_frame_once() -> None:
+    source = ReplaySource(frames(1, 2, 3), speed=None)
+    assert source.region == (0, 0, 3, 2)
+    seen = [int(source((0, 0, 3, 2)).pixels[0, 0]) for _ in range(3)]
+    assert seen == [1, 2, 3]
+    with pytest.raises(StopIteration):
+        source((0, 0, 3, 2))
+
+
+def test_timed_replay_samples_the_recording_timeline() -> None:
+    clock = FakeClock()
+    source = ReplaySource(frames(1, 2, 3, 4), speed=2.0, clock=clock)
+    region = (0, 0, 3, 2)
+    values = []
+    for now in (0.0, 0.2, 0.6, 1.6):
+        clock.now = now
+        values.append(int(source(region).pixels[0, 0]))
+    # At 2x, 0.6s is 1.2s into the recording and 1.6s is past its end, so
+    # frame 1 repeats, frame 3 is skipped and the last frame is served once.
+    assert values == [1, 1, 2, 4]
+    clock.now = 1.7
+    with pytest.raises(StopIteration):
+        source(region)
+
+
+def test_replay_crops_to_smaller_regions() -> None:
+    pixels = np.arange(12, dtype=np.uint8).reshape(3, 4)
+    source = ReplaySource([(0.0, Frame(pixels, "L"))], speed=None)
+    assert (source((1, 1, 2, 2)).pixels == pixels[1:3, 1:3]).all()
+
+
+def test_open_recording_reads_png_dirs_and_packs(tmp_path) -> None:
+    png_dir = tmp_path / "png"
+    png_dir.mkdir()
+    for i, name in enumerate(("b", "a")):
+        path = png_dir / f"{name}.png"
+        Image.new("L", (2, 2), i * 100).save(path)
+        os.utime(path, (1000 + i, 1000 + i))
+    timed = list(open_recording(png_dir))
+    assert [t for t, _ in timed] == [0.0, 1.0]
+    assert [int(f.pixels[0, 0]) for _, f in timed] == [0, 100]
+
+    writer = PackWriter(tmp_path / "pack")
+    for _, frame in frames(5, 6):
+        writer.write("0" * 64, frame)
+    writer.close()
+    timed = list(open_recording(tmp_path / "pack", interval=0.25))
+    assert [t for t, _ in timed] == [0.0, 0.25]
+
+    with pytest.raises(FileNotFoundError):
+        open_recording(tmp_path / "missing")
+
+
+def test_watcher_run_ends_with_the_recording(mocker) -> None:
+    on_question = mocker.Mock()
+    source = ReplaySource(frames(1, 2, 2, 3), speed=None)
+    watcher = Watcher(
+        source.region,
+        on_question,
+        0.0,
+        capture=source,
+        ocr=lambda img: f"q{int(np.asarray(img)[0, 0])}",
+        change_threshold=0.5,
+    )
+    watcher.start()
+    watcher.join(timeout=2)
+
+    assert not watcher.is_alive()
+    assert [c.args[0] for c in on_question.call_args_list] == ["q1", "q2", "q3"]
+    assert (watcher.frames_processed, watcher.frames_skipped) == (3, 1)
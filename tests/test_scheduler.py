@@ -0,0 +1,35 @@
+import pytest
+
+from quiz_automation.scheduler import AdaptivePoller
+
+
+def test_backs_off_while_stable_and_snaps_on_change():
+    poller = AdaptivePoller(0.1, 0.8, 2.0)
+    intervals = [poller.next_interval(False) for _ in range(5)]
+    assert intervals == pytest.approx([0.2, 0.4, 0.8, 0.8, 0.8])
+    assert poller.next_interval(True) == 0.1
+    assert poller.next_interval(False) == pytest.approx(0.2)
+
+
+def test_poll_rate_tracks_tick_period():
+    now = {"t": 0.0}
+    poller = AdaptivePoller(0.1, 1.0, clock=lambda: now["t"], smoothing=0.5)
+    assert poller.poll_rate == 0.0
+    for _ in range(3):
+        poller.next_interval(True)
+        now["t"] += 0.5
+    assert poller.poll_rate == pytest.approx(2.0)
+    now["t"] += 1.5  # one slow tick of 2s since the last one
+    poller.next_interval(True)
+    assert poller.poll_rate == pytest.approx(1 / 1.25)
+    poller.reset()
+    assert poller.poll_rate == 0.0
+
+
+def test_invalid_bounds():
+    with pytest.raises(ValueError):
+        AdaptivePoller(0, 1)
+    with pytest.raises(ValueError):
+        AdaptivePoller(1, 0.5)
+    with pytest.raises(ValueError):
+        AdaptivePoller(0.1, 1, backoff=0.5)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from quiz_automation.settle import SettleGate
+from quiz_automation.watcher import Watcher
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_releases_after_consecutive_ticks_once() -> None:
+    gate = SettleGate(ticks=3)
+    assert gate.observe("What is") is None
+    assert gate.observe("What is the") is None
+    assert gate.observe("What is the answer?") is None
+    assert gate.observe("What is the answer?") is None
+    settled = gate.observe("what is the answer ?", payload="img")
+    assert settled is not None
+    assert (settled.text, settled.payload, settled.ticks) == (
+        "what is the answer ?",
+        "img",
+        3,
+    )
+    assert gate.observe("What is the answer?") is None
+
+
+def test_releases_after_duration() -> None:
+    clock = FakeClock()
+    gate = SettleGate(ticks=None, duration=0.3, clock=clock)
+    assert gate.observe("Loading") is None
+    clock.now = 0.1
+    assert gate.observe("Question?") is None
+    clock.now = 0.35
+    assert gate.observe("Question?") is None
+    clock.now = 0.4
+    settled = gate.observe("Question?")
+    assert settled is not None
+    assert settled.settle_time == pytest.approx(0.3)
+
+
+def test_unchanged_frames_count_unless_ocr_is_pending() -> None:
+    gate = SettleGate(ticks=2)
+    assert gate.unchanged() is None  # nothing observed yet
+    assert gate.observe("Q?") is None
+    gate.changed()
+    assert gate.unchanged() is None  # waiting for the new frame's text
+    assert gate.observe("Q?") is not None
+
+
+def test_requires_ticks_or_duration() -> None:
+    with pytest.raises(ValueError):
+        SettleGate(ticks=None, duration=None)
+
+
+def test_watcher_emits_only_settled_text(mocker) -> None:
+    on_question = mocker.Mock()
+    texts = iter(["Which", "Which ocean is", "Which ocean is largest?"])
+    watcher = Watcher(
+        (0, 0, 4, 4),
+        on_question,
+        ocr=lambda _: next(texts),
+        change_threshold=1.0,
+        settle_ticks=3,
+    )
+    frames = [np.full((4, 4), v, dtype=np.uint8) for v in (0, 100, 200, 200, 200)]
+    for frame in frames:
+        watcher.feed(frame)
+
+    on_question.assert_called_once_with("Which ocean is largest?")
+    assert watcher.frames_skipped == 2
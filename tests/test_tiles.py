@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from quiz_automation.tiles import TiledOCR, parse_grid
+from quiz_automation.watcher import Watcher
+
+
+def page(*lines: int) -> np.ndarray:
+    """A white 40x20 page with a dark 'text line' in each listed band."""
+    img = np.full((40, 20), 255, dtype=np.uint8)
+    for band, value in enumerate(lines):
+        img[band * 10 + 3 : band * 10 + 7, 2:18] = value
+    return img
+
+
+def band_ocr(tile: np.ndarray) -> str:
+    ink = tile[tile < 255]
+    return f"line{ink.min()}" if ink.size else ""
+
+
+def test_parse_grid() -> None:
+    assert parse_grid("6x1") == (6, 1)
+    assert parse_grid("2X3") == (2, 3)
+    with pytest.raises(ValueError):
+        parse_grid("0x1")
+    with pytest.raises(ValueError):
+        parse_grid("four")
+
+
+def test_grid_edges_snap_to_blank_rows() -> None:
+    tiled = TiledOCR(band_ocr, rows=4)
+    img = page(0, 10, 20, 30)
+    for top, bottom, _, _ in tiled.grid(img):
+        # No text line straddles a tile edge.
+        assert np.ptp(img[top]) == 0 or top == 0
+        assert bottom == 40 or np.ptp(img[bottom]) == 0
+
+
+def test_only_changed_tiles_are_recognised_again() -> None:
+    calls = []
+
+    def ocr(tile: np.ndarray) -> str:
+        calls.append(tile.shape)
+        return band_ocr(tile)
+
+    tiled = TiledOCR(ocr, rows=4)
+    assert tiled(page(0, 10, 20, 30)) == "line0\nline10\nline20\nline30"
+    assert len(calls) == 4
+
+    assert tiled(page(0, 10, 99, 30)) == "line0\nline10\nline99\nline30"
+    assert len(calls) == 5
+    assert (tiled.tiles_ocred, tiled.tiles_reused) == (5, 3)
+
+
+def test_watcher_wraps_ocr_in_tiles(mocker) -> None:
+    inner = mocker.Mock(side_effect=band_ocr)
+    on_question = mocker.Mock()
+    watcher = Watcher((0, 0, 20, 40), on_question, ocr=inner, ocr_tiles=(4, 1))
+    watcher.process_frame(page(0, 10, 20, 30))
+    watcher.process_frame(page(0, 10, 20, 40))
+
+    assert inner.call_count == 5
+    assert on_question.call_args.args[0].endswith("line40")
@@ -0,0 +1,153 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from quiz_automation.pipeline import QuestionPipeline
+from quiz_automation.tracing import TRACER, Tracer
+from quiz_automation.watcher import Watcher
+
+
+@pytest.fixture
+def tracer():
+    TRACER.clear()
+    TRACER.enable()
+    yield TRACER
+    TRACER.disable()
+    TRACER.clear()
+
+
+def test_disabled_tracer_records_nothing() -> None:
+    tracer = Tracer()
+    assert tracer.new_trace() is None
+    with tracer.context(tracer.new_trace()):
+        with tracer.span("ocr") as span:
+            assert span is None
+        tracer.instant("question")
+        tracer.record("settle", 0.0, 1.0)
+    assert tracer.events() == []
+    assert tracer.span("a") is tracer.span("b")
+
+
+def test_spans_carry_the_current_trace_id() -> None:
+    tracer = Tracer()
+    tracer.enable()
+    trace = tracer.new_trace()
+    with tracer.context(trace):
+        with tracer.span("outer", region=1):
+            with tracer.span("inner"):
+                pass
+        tracer.record("settle", 1.0, 1.25, ticks=3)
+    with tracer.span("orphan"):
+        pass
+    with pytest.raises(RuntimeError):
+        with tracer.span("failing"):
+            raise RuntimeError("boom")
+
+    events = {event["name"]: event for event in tracer.events()}
+    assert events["inner"]["args"] == {"trace_id": trace}
+    assert events["outer"]["args"] == {"region": 1, "trace_id": trace}
+    assert events["outer"]["dur"] >= events["inner"]["dur"]
+    assert events["settle"]["dur"] == pytest.approx(250_000)
+    assert events["orphan"]["args"] == {}
+    assert events["failing"]["args"] == {"error": "RuntimeError"}
+    assert tracer.current() is None
+
+
+def test_context_is_thread_local() -> None:
+    tracer = Tracer()
+    tracer.enable()
+    seen = []
+    with tracer.context(tracer.new_trace()):
+        thread = threading.Thread(target=lambda: seen.append(tracer.current()))
+        thread.start()
+        thread.join()
+    assert seen == [None]
+
+
+def test_event_buffer_is_bounded() -> None:
+    tracer = Tracer(max_events=3)
+    tracer.enable()
+    for i in range(5):
+        tracer.instant(f"e{i}")
+    assert [event["name"] for event in tracer.events()] == ["e2", "e3", "e4"]
+
+
+def test_export_writes_chrome_trace(tmp_path) -> None:
+    tracer = Tracer()
+    tracer.enable()
+    with tracer.span("ocr"):
+        pass
+    path = tmp_path / "trace.json"
+
+    assert tracer.export(path) == 1
+    data = json.loads(path.read_text())
+    phases = [event["ph"] for event in data["traceEvents"]]
+    assert phases == ["M", "X"]
+    assert data["traceEvents"][0]["args"]["name"] == threading.current_thread().name
+
+
+def test_question_trace_spans_watcher_pipeline_and_client(
+    tracer, monkeypatch, tmp_path
+) -> None:
+    import quiz_automation.chatgpt_client as cg
+
+    class FlakyResponses:
+        calls = 0
+
+        def create(self, **_):
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError("boom")
+            text = json.dumps({"answer": "B"})
+            return SimpleNamespace(
+                output=[SimpleNamespace(content=[SimpleNamespace(text=text)])],
+                usage=None,
+            )
+
+    monkeypatch.setattr(
+        cg, "OpenAI", lambda api_key: SimpleNamespace(responses=FlakyResponses())
+    )
+    monkeypatch.setattr(cg.settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(cg, "CACHE", {})
+    monkeypatch.setattr(cg, "CACHE_FILE", tmp_path / "cache.json")
+    monkeypatch.setattr(cg.time, "sleep", lambda _: None)
+
+    client = cg.ChatGPTClient()
+    pipeline = QuestionPipeline(client.ask, lambda text, resp: None)
+    pipeline.start()
+    texts = ["", "q1"]
+
+    def ocr(_):
+        if texts:
+            return texts.pop(0)
+        watcher.stop_flag.set()
+        return "q1"
+
+    watcher = Watcher(
+        (0, 0, 1, 1),
+        pipeline.submit,
+        poll_interval=0.0,
+        capture=lambda _: Image.new("RGB", (1, 1)),
+        ocr=ocr,
+        async_ocr=True,
+    )
+    watcher.start()
+    watcher.join(timeout=2)
+    pipeline.close(timeout=2)
+
+    question = next(e for e in tracer.events() if e["name"] == "question")
+    trace = question["args"]["trace_id"]
+    names = [e["name"] for e in tracer.events() if e["args"].get("trace_id") == trace]
+    for name in ["capture", "ocr", "queue_wait", "solve", "ask", "backoff", "act"]:
+        assert name in names
+    attempts = [
+        e["args"] for e in tracer.events()
+        if e["name"] == "api_attempt" and e["args"]["trace_id"] == trace
+    ]
+    assert attempts == [
+        {"attempt": 1, "error": "RuntimeError", "trace_id": trace},
+        {"attempt": 2, "trace_id": trace},
+    ]
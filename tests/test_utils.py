@@ -7,3 +7,13 @@ def test_hash_text_deterministic():
 
 def test_hash_text_different():
     assert hash_text("a") != hash_text("b")
+
+
+def test_cache_key_ignores_case_spacing_and_typography():
+    from quiz_automation.utils import KEY_VERSION, cache_key, canonical_question
+
+    assert canonical_question("  What’s\nthe  “Capital”? ") == "what's the \"capital\"?"
+    assert cache_key("What is 2+2?") == cache_key("what  is\n2+2? ")
+    assert cache_key("Pick A – B") == cache_key("pick a - b")
+    assert cache_key("What is 2+2?") != cache_key("What is 2+3?")
+    assert cache_key("q").startswith(f"v{KEY_VERSION}:")
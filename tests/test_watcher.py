@@ -97,3 +97,160 @@ def test_run_survives_capture_and_ocr_errors(mocker) -> None:
     assert not watcher.is_alive()
     on_question.assert_called_once_with("q1")
     assert len(errors) == 2
+
+
+def test_run_skips_ocr_for_unchanged_frames(mocker) -> None:
+    frames = [Image.new("RGB", (8, 8))] * 3 + [Image.new("RGB", (8, 8), "white")]
+
+    def capture(_: tuple[int, int, int, int]) -> Image.Image:
+        if not frames:
+            watcher.stop_flag.set()
+            return Image.new("RGB", (8, 8), "white")
+        return frames.pop(0)
+
+    ocr = mocker.Mock(side_effect=["q1", "q2"])
+    on_question = mocker.Mock()
+
+    watcher = Watcher(
+        (0, 0, 8, 8),
+        on_question,
+        poll_interval=0.01,
+        capture=capture,
+        ocr=ocr,
+        change_threshold=4.0,
+    )
+
+    watcher.start()
+    watcher.join(timeout=1)
+
+    assert not watcher.is_alive()
+    assert ocr.call_count == 2
+    assert watcher.frames_processed == 2
+    assert watcher.frames_skipped == 3
+    assert [c.args[0] for c in on_question.call_args_list] == ["q1", "q2"]
+
+
+def test_run_owns_one_grabber_for_its_lifetime(mocker) -> None:
+    grabbers = []
+
+    class FakeGrabber:
+        def __init__(self) -> None:
+            self.calls = 0
+            self.closed = False
+            grabbers.append(self)
+
+        def grab(self, region):
+            self.calls += 1
+            if self.calls == 3:
+                watcher.stop_flag.set()
+            return Image.new("RGB", (1, 1))
+
+        def close(self) -> None:
+            self.closed = True
+
+    mocker.patch("quiz_automation.watcher.ScreenGrabber", FakeGrabber)
+    watcher = Watcher((0, 0, 1, 1), lambda _: None, poll_interval=0.01, ocr=lambda i: "")
+
+    watcher.start()
+    watcher.join(timeout=1)
+
+    assert len(grabbers) == 1
+    assert grabbers[0].calls == 3
+    assert grabbers[0].closed
+
+
+def test_async_ocr_runs_off_the_capture_thread(mocker) -> None:
+    import threading
+
+    ocr_threads: list[str] = []
+    captures = {"n": 0}
+
+    def capture(_: tuple[int, int, int, int]) -> Image.Image:
+        captures["n"] += 1
+        if captures["n"] == 5:
+            watcher.stop_flag.set()
+        return Image.new("RGB", (1, 1))
+
+    def ocr(_: Image.Image) -> str:
+        ocr_threads.append(threading.current_thread().name)
+        return "q1"
+
+    on_question = mocker.Mock()
+    watcher = Watcher(
+        (0, 0, 1, 1),
+        on_question,
+        poll_interval=0.01,
+        capture=capture,
+        ocr=ocr,
+        async_ocr=True,
+    )
+
+    watcher.start()
+    watcher.join(timeout=1)
+
+    assert not watcher.is_alive()
+    assert ocr_threads and set(ocr_threads) == {"ocr-0"}
+    on_question.assert_called_once_with("q1")
+    assert watcher.ocr_queue.stats()["accepted"] == 5
+
+
+def test_scheduler_interval_follows_change_detection(mocker) -> None:
+    from quiz_automation.scheduler import AdaptivePoller
+
+    frames = [Image.new("RGB", (8, 8))] * 4 + [Image.new("RGB", (8, 8), "white")]
+    intervals: list[float] = []
+
+    def capture(_: tuple[int, int, int, int]) -> Image.Image:
+        frame = frames.pop(0)
+        if not frames:
+            watcher.stop_flag.set()
+        return frame
+
+    scheduler = AdaptivePoller(0.001, 0.004, 2.0)
+    original = scheduler.next_interval
+
+    def record(changed: bool) -> float:
+        intervals.append(original(changed))
+        return intervals[-1]
+
+    scheduler.next_interval = record  # type: ignore[method-assign]
+    watcher = Watcher(
+        (0, 0, 8, 8),
+        lambda _: None,
+        capture=capture,
+        ocr=lambda _: "",
+        change_threshold=4.0,
+        scheduler=scheduler,
+    )
+    watcher.start()
+    watcher.join(timeout=1)
+
+    assert intervals == [0.001, 0.002, 0.004, 0.004, 0.001]
+    assert watcher.poll_rate > 0
+
+
+def test_concurrent_emits_report_a_question_once() -> None:
+    import threading
+    import time
+
+    from quiz_automation.dedup import QuestionDeduplicator
+
+    class SlowDedup(QuestionDeduplicator):
+        def is_duplicate(self, text: str) -> bool:
+            duplicate = super().is_duplicate(text)
+            time.sleep(0.05)  # widen the check-then-act window
+            return duplicate
+
+    emitted = []
+    watcher = Watcher(
+        (0, 0, 1, 1), emitted.append, ocr=lambda _: "", dedup=SlowDedup()
+    )
+    # The capture thread (settle path) and the OCR thread race on one text.
+    threads = [
+        threading.Thread(target=watcher._emit, args=("q1", None)) for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert emitted == ["q1"]